@@ -1,65 +1,110 @@
+import asyncio
+import glob
+import importlib.util
 import os
+import threading
+import time
+from functools import lru_cache
 
-import requests
+import yaml
 from packaging import version
 
+from airbyte_client import AirbyteAPIError, run_sync
 
-def get_airbyte_destination_version(connection_id):
-    """
-    Fetch the Airbyte destination version type (1 or 2) for a given connection ID.
+# v2 generator script copied into new projects; imported here to reuse its column flattening
+SCHEMA_GENERATOR_PATH = os.environ.get(
+    "AIRBYTE_SCHEMA_GENERATOR_PATH", "/init_setup_files_v2/create_yml_schema.py"
+)
 
-    Returns:
-        int: 1 for v1 destinations, 2 for v2 destinations, or None if an error occurs.
-    """
 
-    def make_post_request(url, payload, headers):
-        """Helper function to perform a POST request and return the JSON response."""
-        try:
-            response = requests.post(url, json=payload, headers=headers)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            print(f"Error making POST request to {url}: {e}")
-            return None
-
-    base_url = 'http://' + os.environ.get("AIRBYTE_LOCAL_K8S_SVC_URL")
-    headers = {"Content-Type": "application/json"}
-
-    # Connection details
-    connection_url = f"{base_url}/api/v1/connections/get/"
-    connection_payload = {"connectionId": connection_id}
-    connection_data = make_post_request(connection_url, connection_payload, headers)
-    if not connection_data:
-        print("Failed to fetch connection details.")
+# Seconds each layer of the destination version lookup is cached for. Failed lookups are
+# cached for AIRBYTE_NEGATIVE_CACHE_TTL so an Airbyte outage doesn't multiply the load on it.
+AIRBYTE_CONNECTION_CACHE_TTL = float(os.environ.get("AIRBYTE_CONNECTION_CACHE_TTL", 300))
+AIRBYTE_DESTINATION_CACHE_TTL = float(os.environ.get("AIRBYTE_DESTINATION_CACHE_TTL", 900))
+AIRBYTE_DEFINITION_CACHE_TTL = float(os.environ.get("AIRBYTE_DEFINITION_CACHE_TTL", 3600))
+AIRBYTE_NEGATIVE_CACHE_TTL = float(os.environ.get("AIRBYTE_NEGATIVE_CACHE_TTL", 30))
+
+
+class TTLCache:
+    """Thread-safe in-process cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, ttl, negative_ttl, maxsize=4096):
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """Return (True, value) for a live entry, (False, None) on a miss or after expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > time.monotonic():
+                return True, entry[1]
+        return False, None
+
+    def store(self, key, value):
+        """Cache value for ttl, or for negative_ttl when it is None."""
+        ttl = self.ttl if value is not None else self.negative_ttl
+        now = time.monotonic()
+        with self._lock:
+            if len(self._entries) >= self.maxsize:
+                self._evict(now)
+            self._entries[key] = (now + ttl, value)
+
+    def _evict(self, now):
+        expired = [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]
+        for key in expired or list(self._entries)[: self.maxsize // 4]:
+            del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# connectionId -> destinationId -> destinationDefinitionId -> destination version. Definitions
+# are shared by every connection writing to the same destination type.
+_connection_destinations = TTLCache(AIRBYTE_CONNECTION_CACHE_TTL, AIRBYTE_NEGATIVE_CACHE_TTL)
+_destination_definitions = TTLCache(AIRBYTE_DESTINATION_CACHE_TTL, AIRBYTE_NEGATIVE_CACHE_TTL)
+_definition_versions = TTLCache(AIRBYTE_DEFINITION_CACHE_TTL, AIRBYTE_NEGATIVE_CACHE_TTL)
+# destinationId -> destination, for the dataset of connections without a namespace format
+_destinations = TTLCache(AIRBYTE_DESTINATION_CACHE_TTL, AIRBYTE_NEGATIVE_CACHE_TTL)
+
+
+async def _fetch_destination_id(client, connection_id):
+    try:
+        connection = await client.get_connection(connection_id)
+    except AirbyteAPIError as e:
+        print(f"Failed to fetch connection details: {e}")
         return None
 
-    destination_id = connection_data.get("destinationId")
-    if not destination_id:
+    if not connection.destination_id:
         print("Destination ID not found in connection details.")
         return None
+    return connection.destination_id
+
 
-    # Destination details
-    destination_url = f"{base_url}/api/v1/destinations/get"
-    destination_payload = {"destinationId": destination_id}
-    destination_data = make_post_request(destination_url, destination_payload, headers)
-    if not destination_data:
-        print("Failed to fetch destination details.")
+async def _fetch_destination_definition_id(client, destination_id):
+    try:
+        destination = await client.get_destination(destination_id)
+    except AirbyteAPIError as e:
+        print(f"Failed to fetch destination details: {e}")
         return None
 
-    destination_definition_id = destination_data.get("destinationDefinitionId")
-    if not destination_definition_id:
+    if not destination.destination_definition_id:
         print("Destination definition ID not found in destination details.")
         return None
+    return destination.destination_definition_id
 
-    # Destination definition details
-    definition_url = f"{base_url}/api/v1/destination_definitions/get"
-    definition_payload = {"destinationDefinitionId": destination_definition_id}
-    definition_data = make_post_request(definition_url, definition_payload, headers)
-    if not definition_data:
-        print("Failed to fetch destination definition details.")
+
+async def _fetch_definition_version(client, destination_definition_id):
+    try:
+        definition = await client.get_destination_definition(destination_definition_id)
+    except AirbyteAPIError as e:
+        print(f"Failed to fetch destination definition details: {e}")
         return None
 
-    docker_image_tag = definition_data.get("dockerImageTag")
+    docker_image_tag = definition.docker_image_tag
     if not docker_image_tag:
         print("Docker image tag not found in destination definition details.")
         return None
@@ -72,3 +117,249 @@ def get_airbyte_destination_version(connection_id):
     except Exception as e:
         print(f"Error parsing docker image tag version '{docker_image_tag}': {e}")
         return None
+
+
+async def _fetch_destination(client, destination_id):
+    try:
+        return await client.get_destination(destination_id)
+    except AirbyteAPIError as e:
+        print(f"Failed to fetch destination details: {e}")
+        return None
+
+
+async def _resolve_cached(client, cache, fetch, keys):
+    """Resolve keys through cache, fetching all misses concurrently."""
+    results = {}
+    missing = []
+    for key in sorted({k for k in keys if k}):
+        found, value = cache.lookup(key)
+        if found:
+            results[key] = value
+        else:
+            missing.append(key)
+    values = await asyncio.gather(*(fetch(client, key) for key in missing))
+    for key, value in zip(missing, values):
+        cache.store(key, value)
+        results[key] = value
+    return results
+
+
+async def _resolve_destination_versions(client, connection_ids):
+    destinations = await _resolve_cached(client, _connection_destinations, _fetch_destination_id, connection_ids)
+    definitions = await _resolve_cached(
+        client, _destination_definitions, _fetch_destination_definition_id, destinations.values()
+    )
+    versions = await _resolve_cached(client, _definition_versions, _fetch_definition_version, definitions.values())
+    return {
+        connection_id: versions.get(definitions.get(destinations.get(connection_id)))
+        for connection_id in connection_ids
+    }
+
+
+def get_airbyte_destination_version(connection_id):
+    """
+    Fetch the Airbyte destination version type (1 or 2) for a given connection ID.
+
+    Each step of the lookup (connection, destination, destination definition) is cached
+    separately; see the AIRBYTE_*_CACHE_TTL settings. A list of connection IDs, as stored in
+    v2 projects, is resolved through its first connection.
+
+    Returns:
+        int: 1 for v1 destinations, 2 for v2 destinations, or None if an error occurs.
+    """
+    connection_id = primary_connection_id(connection_id)
+    if not connection_id:
+        return None
+    return get_airbyte_destination_versions([connection_id]).get(connection_id)
+
+
+def primary_connection_id(connection_id):
+    """Return the connection a project's destination version is read from (the first of a v2 list)."""
+    if isinstance(connection_id, list):
+        connection_id = connection_id[0] if connection_id else None
+    if not connection_id or connection_id == "None":
+        return None
+    return connection_id
+
+
+def get_airbyte_destination_versions(connection_ids):
+    """
+    Resolve the destination version of many connections at once.
+
+    Connection, destination and definition IDs are deduplicated per lookup step and each
+    step's cache misses are fetched concurrently through the shared asyncio Airbyte client
+    (at most AIRBYTE_CLIENT_MAX_CONCURRENCY calls in flight).
+
+    Returns:
+        dict: {connection ID: 1, 2 or None}
+    """
+    connection_ids = sorted({c for c in map(primary_connection_id, connection_ids) if c})
+    if not connection_ids:
+        return {}
+    try:
+        return run_sync(_resolve_destination_versions, os.environ.get("AIRBYTE_LOCAL_K8S_SVC_URL"), connection_ids)
+    except AirbyteAPIError as e:
+        print(f"Failed to resolve destination versions: {e}")
+        return {connection_id: None for connection_id in connection_ids}
+
+
+@lru_cache(maxsize=1)
+def load_schema_generator():
+    """Import the v2 schema generator script as a module (its main() only runs as a script)."""
+    spec = importlib.util.spec_from_file_location("airbyte_schema_generator", SCHEMA_GENERATOR_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _read_yml(file_path):
+    if not os.path.exists(file_path):
+        return {}
+    with open(file_path, "r") as f:
+        return yaml.safe_load(f) or {}
+
+
+def _column_drift(new_columns, old_columns):
+    """Added/removed/retyped columns between two {column name: data type} dicts, or None if equal."""
+    added_columns = [c for c in new_columns if c not in old_columns]
+    removed_columns = [c for c in old_columns if c not in new_columns]
+    retyped_columns = [
+        {"name": c, "from": old_columns[c], "to": new_columns[c]}
+        for c in new_columns
+        if c in old_columns and old_columns[c] != new_columns[c]
+    ]
+    if not (added_columns or removed_columns or retyped_columns):
+        return None
+    return {
+        "added_columns": added_columns,
+        "removed_columns": removed_columns,
+        "retyped_columns": retyped_columns,
+    }
+
+
+def _index_model_ymls(project_path):
+    """{file name: path} of the ymls under models/, the first path in sorted order for duplicate names."""
+    index = {}
+    for path in sorted(glob.glob(os.path.join(project_path, "models", "**", "*.yml"), recursive=True)):
+        index.setdefault(os.path.basename(path), path)
+    return index
+
+
+async def _fetch_connections(client, connection_ids):
+    """
+    Current connections (catalogs are never cached; they are what the drift check compares
+    against) and {destinationId: destination} of their destinations, through the caches.
+    """
+    connections = await asyncio.gather(*(client.get_connection(c) for c in connection_ids))
+    destinations = await _resolve_cached(
+        client, _destinations, _fetch_destination, [c.destination_id for c in connections]
+    )
+    return connections, destinations
+
+
+def _read_model_columns(model_path, model_name):
+    for model in _read_yml(model_path).get("models", []) or []:
+        if model.get("name") == model_name:
+            return {c.get("name"): c.get("data_type") for c in model.get("columns", []) or []}
+    return None
+
+
+def get_airbyte_catalog_drift(project_path, connection_ids):
+    """
+    Compare the current Airbyte catalog of the given connections with the project's
+    generated models/source.yml and staging model files, in memory only.
+
+    Streams are keyed as "<dataset>.<table>" using the same naming as the v2 generator.
+
+    Returns:
+        dict: added/removed streams, per-stream added/removed/retyped columns of source.yml
+        and of the staging model ymls, and streams whose staging model yml is missing,
+        or None if the catalog could not be fetched.
+    """
+    if isinstance(connection_ids, str):
+        connection_ids = [connection_ids]
+
+    generator = load_schema_generator()
+    # Flatten with the limits the project was generated with; the API's own settings otherwise
+    limits = generator.read_schema_limits(os.path.join(project_path, generator.SCHEMA_FINGERPRINT_FILE))
+    try:
+        connections, destinations = run_sync(
+            _fetch_connections, os.environ.get("AIRBYTE_LOCAL_K8S_SVC_URL"), list(connection_ids or [])
+        )
+    except AirbyteAPIError as e:
+        print(f"Failed to fetch connections for drift check: {e}")
+        return None
+
+    # Current catalog: {stream key: {column name: data type}}, for source.yml and the staging models
+    expected = {}
+    expected_models = {}
+    for connection in connections:
+        prefix = connection.prefix
+        for namespace_group in generator.group_by_namespace(connection.raw)["syncCatalog"]:
+            namespace = namespace_group.get("namespace")
+            if namespace:
+                dataset = connection.namespace_format.replace("${SOURCE_NAMESPACE}", namespace)
+            elif "namespaceFormat" in connection.raw:
+                dataset = connection.namespace_format
+            else:
+                destination = destinations.get(connection.destination_id)
+                if destination is None:
+                    print(f"Failed to fetch destination for connection {connection.connection_id}.")
+                    return None
+                dataset = destination.connection_configuration.get("dataset_id")
+
+            for stream in namespace_group["streams"]:
+                table = prefix + stream["stream"]["name"]
+                source_dict, model_dict, _ = generator.create_source_yml_dict(
+                    stream, f"stg_{table}", table, limits=limits
+                )
+                expected[(dataset, table)] = {c["name"]: c["data_type"] for c in source_dict["columns"]}
+                expected_models[(dataset, table)] = {c["name"]: c["data_type"] for c in model_dict["columns"]}
+
+    # Generated state of the project
+    existing = {}
+    source_yml = _read_yml(os.path.join(project_path, "models", "source.yml"))
+    for source in source_yml.get("sources", []) or []:
+        for table in source.get("tables", []) or []:
+            existing[(source.get("name"), table.get("name"))] = {
+                c.get("name"): c.get("data_type") for c in table.get("columns", []) or []
+            }
+
+    def stream_key(key):
+        return f"{key[0]}.{key[1]}"
+
+    changed_streams = {}
+    changed_models = {}
+    missing_models = []
+    model_ymls = None
+    for key in sorted(set(expected) & set(existing), key=stream_key):
+        drift = _column_drift(expected[key], existing[key])
+        if drift:
+            changed_streams[stream_key(key)] = drift
+
+        # Where the generator writes the model, else anywhere under models/ (indexed on first use)
+        model_name = f"stg_{key[1]}"
+        model_path = os.path.join(project_path, "models", "staging", key[0], f"{model_name}.yml")
+        if not os.path.exists(model_path):
+            if model_ymls is None:
+                model_ymls = _index_model_ymls(project_path)
+            model_path = model_ymls.get(f"{model_name}.yml")
+        model_columns = _read_model_columns(model_path, model_name) if model_path else None
+        if model_columns is None:
+            missing_models.append(stream_key(key))
+            continue
+        drift = _column_drift(expected_models[key], model_columns)
+        if drift:
+            changed_models[stream_key(key)] = drift
+
+    added_streams = sorted(stream_key(k) for k in set(expected) - set(existing))
+    removed_streams = sorted(stream_key(k) for k in set(existing) - set(expected))
+
+    return {
+        "in_sync": not (added_streams or removed_streams or changed_streams or changed_models or missing_models),
+        "added_streams": added_streams,
+        "removed_streams": removed_streams,
+        "changed_streams": changed_streams,
+        "changed_models": changed_models,
+        "missing_models": missing_models,
+    }
@@ -0,0 +1,284 @@
+import asyncio
+import concurrent.futures
+import json
+import os
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+# Connection pool and timeouts shared by every call made through the client
+AIRBYTE_CLIENT_MAX_CONCURRENCY = int(os.environ.get("AIRBYTE_CLIENT_MAX_CONCURRENCY", 8))
+AIRBYTE_CLIENT_CONNECT_TIMEOUT = float(os.environ.get("AIRBYTE_CLIENT_CONNECT_TIMEOUT", 5))
+AIRBYTE_CLIENT_READ_TIMEOUT = float(os.environ.get("AIRBYTE_CLIENT_READ_TIMEOUT", 30))
+AIRBYTE_CLIENT_MAX_RETRIES = int(os.environ.get("AIRBYTE_CLIENT_MAX_RETRIES", 2))
+AIRBYTE_CLIENT_BACKOFF_SECONDS = float(os.environ.get("AIRBYTE_CLIENT_BACKOFF_SECONDS", 0.5))
+# Longest a synchronous caller waits for a result, retries included
+AIRBYTE_CLIENT_CALL_TIMEOUT = float(os.environ.get("AIRBYTE_CLIENT_CALL_TIMEOUT", 120))
+
+
+class AirbyteAPIError(Exception):
+    """Raised when an Airbyte API call fails after retries, or with a non-retryable status."""
+
+    def __init__(self, url: str, message: str, status: Optional[int] = None):
+        super().__init__(f"{url}: {message}")
+        self.url = url
+        self.status = status
+
+
+@dataclass
+class AirbyteConnection:
+    connection_id: str
+    destination_id: Optional[str]
+    source_id: Optional[str] = None
+    workspace_id: Optional[str] = None
+    name: Optional[str] = None
+    prefix: str = ""
+    namespace_format: Optional[str] = None
+    status: Optional[str] = None
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "AirbyteConnection":
+        return cls(
+            connection_id=data.get("connectionId"),
+            destination_id=data.get("destinationId"),
+            source_id=data.get("sourceId"),
+            workspace_id=data.get("workspaceId"),
+            name=data.get("name"),
+            prefix=data.get("prefix") or "",
+            namespace_format=data.get("namespaceFormat"),
+            status=data.get("status"),
+            raw=data,
+        )
+
+
+@dataclass
+class AirbyteDestination:
+    destination_id: str
+    destination_definition_id: Optional[str]
+    workspace_id: Optional[str] = None
+    name: Optional[str] = None
+    connection_configuration: Dict[str, Any] = field(default_factory=dict, repr=False)
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "AirbyteDestination":
+        return cls(
+            destination_id=data.get("destinationId"),
+            destination_definition_id=data.get("destinationDefinitionId"),
+            workspace_id=data.get("workspaceId"),
+            name=data.get("name"),
+            connection_configuration=data.get("connectionConfiguration") or {},
+            raw=data,
+        )
+
+
+@dataclass
+class AirbyteDestinationDefinition:
+    destination_definition_id: str
+    docker_image_tag: Optional[str]
+    docker_repository: Optional[str] = None
+    name: Optional[str] = None
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_api(cls, data: Dict[str, Any]) -> "AirbyteDestinationDefinition":
+        return cls(
+            destination_definition_id=data.get("destinationDefinitionId"),
+            docker_image_tag=data.get("dockerImageTag"),
+            docker_repository=data.get("dockerRepository"),
+            name=data.get("name"),
+            raw=data,
+        )
+
+
+class AsyncAirbyteClient:
+    """
+    asyncio client for the Airbyte config API endpoints used by this service.
+
+    One aiohttp session (and connection pool) is shared by all calls. At most
+    max_concurrency requests are in flight; 5xx responses, connection errors and
+    timeouts are retried with full-jitter exponential backoff.
+
+    Args:
+        base_url: Airbyte host:port (as in AIRBYTE_LOCAL_K8S_SVC_URL) or a full http(s) URL
+    """
+
+    def __init__(self, base_url: str, max_concurrency: int = AIRBYTE_CLIENT_MAX_CONCURRENCY,
+                 connect_timeout: float = AIRBYTE_CLIENT_CONNECT_TIMEOUT,
+                 read_timeout: float = AIRBYTE_CLIENT_READ_TIMEOUT,
+                 max_retries: int = AIRBYTE_CLIENT_MAX_RETRIES,
+                 backoff_seconds: float = AIRBYTE_CLIENT_BACKOFF_SECONDS):
+        if not base_url.startswith(("http://", "https://")):
+            base_url = f"http://{base_url}"
+        self.api_url = f"{base_url.rstrip('/')}/api/v1"
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout = aiohttp.ClientTimeout(total=None, connect=connect_timeout, sock_read=read_timeout)
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self) -> "AsyncAirbyteClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Created lazily so the session binds to the loop the client is used on
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=self.timeout,
+                headers={"Content-Type": "application/json"},
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def post(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """POST to /api/v1/<endpoint> and return the decoded JSON body."""
+        session = self._get_session()
+        url = f"{self.api_url}/{endpoint}"
+        for attempt in range(self.max_retries + 1):
+            async with self._semaphore:
+                try:
+                    async with session.post(url, json=payload) as response:
+                        if response.status < 400:
+                            return self._decode(url, response.status, await response.read())
+                        error = AirbyteAPIError(url, f"HTTP {response.status}: {await response.text()}", response.status)
+                        if response.status < 500:
+                            raise error
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    # Connection errors, truncated bodies (ClientPayloadError) and timeouts
+                    error = AirbyteAPIError(url, f"{type(e).__name__}: {e}")
+            if attempt == self.max_retries:
+                raise error
+            await asyncio.sleep(random.uniform(0, self.backoff_seconds * 2 ** attempt))
+
+    @staticmethod
+    def _decode(url: str, status: int, body: bytes) -> Dict[str, Any]:
+        try:
+            data = json.loads(body)
+        except ValueError as e:
+            raise AirbyteAPIError(url, f"Invalid JSON in HTTP {status} response: {e}", status)
+        if not isinstance(data, dict):
+            raise AirbyteAPIError(url, f"Expected a JSON object in HTTP {status} response", status)
+        return data
+
+    async def list_connections(self, workspace_id: str) -> List[AirbyteConnection]:
+        data = await self.post("connections/list", {"workspaceId": workspace_id})
+        return [AirbyteConnection.from_api(c) for c in data.get("connections", [])]
+
+    async def get_connection(self, connection_id: str) -> AirbyteConnection:
+        return AirbyteConnection.from_api(await self.post("connections/get", {"connectionId": connection_id}))
+
+    async def list_destinations(self, workspace_id: str) -> List[AirbyteDestination]:
+        data = await self.post("destinations/list", {"workspaceId": workspace_id})
+        return [AirbyteDestination.from_api(d) for d in data.get("destinations", [])]
+
+    async def get_destination(self, destination_id: str) -> AirbyteDestination:
+        return AirbyteDestination.from_api(await self.post("destinations/get", {"destinationId": destination_id}))
+
+    async def get_destination_definition(self, destination_definition_id: str) -> AirbyteDestinationDefinition:
+        data = await self.post("destination_definitions/get", {"destinationDefinitionId": destination_definition_id})
+        return AirbyteDestinationDefinition.from_api(data)
+
+
+class _ClientLoop:
+    """
+    Background event loop thread hosting the shared clients of this process.
+
+    Started on first use, and again in a forked child (gunicorn preloads the app
+    before forking workers, and threads don't survive a fork).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pid: Optional[int] = None
+        self._clients: Dict[str, AsyncAirbyteClient] = {}
+        # Clients inherited from a parent process; their loop thread is gone, so they are kept
+        # referenced instead of being garbage collected with unclosed-session warnings.
+        self._stale_clients: List[AsyncAirbyteClient] = []
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._pid != os.getpid():
+                self._loop = asyncio.new_event_loop()
+                self._pid = os.getpid()
+                self._stale_clients.extend(self._clients.values())
+                self._clients = {}
+                threading.Thread(target=self._loop.run_forever, name="airbyte-client-loop", daemon=True).start()
+            return self._loop
+
+    def client(self, base_url: str) -> AsyncAirbyteClient:
+        """Shared client for base_url; only use it from coroutines running on this loop."""
+        if base_url not in self._clients:
+            self._clients[base_url] = AsyncAirbyteClient(base_url)
+        return self._clients[base_url]
+
+    def run(self, coroutine, timeout: float):
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coroutine, loop)
+        try:
+            return future.result(timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+
+_client_loop = _ClientLoop()
+
+
+def run_sync(coroutine_function, base_url: str, *args, **kwargs):
+    """
+    Run coroutine_function(client, *args, **kwargs) with the shared client for base_url
+    and return its result. Blocks the calling thread; for use from synchronous code.
+
+    Raises:
+        AirbyteAPIError: if there is no result within AIRBYTE_CLIENT_CALL_TIMEOUT seconds
+    """
+    async def call():
+        return await coroutine_function(_client_loop.client(base_url), *args, **kwargs)
+
+    try:
+        return _client_loop.run(call(), AIRBYTE_CLIENT_CALL_TIMEOUT)
+    except concurrent.futures.TimeoutError:
+        raise AirbyteAPIError(base_url, f"No result within {AIRBYTE_CLIENT_CALL_TIMEOUT:g}s")
+
+
+class SyncAirbyteClient:
+    """Blocking facade over the shared AsyncAirbyteClient for base_url."""
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+
+    def _call(self, method_name: str, *args):
+        async def call(client):
+            return await getattr(client, method_name)(*args)
+
+        return run_sync(call, self.base_url)
+
+    def list_connections(self, workspace_id: str) -> List[AirbyteConnection]:
+        return self._call("list_connections", workspace_id)
+
+    def get_connection(self, connection_id: str) -> AirbyteConnection:
+        return self._call("get_connection", connection_id)
+
+    def list_destinations(self, workspace_id: str) -> List[AirbyteDestination]:
+        return self._call("list_destinations", workspace_id)
+
+    def get_destination(self, destination_id: str) -> AirbyteDestination:
+        return self._call("get_destination", destination_id)
+
+    def get_destination_definition(self, destination_definition_id: str) -> AirbyteDestinationDefinition:
+        return self._call("get_destination_definition", destination_definition_id)
@@ -12,6 +12,7 @@ from config import Config
 from security import auth
 from werkzeug.middleware.proxy_fix import ProxyFix
 from api_docs import configure_api_docs
+import git_metrics
 #from db import dbNavigator
 
 class StreamToLogger(object):
@@ -54,6 +55,7 @@ def create_app():
     CORS(app)
 
     configure_api_docs(app)
+    git_metrics.init_app(app)
 
     app.config.from_object(Config)
     app.config['CACHE_TYPE'] = 'SimpleCache'
@@ -32,6 +32,10 @@ class Config:
     if GROUP_ACCESS_TOKEN is None:
         raise ValueError("Environment variable GROUP_ACCESS_TOKEN is required")
 
+    # Secret shared with the data model repository's push webhook (GitHub webhook secret or GitLab secret token).
+    # Optional: POST /api/v3/repository/webhook is disabled when unset.
+    REPOSITORY_WEBHOOK_SECRET = os.getenv('REPOSITORY_WEBHOOK_SECRET')
+
     MINIO_BUCKET_NAME = os.getenv('MINIO_BUCKET_NAME')
     if MINIO_BUCKET_NAME is None:
         raise ValueError("Environment variable MINIO_BUCKET_NAME is required")
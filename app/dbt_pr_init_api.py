@@ -5,11 +5,11 @@ from apiflask.fields import Integer, String, Boolean, URL, DateTime, Raw, List
 from apiflask.validators import Length, OneOf, ValidationError, Equal
 from flask import request, jsonify
 from security import auth
+from git_metrics import InstrumentedRepo
 import json
 import random
 import re
 import ruamel.yaml
-import git
 import shutil
 import string
 from jinja2 import Template
@@ -528,7 +528,7 @@ def create_dbt_project(data, request_data, env):
             "https://", "https://oauth2:{}@".format(group_token)
         )
         ## Clone the GitLab repository
-        repo = git.Repo.clone_from(repo_url_final, temp_clone_directory)
+        repo = InstrumentedRepo.clone_from(repo_url_final, temp_clone_directory)
 
         reinit = cache_data.get("reinit_project", False)
         if reinit:
@@ -1,7 +1,7 @@
-from apiflask import APIFlask, Schema, abort, APIBlueprint
+from apiflask import APIFlask, Schema, abort, APIBlueprint, fields
 from apiflask.fields import Integer, String, Boolean, URL, DateTime, Raw, File, Nested, List
 from apiflask.validators import Length, OneOf
-from flask import request, jsonify
+from flask import request, jsonify, Response, g, has_request_context
 from security import auth
 import git
 import os
@@ -20,14 +20,31 @@ import tempfile
 import logging
 import re
 import requests
-from typing import Dict, List, Optional, Tuple, Any
-from marshmallow import validates, ValidationError
+from typing import Dict, List, Optional, Tuple, Any, Callable
+from collections import OrderedDict
+from marshmallow import validates, validates_schema, ValidationError
 from pathlib import Path
 import base64
+import copy
+import fnmatch
+import functools
+import io
+import fcntl
+import hashlib
+import hmac
+import threading
+import time
 from contextlib import contextmanager
-from airbyte import get_airbyte_destination_version
+from airbyte import (
+    get_airbyte_destination_version,
+    get_airbyte_destination_versions,
+    get_airbyte_catalog_drift,
+    primary_connection_id,
+)
 from ruamel.yaml import YAML
 from ruamel.yaml.scalarstring import SingleQuotedScalarString
+from git_backend import GitBackend, get_git_backend
+from git_metrics import InstrumentedRepo, git_command_metrics, timed_git_command
 
 # Schema Definitions
 class ProjectDatesSchema(Schema):
@@ -72,6 +89,28 @@ class RenameInputSchema(Schema):
 class OwnerInputSchema(Schema):
     owner_name = String(required=True, metadata={'description': 'New Owner name of the DBT project'})
 
+class BulkVariablesSelectorSchema(Schema):
+    """Projects to update; all given criteria must match"""
+    project_names = fields.List(String(), validate=Length(min=1), metadata={'description': 'Explicit project names'})
+    owner = String(metadata={'description': 'Projects whose DAG_OWNER equals this value'})
+    operator = String(metadata={'description': 'Projects using this operator (k8s, gke, api, bash)'})
+    project_glob = String(metadata={'description': "Shell-style pattern on the project name, e.g. 'sales_*'"})
+
+    @validates_schema
+    def validate_not_empty(self, data, **kwargs):
+        if not data:
+            raise ValidationError('At least one selector is required')
+
+class BulkUpdateVariablesInputSchema(Schema):
+    selector = Nested(BulkVariablesSelectorSchema, required=True, metadata={'description': 'Which projects to update'})
+    variables = Raw(required=True, metadata={'description': 'Variables to set in every matching project; null removes a variable'})
+    branch_name = String(validate=Length(1, 255), metadata={'description': 'Branch to push (auto-generated if omitted)'})
+
+    @validates('variables')
+    def validate_variables(self, value, **kwargs):
+        if not isinstance(value, dict) or not value:
+            raise ValidationError('variables must be a non-empty object')
+
 class PackageSchema(Schema):
     package = String(required=True, validate=Length(1, 255), metadata={'description': 'The DBT package name'})
     version = String(required=True, validate=Length(1, 16), metadata={'description': 'The DBT package version'})
@@ -113,6 +152,358 @@ class DeleteProjectResponseSchema(Schema):
     data_deleted = Boolean(required=True, metadata={'description': 'Whether the warehouse data was successfully deleted'})
     timestamp = DateTime(dump_default=datetime.now, metadata={'description': 'Time of deletion operation'})
 
+class ProjectHistoryIndex:
+    """
+    Creation and last modification dates of every top-level project folder, built from a
+    single history walk (`git log --name-status` or its in-process equivalent, see
+    git_backend) instead of two path-limited logs per project.
+
+    Matches the per-path queries it replaces: the creation date is the author date of the
+    oldest commit adding a file under the folder, the last modified date that of the newest
+    commit touching it. When HEAD moves forward only the new commits are walked; if HEAD
+    moved elsewhere (branch switch, force push) the index is rebuilt.
+    """
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger
+        self.head = None
+        self.created: Dict[str, datetime] = {}
+        self.modified: Dict[str, datetime] = {}
+        self._lock = threading.Lock()
+
+    def update(self, repo: git.Repo):
+        """Bring the index up to date with HEAD"""
+        with self._lock:
+            self._update(repo)
+
+    def get_dates(self, repo: git.Repo, project_path: str) -> tuple[Optional[datetime], Optional[datetime]]:
+        """Return (creation_date, last_modified_date) of a top-level folder, updating the index if HEAD moved."""
+        with self._lock:
+            self._update(repo)
+            folder = Path(project_path).parts[0] if project_path else project_path
+            return self.created.get(folder), self.modified.get(folder)
+
+    def _update(self, repo: git.Repo):
+        backend = get_git_backend(repo)
+        head = backend.head()
+        if head is None:
+            # No commits yet
+            self.head, self.created, self.modified = None, {}, {}
+            return
+        if head == self.head:
+            return
+
+        if self.head and backend.is_ancestor(self.head, head):
+            created, modified = self._walk(backend, head, self.head)
+            for folder, date in created.items():
+                self.created.setdefault(folder, date)
+            self.modified.update(modified)
+            self.logger.info(f"Updated project history index from {self.head[:8]} to {head[:8]}")
+        else:
+            self.created, self.modified = self._walk(backend, head)
+            self.logger.info(f"Built project history index at {head[:8]} for {len(self.modified)} folders")
+        self.head = head
+
+    @staticmethod
+    def _walk(backend: GitBackend, head: str, since: Optional[str] = None) -> tuple[Dict[str, datetime], Dict[str, datetime]]:
+        """Walk since..head newest first, returning ({folder: oldest add date}, {folder: newest change date})"""
+        created: Dict[str, datetime] = {}
+        modified: Dict[str, datetime] = {}
+        for author_date, changes in backend.walk_changes(head, since):
+            for status, path in changes:
+                if '/' not in path:
+                    continue  # files at the repository root don't belong to a project
+                folder = path.split('/', 1)[0]
+                modified.setdefault(folder, author_date)
+                if status == 'A':
+                    created[folder] = author_date  # walking newest first, the last add wins
+        return created, modified
+
+
+_history_indexes: Dict[str, ProjectHistoryIndex] = {}
+_history_indexes_lock = threading.Lock()
+
+
+def get_project_history_index(repo: git.Repo, logger: logging.Logger) -> ProjectHistoryIndex:
+    """Shared history index for the repository at repo.git_dir"""
+    with _history_indexes_lock:
+        if repo.git_dir not in _history_indexes:
+            _history_indexes[repo.git_dir] = ProjectHistoryIndex(logger)
+        return _history_indexes[repo.git_dir]
+
+
+# Parsed project files kept in memory; 0 disables the cache
+PARSED_FILE_CACHE_SIZE = int(os.getenv('PARSED_FILE_CACHE_SIZE', '2048'))
+
+
+def resolve_project_tree(repo: git.Repo, project_name: str) -> Optional[str]:
+    """
+    Sha of the project's tree at HEAD, or None if it isn't committed there. Resolved once per
+    request; conditional GETs resolve it first for their ETag.
+    """
+    if not has_request_context():
+        return get_git_backend(repo).resolve(f'HEAD:{project_name}')
+    project_trees = g.setdefault('project_trees', {})
+    if (repo.git_dir, project_name) not in project_trees:
+        project_trees[repo.git_dir, project_name] = get_git_backend(repo).resolve(f'HEAD:{project_name}')
+    return project_trees[repo.git_dir, project_name]
+
+
+class ParsedFileCache:
+    """
+    Bounded LRU cache of parsed project files, keyed by (project, file, blob sha, parser).
+
+    Files are looked up in the project's tree at the checked-out HEAD (the checkout is only
+    moved by pulls, so HEAD is what's on disk) and parsed from the blob, so a cached result
+    always matches its key; a sync or commit that changes a file changes its blob sha, and
+    the stale entry just ages out. Tree listings are cached by tree sha as well, so a hit
+    costs no git command once the request has resolved the project's tree. Projects that
+    aren't committed (or reads without a repository) are read from disk and not cached.
+    Callers get a copy they may modify.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: 'OrderedDict[tuple, Any]' = OrderedDict()
+        self._trees: 'OrderedDict[str, Dict[str, Tuple[str, str]]]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, repo: Optional[git.Repo], project_dir: Path, file_name: str, parse: Callable[[Optional[str]], Any]) -> Any:
+        """
+        parse(content) of project_dir/file_name, where content is None if the file doesn't exist
+
+        Args:
+            repo: Repository checked out at project_dir.parent, or None to always read from disk
+            project_dir: Project folder in the checkout
+            file_name: File name inside the project folder
+            parse: Parser for the file content; its result is cached, so it must only depend on content
+        """
+        project_name = project_dir.name
+        path = project_dir / file_name
+        tree_sha = resolve_project_tree(repo, project_name) if repo is not None and self.maxsize > 0 else None
+        entries = self._tree_entries(repo, tree_sha) if tree_sha else None
+        if entries is None:
+            return parse(path.read_text() if path.is_file() else None)
+
+        mode, blob_sha = entries.get(file_name, (None, None))
+        if mode not in ('100644', '100755'):
+            # Not a file in the tree; symlinks are read through the checkout
+            return parse(path.read_text() if mode == '120000' and path.is_file() else None)
+
+        key = (project_name, file_name, blob_sha, parse.__qualname__)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(self._entries[key])
+            self.misses += 1
+
+        value = parse(get_git_backend(repo).read_blob(tree_sha, file_name).decode('utf-8'))
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return copy.deepcopy(value)
+
+    def _tree_entries(self, repo: git.Repo, tree_sha: str) -> Optional[Dict[str, Tuple[str, str]]]:
+        """{name: (mode, sha)} of the tree, or None if tree_sha isn't a tree"""
+        with self._lock:
+            if tree_sha in self._trees:
+                self._trees.move_to_end(tree_sha)
+                return self._trees[tree_sha]
+        listing = get_git_backend(repo).list_tree(tree_sha)
+        if listing is None:
+            return None
+        entries = {name: (mode, sha) for mode, _, sha, name in listing}
+        with self._lock:
+            self._trees[tree_sha] = entries
+            while len(self._trees) > self.maxsize:
+                self._trees.popitem(last=False)
+        return entries
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {'hits_total': self.hits, 'misses_total': self.misses, 'entries': len(self._entries)}
+
+
+parsed_file_cache = ParsedFileCache(PARSED_FILE_CACHE_SIZE)
+git_command_metrics.add_counter_source('parsed_file_cache', parsed_file_cache.stats)
+
+
+# Partial clone filter for the data model mirror; historical blobs are fetched on demand.
+# Empty for a full clone.
+DATA_MODEL_CLONE_FILTER = os.getenv('DATA_MODEL_CLONE_FILTER', 'blob:none')
+
+
+def process_alive(pid: int) -> bool:
+    """Whether a process with this pid exists (in this pid namespace)"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# Seconds a successful repository refresh is reused by read endpoints before checking the remote again
+REPOSITORY_REFRESH_MAX_STALENESS = float(os.getenv('REPOSITORY_REFRESH_MAX_STALENESS', '30'))
+
+
+class RepositoryRefreshCoordinator:
+    """
+    Coalesces repository refreshes across request threads and gunicorn workers, which all
+    share the same checkout.
+
+    Callers within max_staleness seconds of the last successful refresh get its result
+    without touching git. Concurrent callers in one process share a single in-flight
+    refresh; across processes a file lock serializes refreshes, and a caller that waited
+    on it reuses the result of the refresh that finished while it was waiting.
+    """
+
+    def __init__(self, state_dir: str, refresh: callable):
+        self._refresh = refresh
+        self._lock_path = Path(state_dir) / '.repository_refresh.lock'
+        self._state_path = Path(state_dir) / '.repository_refresh.json'
+        self._lock = threading.Lock()
+        self._in_flight = None
+
+    def refresh(self, max_staleness: float = 0) -> Dict[str, Any]:
+        requested_at = time.time()
+        result = self._recent_result(requested_at, max_staleness)
+        if result:
+            return result
+
+        with self._lock:
+            flight = self._in_flight
+            leader = flight is None
+            if leader:
+                flight = self._in_flight = {'done': threading.Event(), 'result': None}
+
+        if not leader:
+            flight['done'].wait()
+            return flight['result']
+
+        try:
+            flight['result'] = self._refresh_locked(requested_at, max_staleness)
+        except Exception as e:
+            flight['result'] = {"success": False, "message": f"Unexpected error during refresh: {str(e)}"}
+        finally:
+            with self._lock:
+                self._in_flight = None
+            flight['done'].set()
+        return flight['result']
+
+    def _refresh_locked(self, requested_at: float, max_staleness: float) -> Dict[str, Any]:
+        self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._lock_path, 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                result = self._recent_result(requested_at, max_staleness, finished_after=requested_at)
+                if result:
+                    return result
+                result = self._refresh()
+                if result.get("success"):
+                    self._state_path.write_text(json.dumps({'finished_at': time.time(), 'result': result}))
+                return result
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _recent_result(self, now: float, max_staleness: float, finished_after: float = None) -> Optional[Dict[str, Any]]:
+        """Result of the last successful refresh if it is fresh enough, else None"""
+        try:
+            state = json.loads(self._state_path.read_text())
+        except (OSError, ValueError):
+            return None
+        finished_at = state.get('finished_at', 0)
+        if (finished_after is not None and finished_at >= finished_after) or now - finished_at < max_staleness:
+            return state.get('result')
+        return None
+
+
+# Seconds between background syncs of the data model repository; 0 disables them and
+# read endpoints refresh on request instead
+REPOSITORY_SYNC_INTERVAL = float(os.getenv('REPOSITORY_SYNC_INTERVAL', '60'))
+
+
+class RepositorySyncWorker:
+    """
+    Keeps the shared checkout in sync from a background thread so read endpoints never wait
+    on git network I/O.
+
+    Syncs every `interval` seconds and immediately when trigger() is called (push webhook).
+    Timed syncs reuse a refresh that any worker process finished within the interval, so the
+    fleet fetches about once per interval. Derived indexes are rebuilt after each sync.
+
+    The thread is started lazily per process: gunicorn preloads the app before forking
+    workers, and threads don't survive a fork.
+    """
+
+    def __init__(self, project_manager: 'ProjectManager', interval: float):
+        self.project_manager = project_manager
+        self.interval = interval
+        self.logger = logging.getLogger(__name__)
+        self.last_result: Optional[Dict[str, Any]] = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._pid = None
+
+    @property
+    def periodic(self) -> bool:
+        return self.interval > 0
+
+    def ensure_started(self):
+        if self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._pid != os.getpid():
+                self._wake = threading.Event()
+                threading.Thread(target=self._run, name='repository-sync', daemon=True).start()
+                self._pid = os.getpid()
+
+    def trigger(self):
+        """Run a forced sync as soon as possible"""
+        self.ensure_started()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            triggered = self._wake.wait(self.interval if self.periodic else None)
+            self._wake.clear()
+            try:
+                self.sync(max_staleness=0 if triggered else self.interval)
+            except Exception as e:
+                self.logger.error(f"Background repository sync failed: {e}")
+
+    def sync(self, max_staleness: float = 0) -> Dict[str, Any]:
+        result = self.project_manager.refresh_repository(max_staleness=max_staleness)
+        self.last_result = result
+        if not result["success"]:
+            self.logger.error(f"Background repository sync failed: {result['message']}")
+            return result
+        repo = self.project_manager.repo
+        get_project_history_index(repo, self.logger).update(repo)
+        return result
+
+
+def verify_webhook_signature(headers, body: bytes, secret: str) -> bool:
+    """
+    Verify a push webhook: GitHub signs the body with HMAC-SHA256 (X-Hub-Signature-256),
+    GitLab sends the secret token as is (X-Gitlab-Token)
+    """
+    github_signature = headers.get('X-Hub-Signature-256')
+    if github_signature:
+        expected = 'sha256=' + hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+        return hmac.compare_digest(github_signature.encode(), expected.encode())
+    gitlab_token = headers.get('X-Gitlab-Token')
+    if gitlab_token is not None:
+        return hmac.compare_digest(gitlab_token.encode(), secret.encode())
+    return False
+
+
 class ProjectManager:
     def __init__(self, repo_url: str, repo_token: str, base_path: str):
         self.repo_url = repo_url
@@ -138,7 +529,15 @@ class ProjectManager:
             secure=True  # Use HTTPS
         )
         self.repo = None
+        # (origin/HEAD symref it was resolved from, default branch name)
+        self._default_branch: Optional[Tuple[Optional[str], str]] = None
         self._init_repo()
+        self.refresh_coordinator = RepositoryRefreshCoordinator(base_path, self._fetch_and_pull)
+
+    @property
+    def git_backend(self) -> GitBackend:
+        """Backend for reads of the shared repository (objects and refs); writes and network use the CLI"""
+        return get_git_backend(self.repo)
 
     def _setup_logging(self):
         """Configure logging with appropriate levels"""
@@ -159,16 +558,32 @@ class ProjectManager:
         repo_path = Path(self.base_path) / 'dbt_projects'
         
         try:
+            started = time.perf_counter()
             if repo_path.exists():
                 self.logger.info("Repository exists, pulling latest changes")
-                self.repo = git.Repo(repo_path)
+                self.repo = InstrumentedRepo(repo_path)
                 self.repo.remotes.origin.pull()
+                action = "Pulled repository"
             else:
-                self.logger.info("Cloning repository")
+                self.logger.info(f"Cloning repository (filter: {DATA_MODEL_CLONE_FILTER or 'none'})")
                 repo_url_with_token = self.repo_url.replace(
                     "https://", f"https://oauth2:{self.repo_token}@"
                 )
-                self.repo = git.Repo.clone_from(repo_url_with_token, repo_path)
+                clone_options = {'filter': DATA_MODEL_CLONE_FILTER} if DATA_MODEL_CLONE_FILTER else {}
+                self.repo = InstrumentedRepo.clone_from(repo_url_with_token, repo_path, **clone_options)
+                action = "Cloned repository"
+            self._prune_worktrees()
+
+            # Loose objects, packs and garbage in KiB, as counted by git from its own bookkeeping
+            object_stats = dict(
+                line.split(': ', 1) for line in self.repo.git.count_objects('-v').splitlines() if ': ' in line
+            )
+            object_size = sum(int(object_stats.get(key, 0)) for key in ('size', 'size-pack', 'size-garbage'))
+            self.logger.info(
+                f"{action} in {time.perf_counter() - started:.1f}s "
+                f"(partial clone filter: {self.repo.git.config('--get', 'remote.origin.partialclonefilter', with_exceptions=False) or 'none'}); "
+                f"object store {object_size / 1024:.1f} MB"
+            )
                 
         except git.GitCommandError as e:
             self.logger.error(f"Git command failed: {e}")
@@ -198,28 +613,7 @@ class ProjectManager:
         try:
             for item in repo_path.iterdir():
                 if item.is_dir() and (item / 'dbt_project.yml').exists():
-                    # Get project path relative to repo root for Git operations
-                    relative_path = item.relative_to(repo_path)
-                    
-                    # Get dates from Git history
-                    created_at, last_modified = self.get_project_dates(str(relative_path))
-                    
-                    if created_at and last_modified:
-                        projects.append({
-                            'project_name': item.name,
-                            'path': str(relative_path),
-                            'created_at': created_at,
-                            'last_modified': last_modified
-                        })
-                    else:
-                        # Fallback to filesystem dates if Git history unavailable
-                        self.logger.warning(f"Using filesystem dates for {item.name}")
-                        projects.append({
-                            'project_name': item.name,
-                            'path': str(relative_path),
-                            'created_at': datetime.fromtimestamp(item.stat().st_ctime),
-                            'last_modified': datetime.fromtimestamp(item.stat().st_mtime)
-                        })
+                    projects.append(self._project_entry(item, repo_path))
 
             return sorted(projects, key=lambda x: x['created_at'], reverse=True)
 
@@ -227,6 +621,42 @@ class ProjectManager:
             self.logger.error(f"Error listing projects: {str(e)}")
             raise
 
+    def get_project(self, project_name: str) -> Optional[Dict]:
+        """
+        Get a single project entry as list_projects reports it, without scanning the other projects
+
+        Args:
+            project_name: Name of the project
+
+        Returns:
+            Project dictionary (project_name, path, created_at, last_modified) or None if not found
+        """
+        repo_path = Path(self.base_path) / 'dbt_projects'
+        item = repo_path / project_name
+        if item.parent != repo_path or not item.is_dir() or not (item / 'dbt_project.yml').exists():
+            return None
+        return self._project_entry(item, repo_path)
+
+    def _project_entry(self, item: Path, repo_path: Path) -> Dict:
+        # Get project path relative to repo root for Git operations
+        relative_path = item.relative_to(repo_path)
+
+        # Get dates from Git history
+        created_at, last_modified = self.get_project_dates(str(relative_path))
+
+        if not (created_at and last_modified):
+            # Fallback to filesystem dates if Git history unavailable
+            self.logger.warning(f"Using filesystem dates for {item.name}")
+            created_at = datetime.fromtimestamp(item.stat().st_ctime)
+            last_modified = datetime.fromtimestamp(item.stat().st_mtime)
+
+        return {
+            'project_name': item.name,
+            'path': str(relative_path),
+            'created_at': created_at,
+            'last_modified': last_modified
+        }
+
     def delete_project_dependencies(self, project_name: str) -> Dict[str, bool]:
         """
         Delete all project dependencies
@@ -286,122 +716,126 @@ class ProjectManager:
             'data_deleted': False
         }
 
-        if delete_data:
-            try:
-                # Initialize warehouse auth manager
-                auth_manager = WarehouseAuthManager(self.logger)
-                
-                # Read profiles.yml to determine warehouse type
-                profiles_path = project_path / 'profiles.yml'
-                if not profiles_path.exists():
-                    self.logger.error(f"profiles.yml not found in project {project_name}")
-                    return False, deletion_status
+        # Cleanup macros, dbt artifacts and the folder removal all happen in a throwaway worktree
+        with self._write_worktree() as worktree:
+            project_path = Path(worktree.working_tree_dir) / project_name
 
-                with open(profiles_path, 'r') as f:
-                    profiles = yaml.safe_load(f)
-                    first_profile = next(iter(profiles.values()))
-                    target = first_profile.get('target')
-                    outputs = first_profile.get('outputs', {})
-                    target_config = outputs.get(target, {})
-                    warehouse_type = target_config.get('type')
-
-                # Define cleanup macro paths for different warehouses
-                MACRO_PATHS = {
-                    'bigquery': '/usr/src/app/assets/dbt/macros/bigquery_cleanup_dbt_dataset.sql',
-                    'redshift': '/usr/src/app/assets/dbt/macros/redshift_cleanup_dbt_dataset.sql',
-                    'snowflake': '/usr/src/app/assets/dbt/macros/snowflake_cleanup_dbt_dataset.sql',
-                    'fabric': '/usr/src/app/assets/dbt/macros/fabric_cleanup_dbt_dataset.sql',
-                    'postgres': '/usr/src/app/assets/dbt/macros/postgres_cleanup_dbt_dataset.sql'
-                }
+            if delete_data:
+                try:
+                    # Initialize warehouse auth manager
+                    auth_manager = WarehouseAuthManager(self.logger)
+                
+                    # Read profiles.yml to determine warehouse type
+                    profiles_path = project_path / 'profiles.yml'
+                    if not profiles_path.exists():
+                        self.logger.error(f"profiles.yml not found in project {project_name}")
+                        return False, deletion_status
 
-                if warehouse_type not in MACRO_PATHS:
-                    self.logger.error(f"Unsupported warehouse type: {warehouse_type}")
-                    return False, deletion_status
+                    with open(profiles_path, 'r') as f:
+                        profiles = yaml.safe_load(f)
+                        first_profile = next(iter(profiles.values()))
+                        target = first_profile.get('target')
+                        outputs = first_profile.get('outputs', {})
+                        target_config = outputs.get(target, {})
+                        warehouse_type = target_config.get('type')
+
+                    # Define cleanup macro paths for different warehouses
+                    MACRO_PATHS = {
+                        'bigquery': '/usr/src/app/assets/dbt/macros/bigquery_cleanup_dbt_dataset.sql',
+                        'redshift': '/usr/src/app/assets/dbt/macros/redshift_cleanup_dbt_dataset.sql',
+                        'snowflake': '/usr/src/app/assets/dbt/macros/snowflake_cleanup_dbt_dataset.sql',
+                        'fabric': '/usr/src/app/assets/dbt/macros/fabric_cleanup_dbt_dataset.sql',
+                        'postgres': '/usr/src/app/assets/dbt/macros/postgres_cleanup_dbt_dataset.sql'
+                    }
 
-                # Set up macros directory
-                macros_path = project_path / 'macros'
-                if not macros_path.exists():
-                    macros_path.mkdir(parents=True)
+                    if warehouse_type not in MACRO_PATHS:
+                        self.logger.error(f"Unsupported warehouse type: {warehouse_type}")
+                        return False, deletion_status
 
-                # Copy appropriate cleanup macro
-                cleanup_macro_path = macros_path / 'cleanup_dbt_dataset.sql'
-                source_macro = MACRO_PATHS[warehouse_type]
+                    # Set up macros directory
+                    macros_path = project_path / 'macros'
+                    if not macros_path.exists():
+                        macros_path.mkdir(parents=True)
 
-                if not os.path.exists(source_macro):
-                    self.logger.error(f"Cleanup macro not found at {source_macro}")
-                    return False, deletion_status
+                    # Copy appropriate cleanup macro
+                    cleanup_macro_path = macros_path / 'cleanup_dbt_dataset.sql'
+                    source_macro = MACRO_PATHS[warehouse_type]
 
-                shutil.copy(source_macro, cleanup_macro_path)
+                    if not os.path.exists(source_macro):
+                        self.logger.error(f"Cleanup macro not found at {source_macro}")
+                        return False, deletion_status
 
-                # Get the appropriate auth handler
-                auth_handlers = {
-                    'bigquery': auth_manager.bigquery_auth,
-                    'snowflake': auth_manager.snowflake_auth,
-                    'redshift': auth_manager.redshift_auth,
-                    'fabric': auth_manager.fabric_auth,
-                    'postgres': auth_manager.postgres_auth
-                }
+                    shutil.copy(source_macro, cleanup_macro_path)
 
-                auth_handler = auth_handlers.get(warehouse_type)
-                if not auth_handler:
-                    self.logger.error(f"No auth handler found for warehouse type: {warehouse_type}")
-                    return False, deletion_status
+                    # Get the appropriate auth handler
+                    auth_handlers = {
+                        'bigquery': auth_manager.bigquery_auth,
+                        'snowflake': auth_manager.snowflake_auth,
+                        'redshift': auth_manager.redshift_auth,
+                        'fabric': auth_manager.fabric_auth,
+                        'postgres': auth_manager.postgres_auth
+                    }
 
-                # Execute dbt commands within the auth context
-                with auth_handler():
-                    try:
-                        # Run dbt deps
-                        deps_result = subprocess.run(
-                            ['dbt', 'deps'],
-                            cwd=project_path,
-                            capture_output=True,
-                            text=True,
-                            check=True
-                        )
-                        self.logger.debug(f"DBT deps output: {deps_result.stdout}")
+                    auth_handler = auth_handlers.get(warehouse_type)
+                    if not auth_handler:
+                        self.logger.error(f"No auth handler found for warehouse type: {warehouse_type}")
+                        return False, deletion_status
 
-                        # Run cleanup operation
-                        cleanup_result = subprocess.run(
-                            ['dbt', 'run-operation', 'cleanup_dbt_dataset',
-                            '--args', '{"dry_run": false}',
-                            '--target', 'sa'],
-                            cwd=project_path,
-                            capture_output=True,
-                            text=True,
-                            check=True
-                        )
-                        self.logger.debug(f"DBT cleanup output: {cleanup_result.stdout}")
-                        deletion_status['data_deleted'] = True
+                    # Execute dbt commands within the auth context
+                    with auth_handler():
+                        try:
+                            # Run dbt deps
+                            deps_result = subprocess.run(
+                                ['dbt', 'deps'],
+                                cwd=project_path,
+                                capture_output=True,
+                                text=True,
+                                check=True
+                            )
+                            self.logger.debug(f"DBT deps output: {deps_result.stdout}")
+
+                            # Run cleanup operation
+                            cleanup_result = subprocess.run(
+                                ['dbt', 'run-operation', 'cleanup_dbt_dataset',
+                                '--args', '{"dry_run": false}',
+                                '--target', 'sa'],
+                                cwd=project_path,
+                                capture_output=True,
+                                text=True,
+                                check=True
+                            )
+                            self.logger.debug(f"DBT cleanup output: {cleanup_result.stdout}")
+                            deletion_status['data_deleted'] = True
 
-                    except subprocess.CalledProcessError as e:
-                        self.logger.error(f"DBT command failed: {e.stderr}")
-                        return False, deletion_status
+                        except subprocess.CalledProcessError as e:
+                            self.logger.error(f"DBT command failed: {e.stderr}")
+                            return False, deletion_status
 
-            except Exception as e:
-                self.logger.error(f"Error during data deletion: {str(e)}")
-                return False, deletion_status
+                except Exception as e:
+                    self.logger.error(f"Error during data deletion: {str(e)}")
+                    return False, deletion_status
 
-        if delete_folder:
-            try:
-                # First delete dependencies
-                dependency_status = self.delete_project_dependencies(project_name)
+            if delete_folder:
+                try:
+                    # First delete dependencies
+                    dependency_status = self.delete_project_dependencies(project_name)
                 
-                # Generate branch name
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                branch_name = f"del_{project_name}_{timestamp}"
+                    # Generate branch name
+                    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                    branch_name = f"del_{project_name}_{timestamp}"
                 
-                # Then delete the project folder
-                shutil.rmtree(project_path)
-                self._commit_and_push(f"Deleted project {project_name}", branch=branch_name)
+                    # Then delete the project folder
+                    shutil.rmtree(project_path)
+                    self._commit_and_push(worktree, f"Deleted project {project_name}", branch=branch_name)
                 
-                # Update deletion status
-                deletion_status['folder_deleted'] = True
-                deletion_status.update(dependency_status)
-                deletion_status['branch_name'] = branch_name  # Add branch name to status
+                    # Update deletion status
+                    deletion_status['folder_deleted'] = True
+                    deletion_status.update(dependency_status)
+                    deletion_status['branch_name'] = branch_name  # Add branch name to status
                 
-            except Exception as e:
-                self.logger.error(f"Error deleting project folder: {str(e)}")
-                return False, deletion_status
+                except Exception as e:
+                    self.logger.error(f"Error deleting project folder: {str(e)}")
+                    return False, deletion_status
 
         return True, deletion_status
 
@@ -463,70 +897,54 @@ class ProjectManager:
                 # Clean up temporary zip file
                 temp_zip_path.unlink()
 
+    def get_project_tree_sha(self, project_name: str) -> Optional[str]:
+        """
+        Sha of the project's tree in the checked-out default branch, or None if it doesn't
+        exist there. The project's files in the checkout change exactly when this does.
+        """
+        return resolve_project_tree(self.repo, project_name)
+
     def get_project_variables(self, project_name: str) -> Dict:
         """Get project variables from dbt_airflow_variables.yml"""
-        variables_path = Path(self.base_path) / 'dbt_projects' / project_name / 'dbt_airflow_variables.yml'
-        
-        if not variables_path.exists():
-            return {}
-
-        with open(variables_path, 'r') as f:
-            return yaml.safe_load(f)
+        project_dir = Path(self.base_path) / 'dbt_projects' / project_name
+        return parsed_file_cache.get(self.repo, project_dir, 'dbt_airflow_variables.yml', self._parse_yaml_document)
         
     def get_project_profiles(self, project_name: str) -> Dict:
         """Get project variables from profiles.yml"""
-        variables_path = Path(self.base_path) / 'dbt_projects' / project_name / 'profiles.yml'
-        
-        if not variables_path.exists():
-            return {}
+        project_dir = Path(self.base_path) / 'dbt_projects' / project_name
+        return parsed_file_cache.get(self.repo, project_dir, 'profiles.yml', self._parse_yaml_document)
 
-        with open(variables_path, 'r') as f:
-            return yaml.safe_load(f)
+    @staticmethod
+    def _parse_yaml_document(content: Optional[str]) -> Any:
+        if content is None:
+            return {}
+        return yaml.safe_load(content)
 
     def update_project_variables(self, project_name: str, variables: Dict, 
                                branch_name: str) -> bool:
         """Update project variables and create new branch"""
         project_path = Path(self.base_path) / 'dbt_projects' / project_name
-        variables_path = project_path / 'dbt_airflow_variables.yml'
 
         if not project_path.exists():
             return False
 
-        # Create and checkout new branch
-        current = self.repo.create_head(branch_name)
-        current.checkout()
-
         yaml = YAML()
         yaml.preserve_quotes = True
 
+        variables_file = f'{project_name}/dbt_airflow_variables.yml'
+        base_commit = self._default_branch_base_commit()
+
         # Load existing variables
-        if variables_path.exists():
-            with open(variables_path, 'r') as f:
-                existing_data = yaml.load(f) or {}
-        else:
-            existing_data = {}
-
-        # Recursively apply single quotes to all values in a dictionary
-        def apply_single_quotes_to_values(data):
-            if isinstance(data, dict):
-                return {k: apply_single_quotes_to_values(v) for k, v in data.items()}
-            elif isinstance(data, list):
-                return [apply_single_quotes_to_values(i) for i in data]
-            else:
-                return SingleQuotedScalarString(str(data))
+        existing_content = self._read_committed_file(base_commit, variables_file)
+        existing_data = (yaml.load(existing_content) or {}) if existing_content is not None else {}
 
         # Merge variables
         for key, value in variables.items():
             existing_data[key] = value
 
-        # Apply single quotes to the merged data values
-        updated_data = apply_single_quotes_to_values(existing_data)
-
-        # Update variables file
-        with open(variables_path, 'w') as f:
-            yaml.dump(updated_data, f)
-
-        self._commit_and_push(
+        self._commit_files_and_push(
+            base_commit,
+            {variables_file: self._dump_variables(existing_data)},
             f"Updated variables for project {project_name}",
             branch_name
         )
@@ -534,24 +952,137 @@ class ProjectManager:
         return True
 
 
+    @staticmethod
+    def _dump_variables(data: Dict) -> str:
+        """Serialize a dbt_airflow_variables.yml document with every value single-quoted"""
+        yaml = YAML()
+        yaml.preserve_quotes = True
+        content = io.StringIO()
+        yaml.dump(ProjectManager._stringify_values(data, SingleQuotedScalarString), content)
+        return content.getvalue()
+
+    @staticmethod
+    def _stringify_values(data, scalar=str):
+        """Recursively convert every leaf value of a dictionary/list to scalar(str(value))"""
+        if isinstance(data, dict):
+            return {k: ProjectManager._stringify_values(v, scalar) for k, v in data.items()}
+        elif isinstance(data, list):
+            return [ProjectManager._stringify_values(i, scalar) for i in data]
+        else:
+            return scalar(str(data))
+
+    def bulk_update_project_variables(self, selector: Dict, variables: Dict, branch_name: str = None) -> Dict[str, Any]:
+        """
+        Patch the variables of every project matching selector in one commit on one branch
+
+        Files are read from the default branch as it is on origin and patched in memory; the
+        commit is built without a checkout (see _commit_files_and_push).
+
+        Args:
+            selector: Any of project_names, owner, operator, project_glob; all given criteria must match
+            variables: Variables to set in each project's configuration; a None value removes the variable
+            branch_name: Optional branch name (will be auto-generated if not provided)
+
+        Returns:
+            Dict containing status, branch information and the updated/unchanged projects.
+            'missing' lists explicitly named projects that don't exist.
+        """
+        if branch_name is None:
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            branch_name = f"bulk_vars_{timestamp}"
+
+        base_commit = self._default_branch_base_commit()
+        project_names = selector.get('project_names')
+        candidates = project_names if project_names is not None else sorted(
+            name for _, kind, _, name in self.git_backend.list_tree(base_commit)
+            if kind == 'tree' and any(
+                entry[1] == 'blob' and entry[3] == 'dbt_project.yml'
+                for entry in self.git_backend.list_tree(base_commit, name)
+            )
+        )
+        operator = (selector.get('operator') or '').lower()
+        # Variables files hold strings only; compare and store the patch the same way
+        patch = {key: None if value is None else self._stringify_values(value) for key, value in variables.items()}
+
+        files = {}
+        updated, unchanged, missing = [], [], []
+        for project_name in candidates:
+            variables_file = f'{project_name}/dbt_airflow_variables.yml'
+            content = self._read_committed_file(base_commit, variables_file)
+            if content is None:
+                if project_names is not None:
+                    missing.append(project_name)
+                continue
+            if selector.get('project_glob') and not fnmatch.fnmatchcase(project_name, selector['project_glob']):
+                continue
+
+            data = YAML().load(content) or {}
+            configs = {key: config for key, config in data.items() if isinstance(config, dict)}
+            if selector.get('owner') and not any(c.get('DAG_OWNER') == selector['owner'] for c in configs.values()):
+                continue
+            if operator and not any(
+                str(c.get('OPERATOR', '')).lower() == operator or key.lower().startswith(f'{operator}_')
+                for key, c in configs.items()
+            ):
+                continue
+
+            changed = False
+            for config in configs.values():
+                for key, value in patch.items():
+                    if value is None:
+                        if key in config:
+                            del config[key]
+                            changed = True
+                    elif config.get(key) != value:
+                        config[key] = value
+                        changed = True
+            if changed:
+                files[variables_file] = self._dump_variables(data)
+                updated.append(project_name)
+            else:
+                unchanged.append(project_name)
+
+        result = {
+            'success': True,
+            'branch_name': None,
+            'branch_url': None,
+            'updated_projects': updated,
+            'unchanged_projects': unchanged,
+            'missing_projects': missing
+        }
+        if missing:
+            result.update(success=False, message=f"Projects not found: {', '.join(missing)}")
+            return result
+        if not files:
+            result['message'] = "No project variables changed"
+            return result
+
+        self._commit_files_and_push(
+            base_commit,
+            files,
+            f"Updated variables for {len(updated)} projects",
+            branch_name
+        )
+        repo_url = self._get_repo_web_url()
+        result.update(
+            message=f"Successfully updated variables for {len(updated)} projects",
+            branch_name=branch_name,
+            branch_url=f"{repo_url.rstrip('/')}/tree/{branch_name}" if repo_url else None
+        )
+        return result
+
     def update_project_profiles(self, project_name: str, variables: Dict, 
                                branch_name: str) -> bool:
         """Update project profiles and create new branch"""
         project_path = Path(self.base_path) / 'dbt_projects' / project_name
-        profiles_path = project_path / 'profiles.yml'
 
         if not project_path.exists():
             return False
 
-        # Create and checkout new branch
-        current = self.repo.create_head(branch_name)
-        current.checkout()
-
         # Update variables file
-        with open(profiles_path, 'w') as f:
-            yaml.safe_dump(variables, f)
-
-        self._commit_and_push(
+        self._commit_files_and_push(
+            self._default_branch_base_commit(),
+            {f'{project_name}/profiles.yml': yaml.safe_dump(variables)},
             f"Updated profiles.yml for project {project_name}",
             branch_name
         )
@@ -559,6 +1090,22 @@ class ProjectManager:
         return True
 
     def _get_default_branch(self) -> str:
+        """
+        Default branch name of the repository, detected once and again only when the local
+        origin/HEAD symref changes (the repository refresh moves it when the remote HEAD does)
+
+        Returns:
+            str: Name of the default branch (e.g., 'main', 'master', 'prod')
+        """
+        origin_head = self.git_backend.symbolic_ref('refs/remotes/origin/HEAD')
+        cached = self._default_branch
+        if cached and cached[0] == origin_head:
+            return cached[1]
+        default_branch = self._detect_default_branch()
+        self._default_branch = (origin_head, default_branch)
+        return default_branch
+
+    def _detect_default_branch(self) -> str:
         """
         Detect the default branch name of the repository
         
@@ -600,83 +1147,240 @@ class ProjectManager:
         self.logger.warning("Could not detect default branch, falling back to 'main'")
         return 'main'
 
-    def _commit_and_push(self, message: str, branch: str = None):
-            """
-            Commit and push changes to repository with proper branch management
-            
-            Args:
-                message (str): Commit message
-                branch (str, optional): Target branch name. If None, uses detected default branch
-            """
+    @contextmanager
+    def _write_worktree(self):
+        """
+        Throwaway worktree for one mutation, detached at the default branch
+
+        Mutations never touch the shared checkout, which stays on the default branch for
+        readers, and concurrent mutations can't pick up each other's files. The worktree
+        shares the object store of the main repository and is removed when the block exits.
+
+        Yields:
+            git.Repo: Repository object for the worktree
+        """
+        default_branch = self._get_default_branch()
+        worktrees_path = Path(self.base_path) / 'worktrees'
+        worktrees_path.mkdir(parents=True, exist_ok=True)
+        # The owner's pid in the name tells _prune_worktrees whether the worktree is still in use
+        worktree_path = Path(tempfile.mkdtemp(prefix=f'{os.getpid()}-', dir=worktrees_path))
+        self.repo.git.worktree('add', '--detach', str(worktree_path), default_branch)
+        try:
+            yield InstrumentedRepo(worktree_path)
+        finally:
             try:
-                git_logger = logging.getLogger('git')
-                original_level = git_logger.level
-                git_logger.setLevel(logging.WARNING)  # Temporarily suppress git debug messages
-                
-                try:
-                    # Get default branch for returning later
-                    default_branch = self._get_default_branch()
-                    original_branch = self.repo.active_branch.name
-                    
-                    # If branch is not specified, use the default branch
-                    if branch is None:
-                        branch = default_branch
-                        
-                    # Ensure we're on the correct branch
-                    if original_branch != branch:
-                        try:
-                            # Try to checkout existing branch
-                            self.repo.git.checkout(branch)
-                        except git.GitCommandError:
-                            # If branch doesn't exist locally, create it
-                            self.repo.git.checkout('-b', branch)
-                    
-                    # Add, commit and push changes
-                    self.repo.git.add(A=True)
-                    self.repo.index.commit(message)
-                    
-                    # Push with branch specification
-                    self.repo.git.push('origin', f'{branch}:{branch}')
-                    
-                    self.logger.info(f"Successfully committed and pushed to {branch}: {message}")
-                    
-                    # Always return to default branch
-                    if branch != default_branch:
-                        self.repo.git.checkout(default_branch)
-                        # Pull latest changes on default branch
-                        self.repo.remotes.origin.pull(default_branch)
-                        
-                finally:
-                    git_logger.setLevel(original_level)  # Restore original log level
-                    
+                self.repo.git.worktree('remove', '--force', str(worktree_path))
             except git.GitCommandError as e:
-                self.logger.error(f"Git command failed during commit/push: {e}")
-                # Try to return to default branch even if there was an error
-                try:
-                    if self.repo.active_branch.name != default_branch:
-                        self.repo.git.checkout(default_branch)
-                        self.repo.remotes.origin.pull(default_branch)
-                except Exception as checkout_error:
-                    self.logger.error(f"Failed to return to default branch: {checkout_error}")
-                raise
-            except Exception as e:
-                self.logger.error(f"Unexpected error during commit/push: {e}")
-                # Try to return to default branch even if there was an error
-                try:
-                    if self.repo.active_branch.name != default_branch:
-                        self.repo.git.checkout(default_branch)
-                        self.repo.remotes.origin.pull(default_branch)
-                except Exception as checkout_error:
-                    self.logger.error(f"Failed to return to default branch: {checkout_error}")
-                raise
+                self.logger.warning(f"Failed to remove worktree {worktree_path}: {e}")
+                shutil.rmtree(worktree_path, ignore_errors=True)
+                self.repo.git.worktree('prune')
 
-    def refresh_repository(self) -> Dict[str, bool]:
+    def _prune_worktrees(self):
         """
-        Force refresh the git repository by pulling latest changes
-        
+        Remove worktrees left behind by processes that exited without cleaning up (e.g. a
+        worker killed on timeout). Worktrees of live processes may be in use by a request.
+        """
+        worktrees_path = Path(self.base_path) / 'worktrees'
+        if worktrees_path.is_dir():
+            for worktree_path in worktrees_path.iterdir():
+                owner = worktree_path.name.split('-', 1)[0]
+                if owner.isdigit() and process_alive(int(owner)):
+                    continue
+                self.logger.info(f"Removing stale worktree {worktree_path}")
+                shutil.rmtree(worktree_path, ignore_errors=True)
+        self.repo.git.worktree('prune')
+
+    def _commit_and_push(self, worktree: git.Repo, message: str, branch: str = None):
+        """
+        Commit all changes in a worktree and push them to a branch on origin
+
+        Args:
+            worktree (git.Repo): Worktree from _write_worktree holding the changes
+            message (str): Commit message
+            branch (str, optional): Target branch name. If None, uses detected default branch
+        """
+        git_logger = logging.getLogger('git')
+        original_level = git_logger.level
+        git_logger.setLevel(logging.WARNING)  # Temporarily suppress git debug messages
+
+        try:
+            if branch is None:
+                branch = self._get_default_branch()
+
+            # Add, commit and push changes
+            worktree.git.add(A=True)
+            worktree.index.commit(message)
+            worktree.git.push('origin', f'HEAD:refs/heads/{branch}')
+
+            self.logger.info(f"Successfully committed and pushed to {branch}: {message}")
+
+        except git.GitCommandError as e:
+            self.logger.error(f"Git command failed during commit/push: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error during commit/push: {e}")
+            raise
+        finally:
+            git_logger.setLevel(original_level)  # Restore original log level
+
+    def _default_branch_base_commit(self) -> str:
+        """
+        Head of the default branch on origin, to build a commit for a PR on
+
+        Refreshes are throttled or run in the background, so the local branch can be behind
+        origin; a commit on top of it would show the upstream changes in between as reverted.
+        One ls-remote gets the remote head, which is fetched only if it isn't here yet.
+        """
+        branch = self._get_default_branch()
+        remote_commit = self.repo.git.ls_remote('origin', f'refs/heads/{branch}').partition('\t')[0]
+        if not remote_commit:
+            return self.git_backend.resolve(branch)
+        if self.git_backend.resolve(f'{remote_commit}^{{commit}}') is None:
+            self.logger.info(f"Fetching origin/{branch} at {remote_commit[:8]} to commit on")
+            self.repo.git.fetch('origin', f'+refs/heads/{branch}:refs/remotes/origin/{branch}')
+        return remote_commit
+
+    def _commit_files_and_push(self, base_commit: str, files: Dict[str, Optional[str]], message: str, branch: str):
+        """
+        Commit file changes on top of base_commit and push the commit to a branch on origin,
+        without a working tree or index
+
+        Writes blobs for the new contents, rewrites only the trees along the changed paths
+        (`ls-tree`/`mktree`), creates the commit with `commit-tree` and pushes `<sha>:refs/heads/<branch>`.
+
+        Args:
+            base_commit: Sha of the parent commit, usually _default_branch_base_commit()
+            files: {repository path: new content}; None deletes the path
+            message: Commit message
+            branch: Target branch name
+        """
+        try:
+            changes = {
+                path: None if content is None else self._git_plumbing('hash-object', '-w', '--stdin', stdin=content)
+                for path, content in files.items()
+            }
+            tree = self._write_tree(f'{base_commit}^{{tree}}', changes)
+            if tree is None:
+                raise ValueError("Commit would leave the repository empty")
+
+            author = git.Actor.author(self.repo.config_reader())
+            committer = git.Actor.committer(self.repo.config_reader())
+            commit = self._git_plumbing('commit-tree', tree, '-p', base_commit, '-m', message, env={
+                'GIT_AUTHOR_NAME': author.name, 'GIT_AUTHOR_EMAIL': author.email,
+                'GIT_COMMITTER_NAME': committer.name, 'GIT_COMMITTER_EMAIL': committer.email,
+            })
+            self.repo.git.push('origin', f'{commit}:refs/heads/{branch}')
+
+            self.logger.info(f"Successfully committed {commit[:8]} and pushed to {branch}: {message}")
+
+        except git.GitCommandError as e:
+            self.logger.error(f"Git command failed during commit/push: {e}")
+            raise
+
+    def _write_tree(self, tree: Optional[str], changes: Dict[str, Optional[str]]) -> Optional[str]:
+        """
+        Write a copy of tree with changes ({path relative to tree: blob sha, or None to delete})
+        applied and return its sha, or None when the result is empty
+        """
+        entries = {}
+        if tree:
+            entries = {name: [mode, kind, sha] for mode, kind, sha, name in self.git_backend.list_tree(tree)}
+
+        subtree_changes: Dict[str, Dict[str, Optional[str]]] = {}
+        for path, blob in changes.items():
+            name, _, rest = path.partition('/')
+            if rest:
+                subtree_changes.setdefault(name, {})[rest] = blob
+            elif blob is None:
+                entries.pop(name, None)
+            else:
+                # Keep the mode (e.g. executable) of a file being replaced
+                mode = entries[name][0] if name in entries and entries[name][1] == 'blob' else '100644'
+                entries[name] = [mode, 'blob', blob]
+
+        for name, nested in subtree_changes.items():
+            subtree = entries[name][2] if name in entries and entries[name][1] == 'tree' else None
+            new_subtree = self._write_tree(subtree, nested)
+            if new_subtree:
+                entries[name] = ['040000', 'tree', new_subtree]
+            else:
+                entries.pop(name, None)
+
+        if not entries:
+            return None
+        return self._git_plumbing('mktree', '-z', stdin=''.join(
+            f'{mode} {kind} {sha}\t{name}\0' for name, (mode, kind, sha) in entries.items()
+        ))
+
+    def _git_plumbing(self, *args: str, stdin: str = None, env: Dict[str, str] = None) -> str:
+        """Run a git plumbing command against the shared repository and return its stripped stdout"""
+        command = ['git', *args]
+        with timed_git_command(command):
+            result = subprocess.run(
+                command,
+                cwd=self.repo.git_dir,
+                input=stdin,
+                env={**os.environ, **(env or {})},
+                capture_output=True,
+                text=True
+            )
+        if result.returncode != 0:
+            raise git.GitCommandError(command, result.returncode, result.stderr)
+        return result.stdout.strip()
+
+    def _read_committed_file(self, commit: str, path: str) -> Optional[str]:
+        """Content of path in commit, or None if it doesn't exist there"""
+        content = self.git_backend.read_blob(commit, path)
+        return None if content is None else content.decode('utf-8')
+
+    def refresh_repository(self, max_staleness: float = 0) -> Dict[str, bool]:
+        """
+        Refresh the git repository by pulling latest changes
+
+        Concurrent refreshes (from any worker) are collapsed into one; see RepositoryRefreshCoordinator.
+
+        Args:
+            max_staleness: Reuse a successful refresh that finished at most this many seconds ago.
+                0 always checks the remote (a refresh finishing while this call waits is still shared).
+
         Returns:
             Dict with status and message
         """
+        return self.refresh_coordinator.refresh(max_staleness)
+
+    def _remote_branch_moved(self, branch: str) -> Tuple[bool, Optional[str]]:
+        """
+        Cheap check (one ls-remote round trip, no pack negotiation) whether a fetch and
+        pull of branch could change the checkout
+
+        The same round trip reads the remote HEAD, so a changed remote default branch is
+        noticed too; it counts as moved so that the new branch gets fetched.
+
+        Returns:
+            Tuple[bool, Optional[str]]: (moved, remote default branch if it differs from origin/HEAD)
+        """
+        remote_commit = None
+        remote_default_branch = None
+        for line in self.repo.git.ls_remote('--symref', 'origin', 'HEAD', f'refs/heads/{branch}').splitlines():
+            target, _, ref = line.partition('\t')
+            if ref == 'HEAD' and target.startswith('ref: refs/heads/'):
+                remote_default_branch = target[len('ref: refs/heads/'):]
+            elif ref == f'refs/heads/{branch}':
+                remote_commit = target
+
+        origin_head = self.git_backend.symbolic_ref('refs/remotes/origin/HEAD')
+        if remote_default_branch and origin_head != f'refs/remotes/origin/{remote_default_branch}':
+            return True, remote_default_branch
+
+        if not remote_commit:
+            return True, None
+        tracking_commit = self.git_backend.resolve(f'refs/remotes/origin/{branch}')
+        if tracking_commit is None:
+            return True, None
+        return not (remote_commit == tracking_commit == self.git_backend.head()), None
+
+    def _fetch_and_pull(self) -> Dict[str, bool]:
+        """Fetch and pull the current branch, skipping both when the remote branch did not move"""
         try:
             self.logger.info("Starting repository refresh")
             if self.repo is None:
@@ -697,13 +1401,26 @@ class ProjectManager:
                     "message": "Repository reinitialized successfully"
                 }
 
+            # Store current branch
+            current_branch = self.repo.active_branch.name
+
+            moved, remote_default_branch = self._remote_branch_moved(current_branch)
+            if not moved:
+                self.logger.info(f"Remote branch {current_branch} unchanged, skipping fetch")
+                return {
+                    "success": True,
+                    "message": "Repository is already up to date"
+                }
+
             # Fetch and pull latest changes
             self.logger.info("Fetching latest changes")
             origin = self.repo.remotes.origin
             origin.fetch()
-            
-            # Store current branch
-            current_branch = self.repo.active_branch.name
+
+            if remote_default_branch:
+                # Moving origin/HEAD makes every worker re-detect its cached default branch
+                self.logger.info(f"Remote default branch is now {remote_default_branch}")
+                self.repo.git.remote('set-head', 'origin', remote_default_branch)
             
             # Pull latest changes
             self.logger.info(f"Pulling latest changes on branch {current_branch}")
@@ -749,33 +1466,7 @@ class ProjectManager:
             Tuple of (creation_date, last_modified_date)
         """
         try:
-            # Get project creation date (first commit)
-            creation_logs = self.repo.git.log(
-                '--diff-filter=A',  # Only addition events
-                '--format=%ad',     # Only date
-                '--date=iso',       # ISO format
-                '--', project_path
-            ).splitlines()
-            
-            creation_date = (
-                datetime.fromisoformat(creation_logs[-1].rsplit(' ', 1)[0])
-                if creation_logs else None
-            )
-
-            # Get last modified date (most recent commit)
-            modified_logs = self.repo.git.log(
-                '-1',               # Most recent commit
-                '--format=%ad',     # Only date
-                '--date=iso',       # ISO format
-                '--', project_path
-            ).splitlines()
-            
-            last_modified = (
-                datetime.fromisoformat(modified_logs[0].rsplit(' ', 1)[0])
-                if modified_logs else None
-            )
-
-            return creation_date, last_modified
+            return get_project_history_index(self.repo, self.logger).get_dates(self.repo, project_path)
 
         except git.exc.GitError as e:
             self.logger.error(f"Failed to get Git history for {project_path}: {str(e)}")
@@ -856,7 +1547,7 @@ class ProjectManager:
             Optional[str]: Base web URL for the repository
         """
         try:
-            remote_url = self.repo.remotes.origin.url
+            remote_url = self.git_backend.remote_url('origin')
             
             # Handle HTTPS URLs with token
             if 'oauth2:' in remote_url:
@@ -941,24 +1632,18 @@ class ProjectManager:
                     if not success:
                         raise Exception(f"Failed to clean up old project: {deletion_status}")
                     
-                    # Make sure we're on default branch and it's up to date
-                    default_branch = self._get_default_branch()
-                    self.repo.git.checkout(default_branch)
-                    self.repo.remotes.origin.pull()
-                    
-                    # 4. Create new branch from clean master
-                    current = self.repo.create_head(branch_name)
-                    current.checkout()
-                    
-                    # 5. Copy renamed project from temp to repo
-                    new_project_path = Path(self.base_path) / 'dbt_projects' / new_project_name
-                    shutil.copytree(temp_new_project_path, new_project_path)
-                    
-                    # 6. Commit and push changes
-                    self._commit_and_push(
-                        f"Rename project from {old_project_name} to {new_project_name}",
-                        branch_name
-                    )
+                    # 4. Create new branch from clean master, in its own worktree
+                    with self._write_worktree() as worktree:
+                        # 5. Copy renamed project from temp to repo
+                        new_project_path = Path(worktree.working_tree_dir) / new_project_name
+                        shutil.copytree(temp_new_project_path, new_project_path)
+
+                        # 6. Commit and push changes
+                        self._commit_and_push(
+                            worktree,
+                            f"Rename project from {old_project_name} to {new_project_name}",
+                            branch_name
+                        )
                     
                     # Get repository web URL for the branch
                     repo_url = self._get_repo_web_url()
@@ -975,13 +1660,6 @@ class ProjectManager:
                     }
 
                 except Exception as e:
-                    # If anything fails, ensure we're back on default branch
-                    try:
-                        default_branch = self._get_default_branch()
-                        self.repo.git.checkout(default_branch)
-                        self.repo.remotes.origin.pull()
-                    except Exception as checkout_error:
-                        self.logger.error(f"Failed to return to default branch: {checkout_error}")
                     raise Exception(f"Failed during rename process: {str(e)}")
 
         except Exception as e:
@@ -1228,26 +1906,40 @@ class ProjectMetadataManager:
         else:
             raise ValueError(f"Invalid URL type: {url_type}")
 
+    def list_project_names(self) -> List[str]:
+        """Names of all project folders (those with a dbt_project.yml), without touching Git"""
+        projects_path = self.base_path / 'dbt_projects'
+        if not projects_path.exists():
+            return []
+        return sorted(
+            item.name for item in projects_path.iterdir()
+            if item.is_dir() and (item / 'dbt_project.yml').exists()
+        )
+
     def _read_variables_file(self, project_name: str) -> Dict:
         """Read and parse dbt_airflow_variables.yml file"""
-        variables_path = self.base_path / 'dbt_projects' / project_name / 'dbt_airflow_variables.yml'
-        if not variables_path.exists():
-            return {}
-        
         try:
-            with open(variables_path, 'r') as f:
-                yaml_content = yaml.safe_load(f)
-                # If file is empty or not a dict
-                if not yaml_content or not isinstance(yaml_content, dict):
-                    return {}
-                
-                # Get the first (and typically only) top-level configuration
-                # Since the top-level key is dynamic, we just need the values
-                first_config = next(iter(yaml_content.values()), {})
-                return first_config
+            return parsed_file_cache.get(
+                self.repo, self.base_path / 'dbt_projects' / project_name, 'dbt_airflow_variables.yml',
+                self._parse_variables_file
+            )
         except Exception as e:
             logging.error(f"Error reading variables file for project {project_name}: {str(e)}")
             return {}
+
+    @staticmethod
+    def _parse_variables_file(content: Optional[str]) -> Dict:
+        if content is None:
+            return {}
+        yaml_content = yaml.safe_load(content)
+        # If file is empty or not a dict
+        if not yaml_content or not isinstance(yaml_content, dict):
+            return {}
+
+        # Get the first (and typically only) top-level configuration
+        # Since the top-level key is dynamic, we just need the values
+        first_config = next(iter(yaml_content.values()), {})
+        return first_config
         
     def _read_packages_file(self, project_name: str) -> List[Dict]:
         """
@@ -1259,35 +1951,43 @@ class ProjectMetadataManager:
         Returns:
             List[Dict]: List of package configurations with name and version
         """
-        packages_path = self.base_path / 'dbt_projects' / project_name / 'packages.yml'
-        if not packages_path.exists():
-            self.logger.warning(f"packages.yml not found for project {project_name}")
-            return []
-        
         try:
-            with open(packages_path, 'r') as f:
-                yaml_content = yaml.safe_load(f)
-                
-                # Check if file is empty or doesn't have packages key
-                if not yaml_content or not isinstance(yaml_content, dict) or 'packages' not in yaml_content:
-                    self.logger.warning(f"No packages defined in {packages_path}")
-                    return []
-                
-                # Extract package information
-                packages = []
-                for pkg in yaml_content['packages']:
-                    if isinstance(pkg, dict) and 'package' in pkg and 'version' in pkg:
-                        packages.append({
-                            'package': pkg['package'],
-                            'version': str(pkg['version'])  # Convert version to string
-                        })
-                
-                return packages
-                
+            packages = parsed_file_cache.get(
+                self.repo, self.base_path / 'dbt_projects' / project_name, 'packages.yml', self._parse_packages_file
+            )
         except Exception as e:
             self.logger.error(f"Error reading packages file for project {project_name}: {str(e)}")
             return []
 
+        if packages is None:
+            self.logger.warning(f"packages.yml not found for project {project_name}")
+            return []
+        if not packages:
+            self.logger.warning(f"No packages defined in packages.yml of project {project_name}")
+        return packages
+
+    @staticmethod
+    def _parse_packages_file(content: Optional[str]) -> Optional[List[Dict]]:
+        """Package configurations of a packages.yml, or None if the file doesn't exist"""
+        if content is None:
+            return None
+        yaml_content = yaml.safe_load(content)
+
+        # Check if file is empty or doesn't have packages key
+        if not yaml_content or not isinstance(yaml_content, dict) or 'packages' not in yaml_content:
+            return []
+
+        # Extract package information
+        packages = []
+        for pkg in yaml_content['packages']:
+            if isinstance(pkg, dict) and 'package' in pkg and 'version' in pkg:
+                packages.append({
+                    'package': pkg['package'],
+                    'version': str(pkg['version'])  # Convert version to string
+                })
+
+        return packages
+
     def _get_git_dates(self, project_path: str) -> tuple[Optional[datetime], Optional[datetime]]:
         """
         Get project creation and last modified dates from Git history
@@ -1303,33 +2003,7 @@ class ProjectMetadataManager:
                 self.logger.warning("Git repository not initialized, using filesystem dates")
                 return None, None
 
-            # Get project creation date (first commit)
-            creation_logs = self.repo.git.log(
-                '--diff-filter=A',  # Only addition events
-                '--format=%ad',     # Only date
-                '--date=iso',       # ISO format
-                '--', project_path
-            ).splitlines()
-            
-            creation_date = (
-                datetime.fromisoformat(creation_logs[-1].rsplit(' ', 1)[0])
-                if creation_logs else None
-            )
-
-            # Get last modified date (most recent commit)
-            modified_logs = self.repo.git.log(
-                '-1',               # Most recent commit
-                '--format=%ad',     # Only date
-                '--date=iso',       # ISO format
-                '--', project_path
-            ).splitlines()
-            
-            last_modified = (
-                datetime.fromisoformat(modified_logs[0].rsplit(' ', 1)[0])
-                if modified_logs else None
-            )
-
-            return creation_date, last_modified
+            return get_project_history_index(self.repo, self.logger).get_dates(self.repo, project_path)
 
         except git.exc.GitError as e:
             self.logger.error(f"Failed to get Git history for {project_path}: {str(e)}")
@@ -1351,7 +2025,7 @@ class ProjectMetadataManager:
                 return ""
 
             # Get remote URL (usually ends with .git)
-            remote_url = self.repo.remotes.origin.url
+            remote_url = get_git_backend(self.repo).remote_url('origin')
             
             # Convert SSH URL to HTTPS if needed
             if remote_url.startswith('git@'):
@@ -1921,7 +2595,7 @@ class ProjectDependencyManager:
                     )
                     
                     # Clone the DAGs repo
-                    dags_repo = git.Repo.clone_from(
+                    dags_repo = InstrumentedRepo.clone_from(
                         dags_repo_url_with_token,
                         temp_dags_dir
                     )
@@ -2130,30 +2804,60 @@ class ProjectDependencyManager:
             self.logger.error(f"Error deleting Data Quality entry: {str(e)}")
             return False
 
+
+# Working directory of the management API: the data model checkout, its worktrees and refresh state
+MANAGEMENT_BASE_PATH = os.getenv('DBT_MANAGEMENT_BASE_PATH', '/tmp/dbt_management')
+
+
 def setup_routes(app: APIBlueprint):
     project_manager = ProjectManager(
         repo_url=Config.DATA_MODEL_REPO_URL or os.getenv('DATA_MODEL_REPO_URL'),
         repo_token=Config.GROUP_ACCESS_TOKEN or os.getenv('GROUP_ACCESS_TOKEN'),
-        base_path='/tmp/dbt_management'
+        base_path=MANAGEMENT_BASE_PATH
     )
     # Pass repo from ProjectManager to ProjectMetadataManager
     metadata_manager = ProjectMetadataManager(
-        base_path='/tmp/dbt_management',
+        base_path=MANAGEMENT_BASE_PATH,
         repo=project_manager.repo
     )
+    sync_worker = RepositorySyncWorker(project_manager, REPOSITORY_SYNC_INTERVAL)
+
+    @app.before_request
+    def start_repository_sync():
+        if sync_worker.periodic:
+            sync_worker.ensure_started()
 
     # Common date retrieval function
-    def get_project_dates_from_list(project_name: str, projects: List[Dict]) -> Optional[Dict]:
-        return next(
-            (
-                {
-                    'created_at': p['created_at'],
-                    'last_modified': p['last_modified']
-                }
-                for p in projects if p['project_name'] == project_name
-            ),
-            None
-        )
+    def get_project_dates_by_name(project_name: str) -> Optional[Dict]:
+        project = project_manager.get_project(project_name)
+        if not project:
+            return None
+        return {
+            'created_at': project['created_at'],
+            'last_modified': project['last_modified']
+        }
+
+    def conditional_on_project_tree(extra: callable = None):
+        """
+        Conditional GET for views that only read a project's files: the ETag is the project's
+        tree sha in the checked-out default branch, and a matching If-None-Match is answered
+        with 304 before the view runs. extra(project_name) adds anything else the response
+        depends on to the ETag.
+        """
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(project_name, *args, **kwargs):
+                tree_sha = project_manager.get_project_tree_sha(project_name)
+                if tree_sha is None:
+                    return view(project_name, *args, **kwargs)
+                etag = tree_sha
+                if extra is not None:
+                    etag = hashlib.sha1(f'{tree_sha}\0{extra(project_name)!r}'.encode()).hexdigest()
+                if request.if_none_match.contains_weak(etag):
+                    return Response(status=304, headers={'ETag': f'"{etag}"'})
+                return view(project_name, *args, **kwargs), 200, {'ETag': f'"{etag}"'}
+            return wrapper
+        return decorator
 
 #POST routes:
 
@@ -2183,6 +2887,38 @@ def setup_routes(app: APIBlueprint):
             "timestamp": datetime.now()
         }
 
+    @app.post('/repository/webhook')
+    @app.doc(
+        tags=['Project Management-Repository'],
+        summary='Repository Push Webhook',
+        description='Receives GitHub/GitLab push events for the data model repository and schedules an immediate background sync. '
+                    'Authenticated by the webhook signature (REPOSITORY_WEBHOOK_SECRET) instead of the API key.'
+    )
+    @app.output(RefreshResponseSchema, status_code=202)
+    def repository_webhook():
+        """Schedule a repository sync for a signed push event"""
+        secret = Config.REPOSITORY_WEBHOOK_SECRET
+        if not secret:
+            abort(503, message="Repository webhook is not configured")
+        if not verify_webhook_signature(request.headers, request.get_data(), secret):
+            abort(401, message="Invalid webhook signature")
+
+        event = request.headers.get('X-GitHub-Event') or request.headers.get('X-Gitlab-Event')
+        if event not in ('push', 'Push Hook'):
+            return {"success": True, "message": f"Ignored {event} event"}
+
+        payload = request.get_json(force=True, silent=True) or {}
+        branch = payload.get('ref', '').removeprefix('refs/heads/')
+        try:
+            current_branch = project_manager.repo.active_branch.name
+        except Exception:
+            current_branch = None
+        if current_branch and branch != current_branch:
+            return {"success": True, "message": f"Ignored push to {branch}"}
+
+        sync_worker.trigger()
+        return {"success": True, "message": "Repository sync scheduled"}
+
     @app.post('/projects/<project_name>/archive')
     @app.doc(
         tags=['Project Management-Project Operations'],
@@ -2407,6 +3143,30 @@ def setup_routes(app: APIBlueprint):
         except Exception as e:
             abort(500, message=f"Failed to update project owner: {str(e)}")
 
+    @app.post('/projects/variables:bulk')
+    @app.doc(
+        tags=['Project Management-Variables'],
+        summary='Bulk Update Project Variables',
+        description='Sets (or with null removes) variables in every project matching the selector. '
+                    'All changes go to one new branch as a single commit.'
+    )
+    @app.auth_required(auth)
+    @app.input(BulkUpdateVariablesInputSchema)
+    def bulk_update_project_variables(json_data):
+        """Update variables across many projects in one commit"""
+        try:
+            result = project_manager.bulk_update_project_variables(
+                selector=json_data['selector'],
+                variables=json_data['variables'],
+                branch_name=json_data.get('branch_name')
+            )
+        except Exception as e:
+            abort(500, message=f"Failed to update project variables: {str(e)}")
+
+        if result['missing_projects']:
+            abort(404, message=result['message'])
+        return result
+
 #GET routes:
 
     @app.get('/projects')
@@ -2424,10 +3184,11 @@ def setup_routes(app: APIBlueprint):
         Returns a list of projects with their Git-based creation and modification dates.
         """
         try:
-            # First refresh the repository
-            refresh_result = project_manager.refresh_repository()
-            if not refresh_result["success"]:
-                abort(500, message=f"Failed to refresh repository: {refresh_result['message']}")
+            # Without the background sync, refresh the repository first, unless another request just did
+            if not sync_worker.periodic:
+                refresh_result = project_manager.refresh_repository(max_staleness=REPOSITORY_REFRESH_MAX_STALENESS)
+                if not refresh_result["success"]:
+                    abort(500, message=f"Failed to refresh repository: {refresh_result['message']}")
             
             # Get projects with Git-based dates
             projects = project_manager.list_projects()
@@ -2445,6 +3206,7 @@ def setup_routes(app: APIBlueprint):
     )
     @app.auth_required(auth)
     @app.output(ProjectVariablesSchema)
+    @conditional_on_project_tree()
     def get_project_variables(project_name):
         """Get project variables"""
         variables = project_manager.get_project_variables(project_name)
@@ -2460,6 +3222,7 @@ def setup_routes(app: APIBlueprint):
     )
     @app.auth_required(auth)
     @app.output(ProjectVariablesSchema)
+    @conditional_on_project_tree()
     def get_project_profiles(project_name):
         """Get project profiles"""
         profiles = project_manager.get_project_profiles(project_name)
@@ -2475,29 +3238,29 @@ def setup_routes(app: APIBlueprint):
     )
     @app.auth_required(auth)
     @app.output(ProjectInfoSchema)
+    @conditional_on_project_tree(extra=lambda project_name: (
+        project_manager.git_backend.symbolic_ref('HEAD'), get_project_dates_by_name(project_name)
+    ))
     def get_project_info(project_name):
         """Get comprehensive project information"""
         try:
-            # Get project dates from list_projects (single source of truth)
-            projects = project_manager.list_projects()
-            dates = get_project_dates_from_list(project_name, projects)
-            
-            if not dates:
-                abort(404, message=f"Project {project_name} not found")
+            # Get project dates the same way list_projects reports them
+            dates = get_project_dates_by_name(project_name)
 
             # Get project info
-            info = metadata_manager.get_project_info(project_name)
-            if not info:
-                abort(404, message=f"Project {project_name} not found")
-
-            # Update dates with Git-based dates
-            info['created_at'] = dates['created_at']
-            info['last_modified'] = dates['last_modified']
-
-            return info
+            info = metadata_manager.get_project_info(project_name) if dates else None
         except Exception as e:
             abort(500, message=f"Failed to get project info: {str(e)}")
 
+        if not info:
+            abort(404, message=f"Project {project_name} not found")
+
+        # Update dates with Git-based dates
+        info['created_at'] = dates['created_at']
+        info['last_modified'] = dates['last_modified']
+
+        return info
+
     @app.get('/projects/<project_name>/owner')
     @app.doc(
         tags=['Project Management-Project Info'],
@@ -2505,12 +3268,44 @@ def setup_routes(app: APIBlueprint):
         description='Retrieves the owner information for a specific DBT project.'
     )
     @app.auth_required(auth)
+    @conditional_on_project_tree()
     def get_project_owner(project_name):
         """Get project owner"""
         variables = metadata_manager._read_variables_file(project_name)
         owner = variables.get('DAG_OWNER', 'Default')
         return {'owner': owner}
 
+    @app.get('/projects/airbyte')
+    @app.doc(
+        tags=['Project Management-Integrations'],
+        summary='Get Airbyte Configuration for All Projects',
+        description='Retrieves Airbyte connection information and status for every project in one call. Connection and destination lookups are deduplicated across projects and resolved concurrently.'
+    )
+    @app.auth_required(auth)
+    def get_all_airbyte_info():
+        """
+        Get Airbyte connection information for all projects
+
+        Returns:
+            dict: Map of project name to connection ID, enabled status and init version
+        """
+        try:
+            projects = {}
+            for project_name in metadata_manager.list_project_names():
+                variables = metadata_manager._read_variables_file(project_name)
+                projects[project_name] = {
+                    'connection_id': variables.get('AIRBYTE_CONNECTION_ID'),
+                    'enabled': str(variables.get('AIRBYTE_REPLICATION_FLAG', '')).lower() == 'true',
+                }
+
+            versions = get_airbyte_destination_versions(p['connection_id'] for p in projects.values())
+            for project in projects.values():
+                project['init_version'] = versions.get(primary_connection_id(project['connection_id']))
+
+            return {'projects': projects}
+        except Exception as e:
+            abort(500, message=f"Failed to get Airbyte information: {str(e)}")
+
     @app.get('/projects/<project_name>/airbyte')
     @app.doc(
         tags=['Project Management-Integrations'],
@@ -2535,6 +3330,45 @@ def setup_routes(app: APIBlueprint):
             'init_version': init_version
         }
 
+    @app.get('/projects/<project_name>/airbyte/drift')
+    @app.doc(
+        tags=['Project Management-Integrations'],
+        summary='Get Airbyte Catalog Drift',
+        description='Compares the current Airbyte catalog of the project connections with the generated source.yml and staging models. Read-only: no files are written and git is not touched.'
+    )
+    @app.auth_required(auth)
+    def get_airbyte_drift(project_name):
+        """
+        Get drift between the Airbyte catalog and the project's generated sources
+
+        Returns:
+            dict: Added and removed streams, added/removed/retyped columns per stream in
+            source.yml (changed_streams) and in the staging model ymls (changed_models),
+            and streams whose staging model yml is missing
+        """
+        project_path = Path(project_manager.base_path) / 'dbt_projects' / project_name
+        if not project_path.exists():
+            abort(404, message=f"Project {project_name} not found")
+
+        variables = metadata_manager._read_variables_file(project_name)
+        connection_ids = variables.get('AIRBYTE_CONNECTION_ID')
+        if not connection_ids or connection_ids == 'None':
+            abort(404, message=f"No Airbyte connection configured for project {project_name}")
+
+        try:
+            drift = get_airbyte_catalog_drift(str(project_path), connection_ids)
+        except Exception as e:
+            abort(500, message=f"Failed to compute Airbyte drift: {str(e)}")
+
+        if drift is None:
+            abort(500, message=f"Failed to fetch Airbyte catalog for project {project_name}")
+
+        return {
+            'project_name': project_name,
+            'connection_ids': connection_ids,
+            **drift
+        }
+
     @app.get('/projects/<project_name>/airflow')
     @app.doc(
         tags=['Project Management-Integrations'],
@@ -2562,18 +3396,16 @@ def setup_routes(app: APIBlueprint):
     def get_project_dates(project_name):
         """Get project creation and modification dates"""
         try:
-            # Reuse the list_projects data
-            projects = project_manager.list_projects()
-            dates = get_project_dates_from_list(project_name, projects)
-            
-            if not dates:
-                abort(404, message=f"Project {project_name} not found")
-                
-            return dates
-            
+            # Same entry list_projects would return for this project
+            dates = get_project_dates_by_name(project_name)
         except Exception as e:
             abort(500, message=f"Failed to get project dates: {str(e)}")
 
+        if not dates:
+            abort(404, message=f"Project {project_name} not found")
+
+        return dates
+
     @app.get('/projects/<project_name>/status')
     @app.doc(
         tags=['Project Management-Project Info'],
@@ -2581,6 +3413,7 @@ def setup_routes(app: APIBlueprint):
         description='Retrieves status of enabled services and features for the project.'
     )
     @app.auth_required(auth)
+    @conditional_on_project_tree()
     def get_project_status(project_name):
         """Get project status information of enabled services"""
         variables = metadata_manager._read_variables_file(project_name)
@@ -2727,6 +3560,7 @@ def setup_routes(app: APIBlueprint):
     )
     @app.auth_required(auth)
     @app.output(PackageSchema(many=True))
+    @conditional_on_project_tree()
     def get_dbt_packages(project_name):
         """Get list of installed DBT packages and their versions"""
         try:
@@ -2739,6 +3573,18 @@ def setup_routes(app: APIBlueprint):
         except Exception as e:
             abort(500, message=f"Failed to read packages: {str(e)}")
 
+    @app.get('/metrics/git')
+    @app.doc(
+        tags=['Project Management-Repository'],
+        summary='Git Command Metrics',
+        description='Histograms of git command durations, and of git commands and git time per endpoint, '
+                    'plus the parsed project file cache counters, aggregated over all workers, in the Prometheus text format.'
+    )
+    @app.auth_required(auth)
+    def get_git_metrics():
+        """Prometheus exposition of git invocation histograms"""
+        return git_command_metrics.render(), 200, {'Content-Type': 'text/plain; version=0.0.4; charset=utf-8'}
+
 #DELETE routes:
 
     @app.delete('/projects/<project_name>')
@@ -0,0 +1,330 @@
+import glob
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence
+
+import git
+from flask import Flask, g, has_request_context, request
+
+# Per-worker snapshots are merged from here, so /metrics/git covers every gunicorn worker
+GIT_METRICS_DIR = os.getenv('GIT_METRICS_DIR', '/tmp/dbt_management/metrics')
+
+# Histogram upper bounds: seconds per git command, and git commands per request
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+SECTION_BOUNDS = {'commands': DURATION_BUCKETS, 'request_commands': COUNT_BUCKETS, 'request_seconds': DURATION_BUCKETS}
+# Seconds between writes of a worker's snapshot; render() always writes its own first
+GIT_METRICS_FLUSH_INTERVAL = float(os.getenv('GIT_METRICS_FLUSH_INTERVAL', '10'))
+
+logger = logging.getLogger(__name__)
+
+
+def command_name(command) -> str:
+    """Git subcommand of a command line, e.g. 'log' for ['git', '-c', 'core.quotepath=off', 'log', ...]"""
+    if isinstance(command, str):
+        command = command.split()
+    args = iter(command[1:])
+    for arg in args:
+        if arg in ('-c', '-C', '--git-dir', '--work-tree', '--namespace'):
+            next(args, None)
+        elif not arg.startswith('-'):
+            return arg
+    return 'git'
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the shape of a Prometheus histogram"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)  # last bucket is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        for i, bound in enumerate(self.bounds):
+            if value <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.sum += value
+        self.count += 1
+
+    def merge(self, other: Dict):
+        for i, n in enumerate(other['buckets']):
+            self.buckets[i] += n
+        self.sum += other['sum']
+        self.count += other['count']
+
+    def to_dict(self) -> Dict:
+        return {'buckets': self.buckets, 'sum': self.sum, 'count': self.count}
+
+    def render(self, name: str, labels: str) -> List[str]:
+        lines = []
+        cumulative = 0
+        for bound, n in zip(self.bounds + (float('inf'),), self.buckets):
+            cumulative += n
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f'{name}_bucket{{{labels},le="{le}"}} {cumulative}')
+        lines.append(f'{name}_sum{{{labels}}} {self.sum}')
+        lines.append(f'{name}_count{{{labels}}} {self.count}')
+        return lines
+
+
+class GitMetrics:
+    """
+    Process-wide aggregates of git invocations: duration per command, and commands and
+    git time per request endpoint.
+
+    Each worker writes a snapshot to state_dir/git-<pid>.json at the end of a request, at
+    most every GIT_METRICS_FLUSH_INTERVAL seconds; render() merges all snapshots, so any
+    worker can serve the aggregate of all of them (other workers' counts lag by up to that
+    interval).
+    Counter sources (e.g. cache hit/miss counts of the same worker) are summed the same way.
+    Snapshots of exited workers are folded into git-retired.json (see retire()).
+    """
+
+    def __init__(self, state_dir: str):
+        self.state_dir = state_dir
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+        self._counter_sources: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._flushed_at = 0.0
+        self._reset()
+
+    def add_counter_source(self, prefix: str, collect: Callable[[], Dict[str, float]]):
+        """Export collect()'s {name: value} as <prefix>_<name>; names ending in _total are counters, others gauges"""
+        self._counter_sources[prefix] = collect
+
+    def _reset(self):
+        self.commands: Dict[str, Histogram] = {}
+        self.request_commands: Dict[str, Histogram] = {}
+        self.request_seconds: Dict[str, Histogram] = {}
+
+    def _check_fork(self):
+        # Counts of the preloading parent are in its own snapshot; don't report them twice
+        if self._pid != os.getpid():
+            self._pid = os.getpid()
+            self._reset()
+
+    def observe_command(self, name: str, seconds: float):
+        with self._lock:
+            self._check_fork()
+            self.commands.setdefault(name, Histogram(DURATION_BUCKETS)).observe(seconds)
+
+    def observe_request(self, endpoint: str, commands: int, seconds: float):
+        with self._lock:
+            self._check_fork()
+            self.request_commands.setdefault(endpoint, Histogram(COUNT_BUCKETS)).observe(commands)
+            self.request_seconds.setdefault(endpoint, Histogram(DURATION_BUCKETS)).observe(seconds)
+
+    def _snapshot(self) -> Dict:
+        return {
+            'commands': {k: h.to_dict() for k, h in self.commands.items()},
+            'request_commands': {k: h.to_dict() for k, h in self.request_commands.items()},
+            'request_seconds': {k: h.to_dict() for k, h in self.request_seconds.items()},
+            'counters': {
+                f'{prefix}_{name}': value
+                for prefix, collect in self._counter_sources.items() for name, value in collect().items()
+            },
+        }
+
+    def flush_due(self) -> bool:
+        return time.monotonic() - self._flushed_at >= GIT_METRICS_FLUSH_INTERVAL
+
+    def flush(self):
+        """Write this process's snapshot for render() in other workers"""
+        with self._lock:
+            self._check_fork()
+            snapshot = self._snapshot()
+            self._flushed_at = time.monotonic()
+        try:
+            os.makedirs(self.state_dir, exist_ok=True)
+            path = self._snapshot_path(self._pid)
+            tmp_path = f'{path}.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write git metrics snapshot: {e}")
+
+    def _snapshot_path(self, name) -> str:
+        return os.path.join(self.state_dir, f'git-{name}.json')
+
+    def retire(self, pid: int):
+        """
+        Fold the snapshot of an exited worker into the snapshot of retired workers, so its
+        counts stay in the totals while its gauges (e.g. cache sizes) drop out. Called by the
+        gunicorn master for each exited worker; keeps one file per live worker.
+        """
+        path = self._snapshot_path(pid)
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            snapshot = None
+        if snapshot is not None:
+            retired_path = self._snapshot_path('retired')
+            try:
+                with open(retired_path) as f:
+                    retired = json.load(f)
+            except (OSError, ValueError):
+                retired = {'commands': {}, 'request_commands': {}, 'request_seconds': {}, 'counters': {}}
+            for name, value in snapshot.pop('counters', {}).items():
+                if name.endswith('_total'):
+                    retired['counters'][name] = retired['counters'].get(name, 0) + value
+            for section, histograms in snapshot.items():
+                for key, data in histograms.items():
+                    histogram = Histogram(SECTION_BOUNDS[section])
+                    if key in retired[section]:
+                        histogram.merge(retired[section][key])
+                    histogram.merge(data)
+                    retired[section][key] = histogram.to_dict()
+            try:
+                with open(f'{retired_path}.tmp', 'w') as f:
+                    json.dump(retired, f)
+                os.replace(f'{retired_path}.tmp', retired_path)
+            except OSError as e:
+                logger.warning(f"Failed to write retired git metrics: {e}")
+                return  # keep the worker's snapshot rather than lose its counts
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def clear(self):
+        """Remove the snapshots of a previous server; a new server starts from zero"""
+        for path in glob.glob(os.path.join(self.state_dir, 'git-*.json*')):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def render(self) -> str:
+        """Prometheus text exposition of the merged snapshots of all workers"""
+        self.flush()
+        merged = {'commands': {}, 'request_commands': {}, 'request_seconds': {}}
+        counters: Dict[str, float] = {}
+        for path in glob.glob(os.path.join(self.state_dir, 'git-*.json')):
+            try:
+                with open(path) as f:
+                    snapshot = json.load(f)
+            except (OSError, ValueError):
+                continue  # being replaced, or a partial write of a killed worker
+            for name, value in snapshot.pop('counters', {}).items():
+                counters[name] = counters.get(name, 0) + value
+            for section, histograms in snapshot.items():
+                for key, data in histograms.items():
+                    merged[section].setdefault(key, Histogram(SECTION_BOUNDS[section])).merge(data)
+
+        lines = []
+        for section, name, label, help_text in (
+            ('commands', 'git_command_duration_seconds', 'command', 'Duration of git invocations'),
+            ('request_commands', 'git_commands_per_request', 'endpoint', 'Git invocations per request'),
+            ('request_seconds', 'git_seconds_per_request', 'endpoint', 'Time spent in git per request'),
+        ):
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} histogram')
+            for key in sorted(merged[section]):
+                lines.extend(merged[section][key].render(name, f'{label}="{key}"'))
+        for name in sorted(counters):
+            lines.append(f'# TYPE {name} {"counter" if name.endswith("_total") else "gauge"}')
+            lines.append(f'{name} {counters[name]}')
+        return '\n'.join(lines) + '\n'
+
+
+git_command_metrics = GitMetrics(GIT_METRICS_DIR)
+
+
+class RequestGitStats:
+    """Git invocations of one request: {command: [count, seconds]}"""
+
+    def __init__(self):
+        self.commands: Dict[str, List[float]] = {}
+
+    def record(self, name: str, seconds: float):
+        entry = self.commands.setdefault(name, [0, 0.0])
+        entry[0] += 1
+        entry[1] += seconds
+
+    @property
+    def count(self) -> int:
+        return sum(n for n, _ in self.commands.values())
+
+    @property
+    def seconds(self) -> float:
+        return sum(s for _, s in self.commands.values())
+
+    def summary(self) -> str:
+        """e.g. 'ls-remote=1/81.2ms log=2/10.4ms', most expensive first"""
+        return ' '.join(
+            f'{name}={n}/{seconds * 1000:.1f}ms'
+            for name, (n, seconds) in sorted(self.commands.items(), key=lambda item: -item[1][1])
+        )
+
+
+def record_git_command(command, seconds: float):
+    """Count one git invocation in the process aggregates and the current request, if any"""
+    name = command_name(command)
+    git_command_metrics.observe_command(name, seconds)
+    if has_request_context():
+        stats: Optional[RequestGitStats] = g.get('git_stats')
+        if stats is not None:
+            stats.record(name, seconds)
+
+
+@contextmanager
+def timed_git_command(command):
+    """Record a git invocation made outside GitPython (e.g. through subprocess)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_git_command(command, time.perf_counter() - start)
+
+
+class InstrumentedGit(git.Git):
+    """GitPython command wrapper that records every invocation it executes"""
+
+    def execute(self, command, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().execute(command, *args, **kwargs)
+        finally:
+            # For as_process calls (e.g. the persistent cat-file) this is the spawn time only
+            record_git_command(command, time.perf_counter() - start)
+
+
+class InstrumentedRepo(git.Repo):
+    """git.Repo whose commands (repo.git, and the clone of InstrumentedRepo.clone_from) are recorded"""
+
+    GitCommandWrapperType = InstrumentedGit
+
+
+def init_app(app: Flask):
+    """
+    Attach per-request git stats to the request context (g.git_stats) and put them in the WSGI
+    environ as git_commands/git_ms, which gunicorn's access log includes ({git_commands}e)
+    """
+
+    @app.before_request
+    def start_git_stats():
+        g.git_stats = RequestGitStats()
+
+    @app.after_request
+    def report_git_stats(response):
+        stats: Optional[RequestGitStats] = g.get('git_stats')
+        if stats is None:
+            return response
+        count, seconds = stats.count, stats.seconds
+        request.environ['git_commands'] = f'{count} {stats.summary()}'.rstrip()
+        request.environ['git_ms'] = f'{seconds * 1000:.1f}'
+        git_command_metrics.observe_request(request.endpoint or 'unmatched', count, seconds)
+        if git_command_metrics.flush_due():
+            git_command_metrics.flush()
+        return response
@@ -36,7 +36,9 @@ max_requests_jitter = 50  # Add randomness to max_requests
 accesslog = '-'  # stdout
 errorlog = '-'   # stderr
 loglevel = 'info'
-access_log_format = '%({x-forwarded-for}i)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s"'
+# git_commands: "<count> <command>=<calls>/<time> ..." and total git time of the request, from the
+# WSGI environ (see git_metrics.py)
+access_log_format = '%({x-forwarded-for}i)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" git_commands="%({git_commands}e)s" git_ms=%({git_ms}e)s'
 
 # Development specific settings
 reload = False  # Set to True in development
@@ -52,7 +54,8 @@ def when_ready(server):
 
 def on_starting(server):
     """Run actions before the first process is forked."""
-    pass
+    from git_metrics import git_command_metrics
+    git_command_metrics.clear()
 
 def post_fork(server, worker):
     """Run actions after a worker is forked."""
@@ -67,6 +70,11 @@ def worker_exit(server, worker):
     """Run actions after a worker exits."""
     server.log.info("Worker exited (pid: %s)", worker.pid)
 
+def child_exit(server, worker):
+    """Run actions in the master after a worker exited, including workers killed on timeout."""
+    from git_metrics import git_command_metrics
+    git_command_metrics.retire(worker.pid)
+
 # Custom settings for your application
 raw_env = [
     f"CUSTOMER={Config.CUSTOMER}",
@@ -0,0 +1,292 @@
+"""
+Local stand-in for the Airbyte config API used by the app and the schema generators.
+
+Serves the endpoints this repo calls (`connections/list`, `connections/get`,
+`destinations/list`, `destinations/get`, `destination_definitions/get`) from a
+recorded fixture or a synthetic catalog, with configurable latency and failure
+injection. Point AIRBYTE_LOCAL_K8S_SVC_URL at it to run project initialization,
+the drift endpoint or the benchmarks without a live Airbyte.
+
+Per-endpoint request counts are available from `GET /standin/stats`, which makes
+caching and retry changes measurable.
+
+Usage:
+    # synthetic catalog, 50 ms +/- 20 ms per call, 5% of calls answered with 503
+    python benchmarks/airbyte_standin.py --port 8001 --streams 50 --latency-ms 50 --jitter-ms 20 --error-rate 0.05
+
+    # record a fixture from a live Airbyte, then replay it
+    python benchmarks/airbyte_standin.py record --url airbyte-server-svc:8001 --workspace-id <id> --output fixture.json
+    python benchmarks/airbyte_standin.py --port 8001 --fixture fixture.json
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+from synthetic_catalog import build_catalog, build_destination_definitions
+
+API_PREFIX = "/api/v1/"
+
+
+class AirbyteStandin:
+    """
+    Fixture store plus fault injection for the stand-in server.
+
+    Args:
+        fixture (dict): {"connections": [...], "destinations": [...], "destination_definitions": [...]},
+            the first two shaped like the `connections/list` and `destinations/list` entries.
+        latency_ms (float): Delay added to every API call.
+        jitter_ms (float): Uniform random jitter added on top of latency_ms.
+        error_rate (float): Probability that a call is answered with error_status.
+        error_status (int): HTTP status returned for injected failures.
+        hang_rate (float): Probability that a call sleeps hang_seconds before answering, to exercise client timeouts.
+        hang_seconds (float): Delay used for hung calls.
+        fail_first (int): Number of initial API calls that always fail, for deterministic retry tests.
+        seed (int): Seed for latency jitter and failure injection.
+    """
+
+    def __init__(self, fixture, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0, error_status=503,
+                 hang_rate=0.0, hang_seconds=30.0, fail_first=0, seed=None):
+        self.connections = {c["connectionId"]: c for c in fixture.get("connections", [])}
+        self.destinations = {d["destinationId"]: d for d in fixture.get("destinations", [])}
+        self.definitions = {
+            d["destinationDefinitionId"]: d for d in fixture.get("destination_definitions", [])
+        }
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.fail_first = fail_first
+        self.stats = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._calls = 0
+        self.routes = {
+            "connections/list": self.list_connections,
+            "connections/get": self.get_connection,
+            "destinations/list": self.list_destinations,
+            "destinations/get": self.get_destination,
+            "destination_definitions/get": self.get_destination_definition,
+        }
+
+    def list_connections(self, body):
+        workspace_id = body.get("workspaceId")
+        return 200, {"connections": [
+            c for c in self.connections.values() if not workspace_id or c.get("workspaceId") == workspace_id
+        ]}
+
+    def get_connection(self, body):
+        return self._lookup(self.connections, body.get("connectionId"), "connection")
+
+    def list_destinations(self, body):
+        workspace_id = body.get("workspaceId")
+        return 200, {"destinations": [
+            d for d in self.destinations.values() if not workspace_id or d.get("workspaceId") == workspace_id
+        ]}
+
+    def get_destination(self, body):
+        return self._lookup(self.destinations, body.get("destinationId"), "destination")
+
+    def get_destination_definition(self, body):
+        return self._lookup(self.definitions, body.get("destinationDefinitionId"), "destination_definition")
+
+    @staticmethod
+    def _lookup(items, item_id, kind):
+        if item_id in items:
+            return 200, items[item_id]
+        return 404, {"id": item_id, "message": f"Could not find configuration for {kind}: {item_id}."}
+
+    def _inject_fault(self):
+        """Sleeps for the configured latency; returns an HTTP status when the call should fail."""
+        with self._lock:
+            self._calls += 1
+            forced = self._calls <= self.fail_first
+            delay = self.latency_ms + self._random.uniform(0, self.jitter_ms)
+            failed = forced or self._random.random() < self.error_rate
+            hung = self._random.random() < self.hang_rate
+        time.sleep((self.hang_seconds if hung else 0) + delay / 1000)
+        return self.error_status if failed else None
+
+    def handle(self, path, body):
+        """Returns (status, payload) for an API call."""
+        route = path.rstrip("/")[len(API_PREFIX):] if path.startswith(API_PREFIX) else None
+        handler = self.routes.get(route)
+        if not handler:
+            return 404, {"message": f"Unknown endpoint {path}"}
+        with self._lock:
+            self.stats[route] += 1
+        error_status = self._inject_fault()
+        if error_status:
+            with self._lock:
+                self.stats[f"{route} (injected {error_status})"] += 1
+            return error_status, {"message": "Injected failure from the Airbyte stand-in"}
+        return handler(body)
+
+    def serve(self, host="127.0.0.1", port=0):
+        """Starts the server on a daemon thread and returns it; port 0 picks a free port."""
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real Airbyte server
+            disable_nagle_algorithm = True  # headers and body are separate writes; avoid delayed-ACK stalls
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                try:
+                    body = json.loads(raw or b"{}")
+                except ValueError:
+                    self._send(400, {"message": "Request body is not valid JSON"})
+                    return
+                self._send(*standin.handle(self.path, body))
+
+            def do_GET(self):
+                if self.path.rstrip("/") == "/standin/stats":
+                    with standin._lock:
+                        self._send(200, dict(standin.stats))
+                else:
+                    self._send(404, {"message": f"Unknown endpoint {self.path}"})
+
+            def _send(self, status, payload):
+                data = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+
+def synthetic_fixture(connections=1, streams=10, columns=20, depth=2, anyof_branches=1, namespaces=2,
+                      seed=42, docker_image_tag="2.0.0"):
+    """Builds a stand-in fixture from synthetic_catalog."""
+    connection_list, destination_list, _ = build_catalog(
+        connections=connections,
+        streams=streams,
+        columns=columns,
+        depth=depth,
+        anyof_branches=anyof_branches,
+        namespaces=namespaces,
+        seed=seed,
+    )
+    return {
+        "connections": connection_list["connections"],
+        "destinations": destination_list["destinations"],
+        "destination_definitions": build_destination_definitions(destination_list, docker_image_tag),
+    }
+
+
+def record_fixture(airbyte_url, workspace_id):
+    """Captures a fixture for one workspace from a live Airbyte (host:port, as in AIRBYTE_LOCAL_K8S_SVC_URL)."""
+    base_url = f"http://{airbyte_url}/api/v1"
+    with requests.Session() as session:
+        def post(endpoint, payload):
+            response = session.post(f"{base_url}/{endpoint}", json=payload, timeout=60)
+            response.raise_for_status()
+            return response.json()
+
+        connections = post("connections/list", {"workspaceId": workspace_id})["connections"]
+        destinations = post("destinations/list", {"workspaceId": workspace_id})["destinations"]
+        definition_ids = sorted({d["destinationDefinitionId"] for d in destinations})
+        definitions = [
+            post("destination_definitions/get", {"destinationDefinitionId": definition_id})
+            for definition_id in definition_ids
+        ]
+    return {"connections": connections, "destinations": destinations, "destination_definitions": definitions}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command")
+
+    record = subparsers.add_parser("record", help="capture a fixture from a live Airbyte")
+    record.add_argument("--url", required=True, help="Airbyte host:port")
+    record.add_argument("--workspace-id", required=True)
+    record.add_argument("--output", required=True, help="fixture JSON file to write")
+
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--fixture", metavar="PATH", help="recorded fixture JSON; synthetic catalog when omitted")
+    parser.add_argument("--connections", type=int, default=2, help="synthetic connections")
+    parser.add_argument("--streams", type=int, default=25, help="synthetic streams per connection")
+    parser.add_argument("--columns", type=int, default=30, help="synthetic properties per object level")
+    parser.add_argument("--depth", type=int, default=2, help="synthetic nesting depth")
+    parser.add_argument("--anyof", type=int, default=1, help="synthetic object branches per anyOf column")
+    parser.add_argument("--namespaces", type=int, default=2, help="synthetic source namespaces")
+    parser.add_argument("--docker-image-tag", default="2.0.0", help="synthetic destination version")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with --error-status")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--hang-rate", type=float, default=0.0, help="share of calls delayed by --hang-seconds")
+    parser.add_argument("--hang-seconds", type=float, default=30.0)
+    parser.add_argument("--fail-first", type=int, default=0, help="fail this many initial calls")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.command == "record":
+        fixture = record_fixture(args.url, args.workspace_id)
+        with open(args.output, "w") as output_file:
+            json.dump(fixture, output_file, indent=2)
+        print(
+            f"Recorded {len(fixture['connections'])} connections and "
+            f"{len(fixture['destinations'])} destinations to {args.output}"
+        )
+        return
+
+    if args.fixture:
+        with open(args.fixture, "r") as fixture_file:
+            fixture = json.load(fixture_file)
+    else:
+        fixture = synthetic_fixture(
+            connections=args.connections,
+            streams=args.streams,
+            columns=args.columns,
+            depth=args.depth,
+            anyof_branches=args.anyof,
+            namespaces=args.namespaces,
+            seed=args.seed,
+            docker_image_tag=args.docker_image_tag,
+        )
+    standin = AirbyteStandin(
+        fixture,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        hang_rate=args.hang_rate,
+        hang_seconds=args.hang_seconds,
+        fail_first=args.fail_first,
+        seed=args.seed,
+    )
+    server = standin.serve(args.host, args.port)
+    print(
+        f"Airbyte stand-in listening on {args.host}:{server.server_port} "
+        f"({len(standin.connections)} connections, {len(standin.destinations)} destinations)"
+    )
+    print(f"export AIRBYTE_LOCAL_K8S_SVC_URL={args.host}:{server.server_port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+End-to-end benchmark of the v1 and v2 Airbyte schema generators (create_yml_schema.py).
+
+Each run copies the generator and its model template into a fresh temporary project,
+serves a synthetic Airbyte catalog from the local Airbyte stand-in and executes the script
+the same way project initialization does (`python3 create_yml_schema.py <platform>`).
+Wall time, peak RSS of the generator process and the files it wrote are reported.
+
+Runs are offline and reproducible: the catalog is generated from a fixed seed.
+
+Usage:
+    python benchmarks/bench_create_yml_schema.py --streams 50 --columns 40 --depth 3
+    python benchmarks/bench_create_yml_schema.py --versions 2 --platforms bigquery --warm --json bench_output.txt
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from airbyte_standin import AirbyteStandin, synthetic_fixture
+from synthetic_catalog import WORKSPACE_ID
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PLATFORMS = ["bigquery", "snowflake", "redshift", "fabric", "postgres"]
+GENERATOR_FILES = ["create_yml_schema.py", "airbyte_model_template.sql"]
+
+
+def prepare_project(project_dir, init_version, connection_ids):
+    """Lays out a project directory the way create_dbt_project does before running the generator."""
+    os.makedirs(os.path.join(project_dir, "models", "staging"), exist_ok=True)
+    for file_name in GENERATOR_FILES:
+        shutil.copy(os.path.join(REPO_ROOT, f"init_setup_files_v{init_version}", file_name), project_dir)
+
+    # v1 reads a single connection ID, v2 a list
+    connection_id = connection_ids if init_version == "2" else connection_ids[0]
+    airflow_variables = {
+        "K8S_SECRETS_DBT_PRJ_BENCHMARK": {
+            "AIRBYTE_CONNECTION_ID": connection_id,
+            "AIRBYTE_WORKSPACE_ID": WORKSPACE_ID,
+        }
+    }
+    with open(os.path.join(project_dir, "dbt_airflow_variables.yml"), "w") as f:
+        json.dump(airflow_variables, f)  # JSON is valid YAML
+    with open(os.path.join(project_dir, "dbt_project.yml"), "w") as f:
+        f.write("name: benchmark\nvars:\n  source_dataset_name: source_dataset_name\n")
+
+
+# Summary line of the v2 generator, reported by its OutputSink
+V2_WRITE_SUMMARY = re.compile(r"wrote (\d+) files \((\d+) bytes\)")
+
+
+def count_model_files(project_dir):
+    files, size = 0, 0
+    for root, _, names in os.walk(os.path.join(project_dir, "models")):
+        for name in names:
+            files += 1
+            size += os.path.getsize(os.path.join(root, name))
+    return files, size
+
+
+def written_files(init_version, project_dir, output):
+    """
+    (files, bytes) the run wrote. v2 reports what its OutputSink wrote, skipping unchanged
+    files; v1 has no sink and rewrites every file it generates, i.e. all of models/.
+    """
+    if init_version == "1":
+        return count_model_files(project_dir)
+    match = V2_WRITE_SUMMARY.search(output)
+    if not match:
+        raise RuntimeError(f"No write summary in the v2 generator output:\n{output}")
+    return int(match.group(1)), int(match.group(2))
+
+
+def run_generator(project_dir, platform, airbyte_url):
+    """Runs the generator once and returns (wall seconds, peak RSS in MiB, its output)."""
+    env = dict(
+        os.environ,
+        AIRFLOW_VARIABLES_FILE_NAME="dbt_airflow_variables.yml",
+        AIRBYTE_LOCAL_K8S_SVC_URL=airbyte_url,
+    )
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "create_yml_schema.py", platform],
+        cwd=project_dir,
+        env=env,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+    )
+    output = process.stdout.read().decode(errors="replace")
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"create_yml_schema.py failed on {platform}:\n{output}")
+    return elapsed, usage.ru_maxrss / 1024, output  # ru_maxrss is in KiB on Linux
+
+
+def benchmark(args):
+    fixture = synthetic_fixture(
+        connections=args.connections,
+        streams=args.streams,
+        columns=args.columns,
+        depth=args.depth,
+        anyof_branches=args.anyof,
+        namespaces=args.namespaces,
+        seed=args.seed,
+    )
+    connection_ids = [c["connectionId"] for c in fixture["connections"]]
+    server = AirbyteStandin(fixture, latency_ms=args.latency_ms, seed=args.seed).serve()
+    airbyte_url = f"127.0.0.1:{server.server_port}"
+    results = []
+    try:
+        for init_version in args.versions:
+            for platform in args.platforms:
+                modes = ["cold", "warm"] if args.warm else ["cold"]
+                timings = {mode: [] for mode in modes}
+                peak_rss = {mode: 0.0 for mode in modes}
+                written = {mode: (0, 0) for mode in modes}
+                for _ in range(args.repeat):
+                    with tempfile.TemporaryDirectory(prefix="bench_create_yml_schema_") as project_dir:
+                        prepare_project(project_dir, init_version, connection_ids)
+                        for mode in modes:
+                            elapsed, rss, output = run_generator(project_dir, platform, airbyte_url)
+                            timings[mode].append(elapsed)
+                            peak_rss[mode] = max(peak_rss[mode], rss)
+                            written[mode] = written_files(init_version, project_dir, output)
+                for mode in modes:
+                    results.append({
+                        "init_version": init_version,
+                        "platform": platform,
+                        "mode": mode,
+                        "wall_seconds_median": statistics.median(timings[mode]),
+                        "wall_seconds_min": min(timings[mode]),
+                        "peak_rss_mib": round(peak_rss[mode], 1),
+                        "files_written": written[mode][0],
+                        "bytes_written": written[mode][1],
+                    })
+    finally:
+        server.shutdown()
+    return results
+
+
+def print_results(results, args):
+    print(
+        f"connections={args.connections} streams={args.streams} columns={args.columns} "
+        f"depth={args.depth} anyof={args.anyof} seed={args.seed} repeat={args.repeat} latency_ms={args.latency_ms}"
+    )
+    header = f"{'init':>4}  {'platform':<10} {'mode':<5} {'median s':>9} {'min s':>8} {'peak MiB':>9} {'files':>6} {'bytes':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in results:
+        print(
+            f"v{r['init_version']:>3}  {r['platform']:<10} {r['mode']:<5} {r['wall_seconds_median']:>9.3f} "
+            f"{r['wall_seconds_min']:>8.3f} {r['peak_rss_mib']:>9.1f} {r['files_written']:>6} {r['bytes_written']:>10}"
+        )
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=2, help="connections in the workspace")
+    parser.add_argument("--streams", type=int, default=25, help="streams per connection")
+    parser.add_argument("--columns", type=int, default=30, help="properties per object level")
+    parser.add_argument("--depth", type=int, default=2, help="nesting depth of object columns")
+    parser.add_argument("--anyof", type=int, default=1, help="object branches per anyOf column")
+    parser.add_argument("--namespaces", type=int, default=2, help="source namespaces streams are spread over")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="latency the Airbyte stand-in adds per API call")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per version/platform (median is reported)")
+    parser.add_argument("--versions", nargs="+", default=["1", "2"], choices=["1", "2"])
+    parser.add_argument("--platforms", nargs="+", default=PLATFORMS, choices=PLATFORMS)
+    parser.add_argument("--warm", action="store_true", help="also time a second run on the generated project")
+    parser.add_argument("--json", metavar="PATH", help="write results as JSON to PATH")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    arguments = parse_args()
+    benchmark_results = benchmark(arguments)
+    print_results(benchmark_results, arguments)
+    if arguments.json:
+        with open(arguments.json, "w") as output_file:
+            json.dump(benchmark_results, output_file, indent=2)
@@ -0,0 +1,133 @@
+"""
+Synthetic Airbyte API payloads for benchmarking the schema generators.
+
+Builds reproducible `connections/list` and `destinations/list` responses shaped like
+the ones create_yml_schema.py reads, with configurable numbers of connections,
+streams, columns, nesting depth and anyOf object branches.
+"""
+import random
+
+WORKSPACE_ID = "00000000-0000-0000-0000-000000000001"
+DESTINATION_ID = "00000000-0000-0000-0000-0000000000d1"
+DESTINATION_DEFINITION_ID = "00000000-0000-0000-0000-0000000000dd"
+
+# Column name patterns that exercise the name normalizer (camelCase, spaces, dots, leading underscores)
+NAME_PATTERNS = [
+    "id{}", "userId{}", "createdAt{}", "First Name {}", "_private{}", "HTTPStatus{}",
+    "address.city{}", "some__field{}", "dateOfBirth{}", "amount_{}", "isActive{}", "metaData{}",
+]
+
+SCALAR_TYPES = [
+    {"type": ["null", "string"]},
+    {"type": ["null", "integer"]},
+    {"type": ["null", "number"]},
+    {"type": ["null", "boolean"]},
+    {"type": ["null", "array"], "items": {"type": "string"}},
+    {"type": "string", "format": "date-time", "airbyte_type": "timestamp_with_timezone"},
+    {"type": ["null", "object"], "additionalProperties": True},
+]
+
+
+def build_object_schema(rnd, columns, depth, anyof_branches):
+    """
+    Returns an object schema with `columns` properties. While depth remains, every
+    fifth property is a nested object and every seventh an anyOf with
+    `anyof_branches` object branches, each with a fifth of the parent's width.
+    """
+    properties = {}
+    nested_columns = max(2, columns // 5)
+    for i in range(columns):
+        name = rnd.choice(NAME_PATTERNS).format(i)
+        if depth > 0 and i % 5 == 4:
+            nested = build_object_schema(rnd, nested_columns, depth - 1, anyof_branches)
+            properties[name] = {"type": ["null", "object"], "properties": nested["properties"]}
+        elif depth > 0 and anyof_branches and i % 7 == 6:
+            branches = [
+                build_object_schema(rnd, nested_columns, depth - 1, anyof_branches)
+                for _ in range(anyof_branches)
+            ]
+            properties[name] = {"anyOf": branches + [{"type": "null"}]}
+        else:
+            properties[name] = dict(rnd.choice(SCALAR_TYPES))
+    return {"type": "object", "properties": properties}
+
+
+def build_stream(rnd, index, columns, depth, anyof_branches, namespaces):
+    json_schema = build_object_schema(rnd, columns, depth, anyof_branches)
+    primary_key = next(iter(json_schema["properties"]))
+    return {
+        "stream": {
+            "name": f"stream_{index:04d}",
+            "namespace": f"source_ns_{index % namespaces}",
+            "jsonSchema": json_schema,
+            "supportedSyncModes": ["full_refresh", "incremental"],
+        },
+        "config": {
+            "syncMode": "incremental",
+            "destinationSyncMode": "append_dedup",
+            "primaryKey": [[primary_key]],
+            "selected": True,
+        },
+    }
+
+
+def build_catalog(connections=1, streams=10, columns=20, depth=2, anyof_branches=1, namespaces=2, seed=42):
+    """
+    Builds the payloads served for `connections/list` and `destinations/list`.
+
+    Returns:
+        tuple: (connections_list, destinations_list, connection_ids)
+    """
+    rnd = random.Random(seed)
+    connection_list = []
+    for c in range(connections):
+        connection_id = f"00000000-0000-0000-0000-{c:012d}"
+        connection_list.append({
+            "connectionId": connection_id,
+            "name": f"synthetic connection {c}",
+            "sourceId": f"00000000-0000-0000-0001-{c:012d}",
+            "destinationId": DESTINATION_ID,
+            "workspaceId": WORKSPACE_ID,
+            "prefix": f"c{c}_",
+            "namespaceDefinition": "customformat",
+            "namespaceFormat": "${SOURCE_NAMESPACE}_raw",
+            "status": "active",
+            "syncCatalog": {
+                "streams": [
+                    build_stream(rnd, s, columns, depth, anyof_branches, namespaces)
+                    for s in range(streams)
+                ]
+            },
+        })
+
+    destination_list = [{
+        "destinationId": DESTINATION_ID,
+        "destinationDefinitionId": DESTINATION_DEFINITION_ID,
+        "workspaceId": WORKSPACE_ID,
+        "name": "synthetic destination",
+        "connectionConfiguration": {
+            "project_id": "synthetic-project",
+            "dataset_id": "synthetic_dataset",
+            "database": "SYNTHETIC_DB",
+        },
+    }]
+    return {"connections": connection_list}, {"destinations": destination_list}, [
+        c["connectionId"] for c in connection_list
+    ]
+
+
+def build_destination_definitions(destinations, docker_image_tag="2.0.0"):
+    """
+    Returns a `destination_definitions/get` response for every definition referenced by
+    `destinations` (a `destinations/list` response). Tags above 1.10.2 are v2 destinations.
+    """
+    definition_ids = {d["destinationDefinitionId"] for d in destinations["destinations"]}
+    return [
+        {
+            "destinationDefinitionId": definition_id,
+            "name": "Synthetic Destination",
+            "dockerRepository": "airbyte/destination-synthetic",
+            "dockerImageTag": docker_image_tag,
+        }
+        for definition_id in sorted(definition_ids)
+    ]
@@ -1,8 +1,21 @@
+import random
+import time
+
 import requests
 import yaml
 import re
 import os
 import ruamel.yaml
+from functools import lru_cache
+
+# Airbyte API calls share one keep-alive session. Each attempt is bounded by the (connect, read)
+# timeouts; 5xx responses and connection errors are retried with jittered exponential backoff.
+AIRBYTE_API_CONNECT_TIMEOUT = float(os.environ.get("AIRBYTE_API_CONNECT_TIMEOUT", 5))
+AIRBYTE_API_READ_TIMEOUT = float(os.environ.get("AIRBYTE_API_READ_TIMEOUT", 60))
+AIRBYTE_API_MAX_RETRIES = int(os.environ.get("AIRBYTE_API_MAX_RETRIES", 2))
+AIRBYTE_API_BACKOFF_SECONDS = float(os.environ.get("AIRBYTE_API_BACKOFF_SECONDS", 0.5))
+
+_AIRBYTE_SESSION = None
 
 
 def read_airflow_var_yml(file_path):
@@ -11,11 +24,43 @@ def read_airflow_var_yml(file_path):
     return airflow_var
 
 
+def get_airbyte_session():
+    global _AIRBYTE_SESSION
+    if _AIRBYTE_SESSION is None:
+        _AIRBYTE_SESSION = requests.Session()
+        _AIRBYTE_SESSION.headers.update({"Content-Type": "application/json"})
+    return _AIRBYTE_SESSION
+
+
+def post_airbyte_api(url, payload):
+    """
+    POSTs to the Airbyte API and returns the response, logging the response time of every attempt.
+    Raises the last error once AIRBYTE_API_MAX_RETRIES retries are used up, or right away on a 4xx.
+    """
+    session = get_airbyte_session()
+    timeout = (AIRBYTE_API_CONNECT_TIMEOUT, AIRBYTE_API_READ_TIMEOUT)
+    for attempt in range(AIRBYTE_API_MAX_RETRIES + 1):
+        start = time.monotonic()
+        try:
+            response, error = session.post(url, json=payload, timeout=timeout), None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            response, error = None, e
+        elapsed_ms = (time.monotonic() - start) * 1000
+        outcome = type(error).__name__ if error else response.status_code
+        print(f"POST {url} -> {outcome} in {elapsed_ms:.0f} ms (attempt {attempt + 1}/{AIRBYTE_API_MAX_RETRIES + 1})")
+        if not error and response.status_code < 500:
+            response.raise_for_status()
+            return response
+        if attempt == AIRBYTE_API_MAX_RETRIES:
+            if error:
+                raise error
+            response.raise_for_status()
+        # full jitter: sleep a random share of the exponential backoff
+        time.sleep(random.uniform(0, AIRBYTE_API_BACKOFF_SECONDS * 2 ** attempt))
+
+
 def read_api_connection_list(url, workspace_id):
-    headers = {"Content-Type": "application/json"}
-    json_obj = {"workspaceId": workspace_id}
-    x = requests.post(url, json=json_obj, headers=headers)
-    return x.json()
+    return post_airbyte_api(url, {"workspaceId": workspace_id}).json()
 
 
 def create_yml_file(yml_dict, file_path, file_name):
@@ -66,17 +111,27 @@ def type_convert(col, col_type):
     ) or source_col_type
 
 
+_CAMEL_WORD_RE = re.compile("(.)([A-Z][a-z]+)")
+_SEPARATOR_RE = re.compile(r"((?<!\w)[\s_]+)|[\s_]+")
+_DOT_OR_CASE_BOUNDARY_RE = re.compile(r"\.|(?<=[a-z0-9])(?=[A-Z])")
+
+
+def _replace_separator(match):
+    # leading runs (start of string or after a non-word char) are dropped, inner runs become one underscore
+    return "" if match.group(1) else "_"
+
+
+@lru_cache(maxsize=65536)
 def convert_value_to_system_standart(val):
-    new_val = re.sub(
-        "(.)([A-Z][a-z]+)", r"\1_\2", val
+    new_val = _CAMEL_WORD_RE.sub(
+        r"\1_\2", val
     )  # adding underscore between first and second found groups
-    new_val = re.sub(r"\s", "_", new_val)  # replace all spaces
-    new_val = re.sub(r"_+", "_", new_val)  # replace n-underscores to 1 inside the name
-    new_val = re.sub(r"\b_+", "", new_val)  # remove leading underscores
-    new_val = re.sub(r"\.", "_", new_val)  # replace dots to underscores
-    new_val = re.sub(
-        "([a-z0-9])([A-Z])", r"\1_\2", new_val
-    )  # adding underscore before upper case letter if starts from lower case or digit
+    new_val = _SEPARATOR_RE.sub(
+        _replace_separator, new_val
+    )  # replace spaces, collapse n-underscores to 1 and remove leading underscores
+    new_val = _DOT_OR_CASE_BOUNDARY_RE.sub(
+        "_", new_val
+    )  # replace dots and add underscore before upper case letter if starts from lower case or digit
     return new_val.lower()
 
 
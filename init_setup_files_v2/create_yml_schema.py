@@ -1,13 +1,61 @@
+import hashlib
+import io
+import json
+import posixpath
+import random
 import re
+import tarfile
+import time
+import zlib
 
 import requests
 import yaml
 import os
 import sys
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+# Set from the command line in main(); None keeps the bigquery behaviour when the module is imported
+DATA_WAREHOUSE_PLATFORM = None
+
+# Column expression builder for DATA_WAREHOUSE_PLATFORM, chosen once per run in main()
+DIALECT = None
+
+# Collects the files generated by the current run (an OutputSink, created in main())
+OUTPUT = None
+
+# Threads used to write generated files; 0 or 1 writes them sequentially
+SCHEMA_WRITE_WORKERS = int(os.environ.get("AIRBYTE_SCHEMA_WRITE_WORKERS", 0))
+
+# Where main() puts the generated files: "files" (the project directory), "tar" (an uncompressed
+# archive at AIRBYTE_SCHEMA_OUTPUT_PATH) or "git-tree" (blob and tree objects in the git directory
+# AIRBYTE_SCHEMA_OUTPUT_PATH, default .git; the root tree ID is printed)
+SCHEMA_OUTPUT = os.environ.get("AIRBYTE_SCHEMA_OUTPUT", "files")
+SCHEMA_OUTPUT_PATH = os.environ.get("AIRBYTE_SCHEMA_OUTPUT_PATH")
+
+# Per-stream hashes of the Airbyte schema the current models were generated from
+SCHEMA_FINGERPRINT_FILE = ".airbyte_schema_fingerprints.json"
+# Bumped when the manifest layout changes; a manifest in another format regenerates every stream
+SCHEMA_FINGERPRINT_FORMAT = 2
+
+# Optional limits for flattening nested objects into dot.notation columns (unset = no limit).
+# Objects at depth SCHEMA_MAX_DEPTH, or top-level objects that would push a stream over
+# SCHEMA_MAX_COLUMNS columns, are kept as a single raw JSON column instead.
+SCHEMA_MAX_DEPTH = int(os.environ["AIRBYTE_SCHEMA_MAX_DEPTH"]) if os.environ.get("AIRBYTE_SCHEMA_MAX_DEPTH") else None
+SCHEMA_MAX_COLUMNS = (
+    int(os.environ["AIRBYTE_SCHEMA_MAX_COLUMNS"]) if os.environ.get("AIRBYTE_SCHEMA_MAX_COLUMNS") else None
+)
+
+# Airbyte API calls share one keep-alive session. Each attempt is bounded by the (connect, read)
+# timeouts; 5xx responses and connection errors are retried with jittered exponential backoff.
+AIRBYTE_API_CONNECT_TIMEOUT = float(os.environ.get("AIRBYTE_API_CONNECT_TIMEOUT", 5))
+AIRBYTE_API_READ_TIMEOUT = float(os.environ.get("AIRBYTE_API_READ_TIMEOUT", 60))
+AIRBYTE_API_MAX_RETRIES = int(os.environ.get("AIRBYTE_API_MAX_RETRIES", 2))
+AIRBYTE_API_BACKOFF_SECONDS = float(os.environ.get("AIRBYTE_API_BACKOFF_SECONDS", 0.5))
+
+_AIRBYTE_SESSION = None
 
-global DATA_WAREHOUSE_PLATFORM
-DATA_WAREHOUSE_PLATFORM = sys.argv[1]
 
 def read_airflow_var_yml(file_path):
     with open(file_path, "r") as file:
@@ -15,18 +63,217 @@ def read_airflow_var_yml(file_path):
     return airflow_var
 
 
+def get_airbyte_session():
+    global _AIRBYTE_SESSION
+    if _AIRBYTE_SESSION is None:
+        _AIRBYTE_SESSION = requests.Session()
+        _AIRBYTE_SESSION.headers.update({"Content-Type": "application/json"})
+    return _AIRBYTE_SESSION
+
+
+def post_airbyte_api(url, payload):
+    """
+    POSTs to the Airbyte API and returns the response, logging the response time of every attempt.
+    Raises the last error once AIRBYTE_API_MAX_RETRIES retries are used up, or right away on a 4xx.
+    """
+    session = get_airbyte_session()
+    timeout = (AIRBYTE_API_CONNECT_TIMEOUT, AIRBYTE_API_READ_TIMEOUT)
+    for attempt in range(AIRBYTE_API_MAX_RETRIES + 1):
+        start = time.monotonic()
+        try:
+            response, error = session.post(url, json=payload, timeout=timeout), None
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            response, error = None, e
+        elapsed_ms = (time.monotonic() - start) * 1000
+        outcome = type(error).__name__ if error else response.status_code
+        print(f"POST {url} -> {outcome} in {elapsed_ms:.0f} ms (attempt {attempt + 1}/{AIRBYTE_API_MAX_RETRIES + 1})")
+        if not error and response.status_code < 500:
+            response.raise_for_status()
+            return response
+        if attempt == AIRBYTE_API_MAX_RETRIES:
+            if error:
+                raise error
+            response.raise_for_status()
+        # full jitter: sleep a random share of the exponential backoff
+        time.sleep(random.uniform(0, AIRBYTE_API_BACKOFF_SECONDS * 2 ** attempt))
+
+
 def read_api_connection_list(url, workspace_id):
-    headers = {"Content-Type": "application/json"}
-    json_obj = {"workspaceId": workspace_id}
-    x = requests.post(url, json=json_obj, headers=headers)
-    return x.json()
+    return post_airbyte_api(url, {"workspaceId": workspace_id}).json()
+
+
+class OutputSink:
+    """
+    Collects generated files in memory, keyed by path relative to the project root, and
+    writes them in one pass at the end of the run.
+
+    write_files() creates every directory once, leaves files whose bytes are unchanged
+    on disk untouched and deletes removed files. write_tar() and write_git_tree() emit the
+    whole generated set (added and kept files) into a tar stream or a git object database
+    instead of the working directory.
+    """
+
+    def __init__(self):
+        self.files = {}
+        self.kept = set()
+        self.removed = set()
+
+    def add(self, path, content):
+        self.files[path] = content.encode("utf-8") if isinstance(content, str) else content
+        self.removed.discard(path)
+
+    def keep(self, path):
+        """Marks a file on disk that the run reuses as-is: it is output, but not rewritten."""
+        self.kept.add(path)
+        self.removed.discard(path)
+
+    def remove(self, path):
+        """Marks a previously generated file as no longer part of the output."""
+        self.files.pop(path, None)
+        self.kept.discard(path)
+        self.removed.add(path)
+
+    def output_files(self, root="."):
+        """All files of the output, {path: bytes}, with kept files read from below root."""
+        files = {}
+        for path in self.kept - set(self.files):
+            with open(os.path.join(root, path), "rb") as kept_file:
+                files[path] = kept_file.read()
+        files.update(self.files)
+        return files
+
+    def write_files(self, root=".", workers=0):
+        """
+        Writes the collected files below root, through a thread pool when workers > 1.
+
+        Returns:
+            tuple: (files written, files skipped because their content was unchanged,
+            bytes written)
+        """
+        targets = [(os.path.join(root, path), data) for path, data in self.files.items()]
+        for directory in {os.path.dirname(target) for target, _ in targets}:
+            os.makedirs(directory, exist_ok=True)
+        if workers > 1:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(lambda target: self._write_if_changed(*target), targets))
+        else:
+            results = [self._write_if_changed(*target) for target in targets]
+        written = sum(results)
+        written_bytes = sum(len(data) for (_, data), changed in zip(targets, results) if changed)
+
+        for path in sorted(self.removed):
+            target = os.path.join(root, path)
+            if os.path.exists(target):
+                os.remove(target)
+            try:
+                os.rmdir(os.path.dirname(target))
+            except OSError:
+                pass  # folder still holds other files
+        return written, len(results) - written, written_bytes
+
+    @staticmethod
+    def _write_if_changed(file_path, data):
+        try:
+            if os.path.getsize(file_path) == len(data):
+                with open(file_path, "rb") as existing_file:
+                    if existing_file.read() == data:
+                        return False
+        except OSError:
+            pass  # missing or unreadable, write it
+        with open(file_path, "wb") as output_file:
+            output_file.write(data)
+        return True
+
+    def write_tar(self, fileobj, prefix="", root="."):
+        """
+        Streams the output files as an uncompressed tar archive into fileobj.
+
+        Returns:
+            int: Number of files archived.
+        """
+        mtime = int(time.time())
+        files = self.output_files(root)
+        with tarfile.open(fileobj=fileobj, mode="w|") as tar:
+            for path, data in sorted(files.items()):
+                info = tarfile.TarInfo(posixpath.join(prefix, path))
+                info.size = len(data)
+                info.mtime = mtime
+                info.mode = 0o644
+                tar.addfile(info, io.BytesIO(data))
+        return len(files)
+
+    def write_git_tree(self, git_dir, root="."):
+        """
+        Stores the output files as blob and tree objects in the (sha1) object database of
+        git_dir, without touching its index or working tree.
+
+        Returns:
+            str: ID of the root tree, e.g. for `git read-tree --prefix` or `git commit-tree`.
+        """
+        tree = {}
+        for path, data in self.output_files(root).items():
+            *directories, file_name = path.split("/")
+            node = tree
+            for directory in directories:
+                node = node.setdefault(directory, {})
+            node[file_name] = data
+        return self._write_git_tree_node(git_dir, tree)
+
+    @classmethod
+    def _write_git_tree_node(cls, git_dir, node):
+        entries = []
+        for name, child in node.items():
+            if isinstance(child, dict):
+                # git sorts a subtree as if its name ended with "/"
+                entries.append((name + "/", b"40000", name, cls._write_git_tree_node(git_dir, child)))
+            else:
+                entries.append((name, b"100644", name, cls._write_git_object(git_dir, "blob", child)))
+        tree = b"".join(
+            mode + b" " + name.encode("utf-8") + b"\0" + bytes.fromhex(object_id)
+            for _, mode, name, object_id in sorted(entries)
+        )
+        return cls._write_git_object(git_dir, "tree", tree)
+
+    @staticmethod
+    def _write_git_object(git_dir, kind, data):
+        content = f"{kind} {len(data)}\0".encode("ascii") + data
+        object_id = hashlib.sha1(content).hexdigest()
+        object_path = os.path.join(git_dir, "objects", object_id[:2], object_id[2:])
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            temp_path = f"{object_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as object_file:
+                object_file.write(zlib.compress(content))
+            os.replace(temp_path, object_path)
+        return object_id
 
 
 def create_yml_file(yml_dict, file_path, file_name):
-    if not os.path.exists(file_path):
-        os.makedirs(file_path)
-    with open(f"{file_path}/{file_name}.yml", "w") as yaml_file:
-        yaml.dump(yml_dict, yaml_file, default_flow_style=False, sort_keys=False)
+    OUTPUT.add(f"{file_path}/{file_name}.yml", yaml.dump(yml_dict, default_flow_style=False, sort_keys=False))
+
+
+_CAMEL_WORD_RE = re.compile("(.)([A-Z][a-z]+)")
+_SEPARATOR_RE = re.compile(r"((?<!\w)[\s_]+)|[\s_]+")
+_DOT_OR_CASE_BOUNDARY_RE = re.compile(r"\.|(?<=[a-z0-9])(?=[A-Z])")
+
+
+def _replace_separator(match):
+    # leading runs (start of string or after a non-word char) are dropped, inner runs become one underscore
+    return "" if match.group(1) else "_"
+
+
+@lru_cache(maxsize=65536)
+def _normalize_column_name(val: str) -> str:
+    new_val = _CAMEL_WORD_RE.sub(
+        r"\1_\2", val
+    )  # adding underscore between first and second found groups
+    new_val = _SEPARATOR_RE.sub(
+        _replace_separator, new_val
+    )  # replace spaces, collapse n-underscores to 1 and remove leading underscores
+    new_val = _DOT_OR_CASE_BOUNDARY_RE.sub(
+        "_", new_val
+    )  # replace dots and add underscore before upper case letter if starts from lower case or digit
+    return new_val.lower()
 
 
 def convert_value_to_system_standard(val: str) -> str:
@@ -38,6 +285,10 @@ def convert_value_to_system_standard(val: str) -> str:
         - Removes leading underscores.
         - Converts the entire string to lowercase.
 
+        The transformations run as three passes over precompiled patterns and the
+        results are memoized, since the same names are converted for both the model
+        yml and the model sql.
+
         Parameters:
             val (str): The input string to be transformed.
 
@@ -48,44 +299,120 @@ def convert_value_to_system_standard(val: str) -> str:
     if not isinstance(val, str):
         raise ValueError("Input must be a string")
 
-    new_val = re.sub(
-        "(.)([A-Z][a-z]+)", r"\1_\2", val
-    )  # adding underscore between first and second found groups
-    new_val = re.sub(r"\s", "_", new_val)  # replace all spaces
-    new_val = re.sub(r"_+", "_", new_val)  # replace n-underscores to 1 inside the name
-    new_val = re.sub(r"\b_+", "", new_val)  # remove leading underscores
-    new_val = re.sub(r"\.", "_", new_val)  # replace dots to underscores
-    new_val = re.sub(
-        "([a-z0-9])([A-Z])", r"\1_\2", new_val
-    )  # adding underscore before upper case letter if starts from lower case or digit
-    return new_val.lower()
+    return _normalize_column_name(val)
 
 
-def quote_value_with_dot(val: str) -> str:
+class WarehouseDialect:
     """
-    Wraps each part of a dot-separated string in backticks.
+    Builds the column expressions of generated staging models for one warehouse.
 
-    Parameters:
-    val (str): The input string to be processed.
+    The default implementation wraps each part of a dot-separated column path in
+    backticks and is used for platforms without a dialect of their own.
+    """
+    # key of the destination connectionConfiguration holding the source database
+    database_config_key = "database"
+    column_separator = ",\n               "
+    # bumped when the dialect's generated SQL changes, so existing models get regenerated
+    revision = 0
 
-    Returns:
-    str: A string where each part is wrapped in backticks and separated by dots.
+    def column_expression(self, path: str) -> str:
+        return '.'.join(f"`{part}`" for part in path.split('.'))
+
+    def column_alias(self, name: str) -> str:
+        return f"`{name}`"
+
+    def select_list(self, columns: list[str]) -> str:
+        """
+        Returns the select list of a whole stream: one "<expression> as <alias>" per column.
+        """
+        return self.column_separator.join(
+            f"{self.column_expression(c)} as {self.column_alias(convert_value_to_system_standard(c))}"
+            for c in columns
+        )
+
+
+class BigQueryDialect(WarehouseDialect):
+    database_config_key = "project_id"
+
+
+class SnowflakeDialect(WarehouseDialect):
+    def column_expression(self, path: str) -> str:
+        return path.replace('.', ':')
+
+    def column_alias(self, name: str) -> str:
+        return name
+
+
+class RedshiftDialect(WarehouseDialect):
+    def column_expression(self, path: str) -> str:
+        if '.' not in path:
+            return path
+        json_column, json_key = path.split('.', 1)
+        return f"json_extract_path_text(json_serialize({json_column}), '{json_key}')"
+
+    def column_alias(self, name: str) -> str:
+        return name
+
+
+class FabricDialect(WarehouseDialect):
     """
-    if not isinstance(val, str):
-        raise ValueError("Input must be a string")
-    r = None
-    if DATA_WAREHOUSE_PLATFORM == 'snowflake':
-        r = ':'.join(f"{part}" for part in val.split('.'))
-    elif DATA_WAREHOUSE_PLATFORM == 'redshift':
-        if '.' in val:
-            json_column, json_key = val.split('.',1)
-            r = f"json_extract_path_text(json_serialize({json_column}), '{json_key}')"
-        else:
-            r = val
-    else:
-        r = '.'.join(f"`{part}`" for part in val.split('.'))
+    T-SQL: [bracketed] identifiers; nested objects are JSON text columns read with JSON_VALUE.
+    """
+    revision = 1
+
+    @staticmethod
+    def quote(name: str) -> str:
+        return "[" + name.replace("]", "]]") + "]"
+
+    def column_expression(self, path: str) -> str:
+        if '.' not in path:
+            return self.quote(path)
+        json_column, *json_keys = path.split('.')
+        json_path = '$' + ''.join('."' + key.replace('"', '\\"') + '"' for key in json_keys)
+        json_path = json_path.replace("'", "''")
+        return f"JSON_VALUE({self.quote(json_column)}, '{json_path}')"
+
+    def column_alias(self, name: str) -> str:
+        return self.quote(name)
+
+
+class PostgresDialect(WarehouseDialect):
+    """
+    "Double-quoted" identifiers; nested objects are jsonb columns read with -> and ->>.
+    """
+    revision = 1
+
+    @staticmethod
+    def quote(name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    def column_expression(self, path: str) -> str:
+        json_column, *json_keys = path.split('.')
+        expression = self.quote(json_column)
+        for i, key in enumerate(json_keys):
+            # -> keeps jsonb for the next step, ->> returns the last key as text
+            operator = '->>' if i == len(json_keys) - 1 else '->'
+            expression += f"{operator}'" + key.replace("'", "''") + "'"
+        return expression
 
-    return r
+    def column_alias(self, name: str) -> str:
+        return self.quote(name)
+
+
+DIALECTS = {
+    "bigquery": BigQueryDialect,
+    "snowflake": SnowflakeDialect,
+    "redshift": RedshiftDialect,
+    "fabric": FabricDialect,
+    "postgres": PostgresDialect,
+}
+
+
+def get_dialect(platform) -> WarehouseDialect:
+    """Returns the dialect for a DATA_WAREHOUSE_PLATFORM value; empty means bigquery."""
+    if not platform:
+        return BigQueryDialect()
+    return DIALECTS.get(platform, WarehouseDialect)()
 
 
 def type_convert(col, col_type):
@@ -141,32 +468,24 @@ def create_model(source_name: str, source_table_name: str, t_name: str, columns:
     if not isinstance(source_name, str) or not isinstance(t_name, str) or not isinstance(columns, list):
         raise ValueError("Invalid input types. Expected str for source_name and table_name, and list[str] for columns.")
 
-    template_path = "airbyte_model_template.sql"
-
-    if not os.path.exists(template_path):
-        raise FileNotFoundError(f"Template file '{template_path}' not found.")
+    file_data = read_model_template("airbyte_model_template.sql")
 
-    with open(template_path, mode="r", encoding="utf-8") as template_file:
-        file_data = template_file.read()
-
-    if DATA_WAREHOUSE_PLATFORM == 'snowflake':
-        formatted_columns = ',\n               '.join(
-            f"{quote_value_with_dot(c)} as {convert_value_to_system_standard(c)}" for c in columns)
-    elif DATA_WAREHOUSE_PLATFORM == 'redshift':
-        formatted_columns = ',\n               '.join(
-            f"{quote_value_with_dot(c)} as {convert_value_to_system_standard(c)}" for c in columns)
-    else:
-        formatted_columns = ',\n               '.join(
-            f"{quote_value_with_dot(c)} as `{convert_value_to_system_standard(c)}`" for c in columns)
+    formatted_columns = DIALECT.select_list(columns)
 
     file_data = file_data.replace("fields", formatted_columns)
     file_data = file_data.replace("source_name", source_name)
     file_data = file_data.replace("source_table_name", source_table_name)
 
-    output_path = f"models/staging/{source_name}/{t_name}.sql"
+    OUTPUT.add(f"models/staging/{source_name}/{t_name}.sql", file_data)
+
 
-    with open(output_path, mode="w", encoding="utf-8") as output_file:
-        output_file.write(file_data)
+@lru_cache(maxsize=None)
+def read_model_template(template_path):
+    if not os.path.exists(template_path):
+        raise FileNotFoundError(f"Template file '{template_path}' not found.")
+
+    with open(template_path, mode="r", encoding="utf-8") as template_file:
+        return template_file.read()
 
 
 def add_source_column(col, col_name, col_type, col_desc=""):
@@ -192,48 +511,127 @@ def add_model_column(col, col_name, col_type, col_desc=""):
     )
 
 
-def create_source_yml_dict(tb, tb_name, prefix_with_tb_name):
+def flatten_object(path_prefix, schema, desc_default="", max_depth=None, max_columns=None):
+    """
+    Iteratively flattens nested object properties into dot.notation columns, in the
+    same depth-first order the schema defines them.
+    Objects without explicit properties (only additionalProperties, etc.) are
+    treated as string columns to avoid KeyError on 'properties'.
+
+    Parameters:
+        path_prefix (str): Column path of the object, at depth 1 for top-level columns.
+        schema (dict): JSON schema of the object.
+        desc_default (str): Description used when the object itself becomes a column.
+        max_depth (int): Objects at this depth are kept as a single JSON column (None = no limit).
+        max_columns (int): Maximum number of columns the object may expand to (None = no limit).
+
+    Returns:
+        tuple: (columns, collapsed_paths) where columns is a list of (name, type, description),
+        or None if the object expands to more than max_columns columns.
+    """
+    columns = []
+    collapsed_paths = []
+    # (path, object schema or None, column type for non-objects, description, depth)
+    stack = [(path_prefix, schema, None, desc_default, 1)]
+
+    while stack:
+        path, node, col_type, desc, depth = stack.pop()
+
+        # Scalar or array or unknown type – just emit as-is
+        if col_type is not None:
+            columns.append((path, col_type, desc))
+        # If no properties – treat as scalar string
+        elif not isinstance(node, dict) or "properties" not in node:
+            columns.append((path, "string", desc))
+        # Too deep – keep the whole object as one raw JSON column
+        elif max_depth is not None and depth >= max_depth:
+            columns.append((path, "string", desc))
+            collapsed_paths.append(path)
+        else:
+            children = []
+            for prop_name, prop_schema in node["properties"].items():
+                col_name = f"{path}.{prop_name}"
+                col_desc = prop_schema.get("description", "")
+                col_type = prop_schema.get("type")
+
+                if isinstance(col_type, list):
+                    col_type = delete_null_from_list(col_type)
+
+                # Nested object – expand later, other types are emitted as their type name
+                if col_type == "object":
+                    children.append((col_name, prop_schema, None, col_desc, depth + 1))
+                else:
+                    children.append((col_name, None, col_type or "string", col_desc, depth + 1))
+            stack.extend(reversed(children))
+
+        if max_columns is not None and len(columns) > max_columns:
+            return None
+
+    return columns, collapsed_paths
+
+
+def create_source_yml_dict(tb, tb_name, prefix_with_tb_name, limits=None):
+    """
+    Builds the source.yml table and the staging model yml of one stream.
+
+    Parameters:
+        limits (tuple): (max depth, max columns) to flatten with instead of
+            SCHEMA_MAX_DEPTH/SCHEMA_MAX_COLUMNS, e.g. those recorded by read_schema_limits().
+
+    Returns:
+        tuple: (source_yml_dict, model_yml_dict, collapsed_paths) where collapsed_paths lists
+        the columns kept as raw JSON because of the flattening limits.
+    """
     source_columns = []
     model_columns = []
 
     json_schema = tb.get("stream", {}).get("jsonSchema", {})
     properties = json_schema.get("properties", {}) or {}
+    collapsed_paths = []
+    max_depth, max_stream_columns = limits or (SCHEMA_MAX_DEPTH, SCHEMA_MAX_COLUMNS)
+    # Columns the stream may add on top of one per top-level property (None = no limit). Shared
+    # by all objects of the stream, so scalars and earlier objects count towards the limit too.
+    extra_columns = None if max_stream_columns is None else max_stream_columns - len(properties)
+
+    def add_column(col_name, col_type, col_desc=""):
+        add_source_column(source_columns, col_name, col_type, col_desc)
+        add_model_column(model_columns, col_name, col_type, col_desc)
 
-    def handle_object(path_prefix: str, schema: dict, desc_default: str = ""):
+    def handle_object(path_prefix: str, schemas: list, desc_default: str = ""):
         """
-        Recursively flattens nested object properties into dot.notation columns.
-        Objects without explicit properties (only additionalProperties, etc.) are
-        treated as string columns to avoid KeyError on 'properties'.
+        Flattens the object (or all anyOf object branches) under one top-level column.
+        Falls back to a single raw JSON column when that would push the stream over its
+        column limit.
         """
-        # If no properties – treat as scalar string
-        if not isinstance(schema, dict) or "properties" not in schema:
-            add_source_column(source_columns, path_prefix, "string", desc_default)
-            add_model_column(model_columns, path_prefix, "string", desc_default)
-            return
-
-        for prop_name, prop_schema in schema["properties"].items():
-            col_name = f"{path_prefix}.{prop_name}"
-            col_desc = prop_schema.get("description", "")
-            col_type = prop_schema.get("type")
-
-            if isinstance(col_type, list):
-                col_type = delete_null_from_list(col_type)
-
-            # Nested object – recurse
-            if col_type == "object":
-                handle_object(col_name, prop_schema, col_desc)
-            else:
-                # Scalar or array or unknown type – just emit as-is
-                add_source_column(source_columns, col_name, col_type or "string", col_desc)
-                add_model_column(model_columns, col_name, col_type or "string", col_desc)
+        nonlocal extra_columns
+        # The object's own column plus whatever the stream has left
+        max_columns = None if extra_columns is None else extra_columns + 1
+        columns = []
+        branch_collapsed_paths = []
+        for schema in schemas:
+            flattened = flatten_object(
+                path_prefix, schema, desc_default, max_depth,
+                None if max_columns is None else max_columns - len(columns)
+            )
+            if flattened is None:
+                add_column(path_prefix, "string", desc_default)
+                collapsed_paths.append(path_prefix)
+                return
+            columns.extend(flattened[0])
+            branch_collapsed_paths.extend(flattened[1])
+
+        for col_name, col_type, col_desc in columns:
+            add_column(col_name, col_type, col_desc)
+        collapsed_paths.extend(branch_collapsed_paths)
+        if extra_columns is not None:
+            extra_columns -= len(columns) - 1
 
     for col, col_schema in properties.items():
         # 1) airbyte_type takes precedence when present (numeric/timestamp/etc.)
         if col_schema.get("airbyte_type"):
             col_type = col_schema.get("airbyte_type")
             col_desc = col_schema.get("description", "")
-            add_source_column(source_columns, col, col_type, col_desc)
-            add_model_column(model_columns, col, col_type, col_desc)
+            add_column(col, col_type, col_desc)
             continue
 
         # 2) anyOf – pick object branches with properties; otherwise fall back to scalar/array
@@ -242,13 +640,11 @@ def create_source_yml_dict(tb, tb_name, prefix_with_tb_name):
                 d for d in col_schema.get("anyOf", []) if isinstance(d, dict) and "properties" in d
             ]
             if object_branches:
-                for branch in object_branches:
-                    # treat each branch as nested object under base column name
-                    handle_object(col, branch, col_schema.get("description", ""))
+                # treat each branch as nested object under base column name
+                handle_object(col, object_branches, col_schema.get("description", ""))
             else:
                 # No object branches – treat as array/union as generic string
-                add_source_column(source_columns, col, "array", col_schema.get("description", ""))
-                add_model_column(model_columns, col, "array", col_schema.get("description", ""))
+                add_column(col, "array", col_schema.get("description", ""))
             continue
 
         # 3) Normal type handling
@@ -258,21 +654,10 @@ def create_source_yml_dict(tb, tb_name, prefix_with_tb_name):
 
         # 3a) Top-level object – flatten its properties
         if col_type == "object":
-            handle_object(col, col_schema, col_schema.get("description", ""))
+            handle_object(col, [col_schema], col_schema.get("description", ""))
         else:
             # 3b) Scalar/array/etc.
-            add_source_column(
-                source_columns,
-                col,
-                col_type,
-                col_schema.get("description", ""),
-            )
-            add_model_column(
-                model_columns,
-                col,
-                col_type,
-                col_schema.get("description", ""),
-            )
+            add_column(col, col_type, col_schema.get("description", ""))
 
     constraints = [
         item
@@ -301,7 +686,7 @@ def create_source_yml_dict(tb, tb_name, prefix_with_tb_name):
                       "description": "",
                       "columns": model_columns
                       }
-    return source_yml_dict, model_yml_dict
+    return source_yml_dict, model_yml_dict, collapsed_paths
 
 
 def group_by_namespace(data):
@@ -321,12 +706,124 @@ def group_by_namespace(data):
     return new_sync_catalog
 
 
+def read_schema_fingerprints(file_path):
+    """
+    Reads the stream fingerprint manifest written by the previous generator run.
+
+    Returns:
+        dict: Mapping of "<dataset>/<model name>" to {"fingerprint": ..., "collapsedPaths": [...]},
+        or an empty dict when the manifest is missing, unreadable or was written in another
+        format or for another model template.
+    """
+    if not os.path.exists(file_path):
+        return {}
+    try:
+        with open(file_path, "r", encoding="utf-8") as manifest_file:
+            manifest = json.load(manifest_file)
+    except (OSError, ValueError) as e:
+        print(f"Ignoring unreadable schema fingerprint file {file_path}: {e}")
+        return {}
+    if manifest.get("format") != SCHEMA_FINGERPRINT_FORMAT or manifest.get("template") != template_fingerprint():
+        return {}
+    return manifest.get("streams", {})
+
+
+def read_schema_limits(file_path):
+    """
+    Reads the flattening limits the generator last ran with from its manifest.
+
+    Returns:
+        tuple: (max depth, max columns), or None when the manifest is missing, unreadable
+        or doesn't record them.
+    """
+    try:
+        with open(file_path, "r", encoding="utf-8") as manifest_file:
+            limits = json.load(manifest_file).get("limits")
+    except (OSError, ValueError, AttributeError):
+        return None
+    if not isinstance(limits, dict):
+        return None
+    return limits.get("maxDepth"), limits.get("maxColumns")
+
+
+def write_schema_fingerprints(file_path, streams):
+    manifest = {
+        "format": SCHEMA_FINGERPRINT_FORMAT,
+        "template": template_fingerprint(),
+        "limits": {"maxDepth": SCHEMA_MAX_DEPTH, "maxColumns": SCHEMA_MAX_COLUMNS},
+        "streams": dict(sorted(streams.items())),
+    }
+    OUTPUT.add(file_path, json.dumps(manifest, indent=2) + "\n")
+
+
+@lru_cache(maxsize=1)
+def template_fingerprint():
+    with open("airbyte_model_template.sql", "rb") as template_file:
+        return hashlib.sha256(template_file.read()).hexdigest()
+
+
+def stream_fingerprint(tb):
+    """
+    Hashes everything the generated files of a stream depend on: its jsonSchema,
+    primaryKey, the warehouse platform and its dialect revision, and the flattening limits.
+    """
+    payload = {
+        "jsonSchema": tb.get("stream", {}).get("jsonSchema", {}),
+        "primaryKey": tb.get("config", {}).get("primaryKey"),
+        "platform": DATA_WAREHOUSE_PLATFORM,
+        "maxDepth": SCHEMA_MAX_DEPTH,
+        "maxColumns": SCHEMA_MAX_COLUMNS,
+        "dialectRevision": DIALECT.revision if DIALECT else 0,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def read_source_tables(file_path):
+    """
+    Indexes the tables of an existing source.yml by (source name, table name) so
+    unchanged streams can be reused without regenerating them.
+    """
+    if not os.path.exists(file_path):
+        return None, {}
+    # libyaml's loader parses a large source.yml an order of magnitude faster than the pure Python one
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(file_path, "r") as yaml_file:
+        source_yml = yaml.load(yaml_file, Loader=loader) or {}
+    tables = {}
+    for source in source_yml.get("sources", []) or []:
+        for table in source.get("tables", []) or []:
+            tables[(source.get("name"), table.get("name"))] = table
+    return source_yml, tables
+
+
+def stream_files(stream_key):
+    return [f"models/staging/{stream_key}.yml", f"models/staging/{stream_key}.sql"]
+
+
+def delete_stream_files(stream_key):
+    # Deleted when the output is written; an emptied dataset folder goes with them
+    for file_path in stream_files(stream_key):
+        OUTPUT.remove(file_path)
+
+
 # ------------------- init part -----------------------------
-airflow_variables_list = os.environ.get("AIRFLOW_VARIABLES_FILE_NAME")
-airflow_var = read_airflow_var_yml(airflow_variables_list)
-connection_ids = list(airflow_var.values())[0].get("AIRBYTE_CONNECTION_ID")
+def main():
+    global DATA_WAREHOUSE_PLATFORM, DIALECT, OUTPUT
+    if SCHEMA_OUTPUT not in ("files", "tar", "git-tree"):
+        raise ValueError(f"Unknown AIRBYTE_SCHEMA_OUTPUT {SCHEMA_OUTPUT!r}; expected files, tar or git-tree")
+    if SCHEMA_OUTPUT == "tar" and not SCHEMA_OUTPUT_PATH:
+        raise ValueError("AIRBYTE_SCHEMA_OUTPUT=tar requires AIRBYTE_SCHEMA_OUTPUT_PATH")
+    DATA_WAREHOUSE_PLATFORM = sys.argv[1]
+    DIALECT = get_dialect(DATA_WAREHOUSE_PLATFORM)
+    OUTPUT = OutputSink()
+
+    airflow_variables_list = os.environ.get("AIRFLOW_VARIABLES_FILE_NAME")
+    airflow_var = read_airflow_var_yml(airflow_variables_list)
+    connection_ids = list(airflow_var.values())[0].get("AIRBYTE_CONNECTION_ID")
+
+    if not connection_ids or connection_ids == "None":
+        return
 
-if connection_ids and connection_ids != "None":
     workspace_id = list(airflow_var.values())[0].get("AIRBYTE_WORKSPACE_ID")
 
     # read data from API
@@ -338,7 +835,13 @@ if connection_ids and connection_ids != "None":
     api_request_json = read_api_connection_list(url_connections, workspace_id)
     destination_info = read_api_connection_list(url_destination, workspace_id)
 
-    # create yml schema files
+    # create yml schema files; streams whose fingerprint didn't change since the last run are reused as-is
+    previous_fingerprints = read_schema_fingerprints(SCHEMA_FINGERPRINT_FILE)
+    existing_source_yml, existing_source_tables = read_source_tables("models/source.yml")
+    fingerprints = {}
+    # Streams whose schema hit one of the flattening limits: {stream name: [collapsed column paths]}
+    truncated_streams = {}
+    generated_streams = 0
     source_array = []
     dataset = ""
     database = ""
@@ -350,10 +853,7 @@ if connection_ids and connection_ids != "None":
 
                 for i in api_request_json["connections"]:
                     if i.get("destinationId") == destination_id and i.get("connectionId") == connection_id:
-                        if DATA_WAREHOUSE_PLATFORM in ['bigquery', '', None]:
-                            database = dest["connectionConfiguration"]["project_id"]
-                        else:
-                            database = dest["connectionConfiguration"]["database"]
+                        database = dest["connectionConfiguration"][DIALECT.database_config_key]
                         g = group_by_namespace(i)
 
                         for s in g["syncCatalog"]:
@@ -368,9 +868,32 @@ if connection_ids and connection_ids != "None":
 
                                 prefix_with_name = i.get("prefix") + k["stream"]["name"]
                                 table_name = 'stg_' + prefix_with_name
+                                stream_key = f"{dataset}/{table_name}"
+                                fingerprint = stream_fingerprint(k)
+                                previous = previous_fingerprints.get(stream_key) or {}
+
+                                existing_source_table = existing_source_tables.get((dataset, prefix_with_name))
+                                if (
+                                    previous.get("fingerprint") == fingerprint
+                                    and existing_source_table is not None
+                                    and all(os.path.exists(path) for path in stream_files(stream_key))
+                                ):
+                                    fingerprints[stream_key] = previous
+                                    if previous.get("collapsedPaths"):
+                                        truncated_streams[prefix_with_name] = previous["collapsedPaths"]
+                                    sources.append(existing_source_table)
+                                    for path in stream_files(stream_key):
+                                        OUTPUT.keep(path)
+                                    continue
+
                                 col_list = []
-                                source_dict, model_dict = create_source_yml_dict(k, table_name, prefix_with_name)
+                                source_dict, model_dict, collapsed_paths = create_source_yml_dict(
+                                    k, table_name, prefix_with_name
+                                )
+                                fingerprints[stream_key] = {"fingerprint": fingerprint, "collapsedPaths": collapsed_paths}
                                 sources.append(source_dict)
+                                if collapsed_paths:
+                                    truncated_streams[prefix_with_name] = collapsed_paths
 
                                 for col in model_dict['columns']:
                                     col_name = col.pop('identifier', None)
@@ -381,12 +904,51 @@ if connection_ids and connection_ids != "None":
                                     "models": [model_dict]}
                                 create_yml_file(model, f"models/staging/{dataset}", table_name)
                                 create_model(dataset, prefix_with_name, table_name, col_list)
+                                generated_streams += 1
                             source = {"name": dataset,
                                       "database": database,
                                       'tables': sources}
                             source_array.append(source)
 
+    # Without a usable manifest the streams of the previous run are still known from source.yml
+    previous_streams = set(previous_fingerprints) | {
+        f"{source_name}/stg_{table_name}" for source_name, table_name in existing_source_tables
+    }
+    removed_streams = sorted(previous_streams - set(fingerprints))
+    for stream_key in removed_streams:
+        delete_stream_files(stream_key)
+
     result = {
         "version": 2,
         "sources": source_array}
-    create_yml_file(result, "models", "source")
+    if result != existing_source_yml:
+        create_yml_file(result, "models", "source")
+    else:
+        OUTPUT.keep("models/source.yml")
+    write_schema_fingerprints(SCHEMA_FINGERPRINT_FILE, fingerprints)
+
+    if SCHEMA_OUTPUT == "tar":
+        with open(SCHEMA_OUTPUT_PATH, "wb") as tar_file:
+            archived_files = OUTPUT.write_tar(tar_file)
+        output_summary = f"archived {archived_files} files in {SCHEMA_OUTPUT_PATH}"
+    elif SCHEMA_OUTPUT == "git-tree":
+        tree_id = OUTPUT.write_git_tree(SCHEMA_OUTPUT_PATH or ".git")
+        output_summary = f"stored the files as git tree {tree_id}"
+    else:
+        written_files, unchanged_files, written_bytes = OUTPUT.write_files(workers=SCHEMA_WRITE_WORKERS)
+        output_summary = f"wrote {written_files} files ({written_bytes} bytes), {unchanged_files} unchanged"
+    print(
+        f"Generated {generated_streams} of {len(fingerprints)} streams, "
+        f"reused {len(fingerprints) - generated_streams}, removed {len(removed_streams)}; {output_summary}"
+    )
+    if truncated_streams:
+        print(
+            f"Truncated {len(truncated_streams)} streams "
+            f"(max depth {SCHEMA_MAX_DEPTH}, max columns {SCHEMA_MAX_COLUMNS}), kept as raw JSON columns:"
+        )
+        for stream_name, paths in truncated_streams.items():
+            print(f"  {stream_name}: {', '.join(paths)}")
+
+
+if __name__ == "__main__":
+    main()
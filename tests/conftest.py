@@ -0,0 +1,89 @@
+import ast
+import importlib.util
+import os
+import subprocess
+import sys
+import types
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# The API modules import each other as top-level modules, the way gunicorn runs them from app/
+sys.path.insert(0, os.path.join(ROOT, 'app'))
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+# config.Config reads these when it is imported
+for name, value in {
+    'DEBUG': '', 'API_KEY': 'test-key', 'CUSTOMER': 'acme', 'DOMAIN': 'example.com', 'DBT_INIT_API_LINK': 'x',
+    'DATA_MODEL_REPO_URL': 'x', 'GROUP_ACCESS_TOKEN': 'x', 'MINIO_BUCKET_NAME': 'x', 'MINIO_ENDPOINT': 'localhost:9000',
+    'MINIO_ACCESS_KEY': 'x', 'MINIO_SECRET_KEY': 'x', 'DATA_ORCHESTRATOR_BASE_URL': 'x',
+    'DATA_ORCHESTRATOR_BASE_USER': 'x', 'DATA_ORCHESTRATOR_BASE_USER_PASSWORD': 'x',
+    'DATA_ORCHESTRATOR_REPO_URL': 'x', 'DC_DQ_ENDPOINT_URL': 'x', 'DC_DQ_BEARER_TOKEN': 'x',
+}.items():
+    os.environ.setdefault(name, value)
+
+from airbyte_standin import AirbyteStandin, synthetic_fixture  # noqa: E402
+from bench_create_yml_schema import prepare_project  # noqa: E402
+
+
+def load_definitions(path: str, names) -> types.ModuleType:
+    """
+    Module holding only the imports, the precompiled patterns (_*_RE) and the named functions of the
+    script at path, for scripts that do their work at import time (init_setup_files_v1)
+    """
+    with open(path) as f:
+        tree = ast.parse(f.read(), path)
+    body = []
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            body.append(node)
+        elif isinstance(node, ast.Assign) and all(
+            isinstance(target, ast.Name) and target.id.startswith('_') and target.id.endswith('_RE')
+            for target in node.targets
+        ):
+            body.append(node)
+        elif isinstance(node, ast.FunctionDef) and node.name in names:
+            body.append(node)
+    module = types.ModuleType(os.path.basename(path)[:-3])
+    module.__file__ = path
+    exec(compile(ast.Module(body=body, type_ignores=[]), path, 'exec'), module.__dict__)
+    return module
+
+
+def load_module(path: str, name: str) -> types.ModuleType:
+    """Import the file at path as a module named name, without putting its directory on sys.path"""
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def catalog():
+    """Airbyte stand-in serving one connection with three nested streams: (fixture, host:port)"""
+    fixture = synthetic_fixture(connections=1, streams=3, columns=6, depth=2, anyof_branches=1, namespaces=1, seed=7)
+    server = AirbyteStandin(fixture).serve()
+    yield fixture, f'127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+@pytest.fixture
+def project(tmp_path, catalog):
+    """v2 project directory for the catalog's connections, not generated yet"""
+    fixture, _ = catalog
+    prepare_project(str(tmp_path), '2', [c['connectionId'] for c in fixture['connections']])
+    return tmp_path
+
+
+def generate(project, airbyte_url, **env):
+    """Run the v2 generator copied into project against airbyte_url and return its output"""
+    env = dict(
+        os.environ, AIRFLOW_VARIABLES_FILE_NAME='dbt_airflow_variables.yml', AIRBYTE_LOCAL_K8S_SVC_URL=airbyte_url, **env
+    )
+    result = subprocess.run(
+        [sys.executable, 'create_yml_schema.py', 'bigquery'], cwd=project, env=env, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    return result.stdout
@@ -0,0 +1,77 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import airbyte
+import airbyte_client
+from airbyte_client import AirbyteAPIError, AsyncAirbyteClient
+
+RESPONSES = {
+    '/api/v1/connections/get': (200, b'<html>Bad gateway</html>'),
+    '/api/v1/destinations/get': (200, b'["not", "an", "object"]'),
+    '/api/v1/destination_definitions/get': (200, json.dumps({'dockerImageTag': '2.0.1'}).encode()),
+}
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        if self.path == '/api/v1/slow':
+            time.sleep(1)
+        if self.path == '/api/v1/truncated':
+            self.send_response(200)
+            self.send_header('Content-Length', '100')
+            self.end_headers()
+            self.wfile.write(b'{"connectionId":')
+            self.close_connection = True
+            return
+        status, body = RESPONSES.get(self.path, (200, b'{}'))
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def server_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f'127.0.0.1:{server.server_port}'
+    server.shutdown()
+
+
+def post(server_url, endpoint):
+    async def call():
+        async with AsyncAirbyteClient(server_url, max_retries=1, backoff_seconds=0) as client:
+            return await client.post(endpoint, {})
+    return asyncio.run(call())
+
+
+@pytest.mark.parametrize('endpoint, message', [
+    ('connections/get', 'Invalid JSON'),
+    ('destinations/get', 'Expected a JSON object'),
+    ('truncated', 'ClientPayloadError'),
+])
+def test_bad_responses_raise_api_errors(server_url, endpoint, message):
+    with pytest.raises(AirbyteAPIError, match=message):
+        post(server_url, endpoint)
+
+
+def test_run_sync_gives_up_after_the_call_timeout(server_url, monkeypatch):
+    monkeypatch.setattr(airbyte_client, 'AIRBYTE_CLIENT_CALL_TIMEOUT', 0.2)
+    started = time.monotonic()
+    with pytest.raises(AirbyteAPIError, match='No result within 0.2s'):
+        airbyte_client.run_sync(lambda client: client.post('slow', {}), server_url)
+    assert time.monotonic() - started < 1
+
+
+def test_destination_version_lookup_failures_return_none(server_url, monkeypatch):
+    monkeypatch.setenv('AIRBYTE_LOCAL_K8S_SVC_URL', server_url)
+    assert airbyte.get_airbyte_destination_version('connection-with-bad-response') is None
@@ -0,0 +1,66 @@
+import glob
+import os
+import shutil
+
+import pytest
+
+import airbyte
+from conftest import ROOT, generate
+
+
+@pytest.fixture(autouse=True)
+def schema_generator(monkeypatch):
+    monkeypatch.setattr(airbyte, 'SCHEMA_GENERATOR_PATH', os.path.join(ROOT, 'init_setup_files_v2', 'create_yml_schema.py'))
+    airbyte.load_schema_generator.cache_clear()
+    yield
+    airbyte.load_schema_generator.cache_clear()
+
+
+@pytest.fixture
+def drift(project, catalog, monkeypatch):
+    fixture, airbyte_url = catalog
+    monkeypatch.setenv('AIRBYTE_LOCAL_K8S_SVC_URL', airbyte_url)
+    return lambda: airbyte.get_airbyte_catalog_drift(str(project), [c['connectionId'] for c in fixture['connections']])
+
+
+def test_generated_project_is_in_sync(project, catalog, drift):
+    generate(project, catalog[1])
+    assert drift()['in_sync']
+
+
+def test_drift_uses_the_limits_the_project_was_generated_with(project, catalog, drift):
+    generate(project, catalog[1], AIRBYTE_SCHEMA_MAX_COLUMNS='2', AIRBYTE_SCHEMA_MAX_DEPTH='2')
+    assert drift()['in_sync']
+
+
+def test_moved_models_are_found_with_one_tree_walk(project, catalog, drift, monkeypatch):
+    generate(project, catalog[1])
+    marts = project / 'models' / 'marts'
+    marts.mkdir()
+    for model_yml in sorted((project / 'models' / 'staging').rglob('stg_*.yml'))[:2]:
+        shutil.move(str(model_yml), str(marts / model_yml.name))
+
+    walks = []
+    walk = glob.glob
+    monkeypatch.setattr(airbyte.glob, 'glob', lambda *args, **kwargs: walks.append(args) or walk(*args, **kwargs))
+    assert drift()['in_sync']
+    assert len(walks) == 1
+
+
+def test_catalog_changes_are_reported(project, catalog, drift):
+    fixture, airbyte_url = catalog
+    generate(project, airbyte_url)
+    stream = fixture['connections'][0]['syncCatalog']['streams'][0]
+    stream['stream']['jsonSchema']['properties']['brand_new'] = {'type': 'string'}
+
+    result = drift()
+    assert not result['in_sync']
+    [(key, changes)] = result['changed_streams'].items()
+    assert key.endswith(stream['stream']['name'])
+    assert changes['added_columns'] == ['brand_new']
+    assert list(result['changed_models']) == [key]
+
+
+def test_unreachable_airbyte(project, monkeypatch):
+    monkeypatch.setenv('AIRBYTE_LOCAL_K8S_SVC_URL', '127.0.0.1:9')
+    assert airbyte.get_airbyte_catalog_drift(str(project), ['c1']) is None
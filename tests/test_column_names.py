@@ -0,0 +1,58 @@
+import json
+import os
+import random
+import re
+
+import pytest
+
+from conftest import DATA_DIR, ROOT, load_definitions, load_module
+
+v1 = load_definitions(
+    os.path.join(ROOT, 'init_setup_files_v1', 'create_yml_schema.py'),
+    {'_replace_separator', 'convert_value_to_system_standart'},
+)
+v2 = load_module(os.path.join(ROOT, 'init_setup_files_v2', 'create_yml_schema.py'), 'create_yml_schema_v2')
+
+NORMALIZERS = {
+    'v1': v1.convert_value_to_system_standart,
+    'v2': v2.convert_value_to_system_standard,
+}
+
+with open(os.path.join(DATA_DIR, 'column_names.json'), encoding='utf-8') as f:
+    GOLDEN = json.load(f)
+
+
+def six_pass_normalizer(val):
+    """The normalizer before it was merged into three precompiled passes, kept as the reference"""
+    new_val = re.sub("(.)([A-Z][a-z]+)", r"\1_\2", val)
+    new_val = re.sub(r"\s", "_", new_val)
+    new_val = re.sub(r"_+", "_", new_val)
+    new_val = re.sub(r"\b_+", "", new_val)
+    new_val = re.sub(r"\.", "_", new_val)
+    new_val = re.sub("([a-z0-9])([A-Z])", r"\1_\2", new_val)
+    return new_val.lower()
+
+
+@pytest.mark.parametrize('version', sorted(NORMALIZERS))
+@pytest.mark.parametrize('name', sorted(GOLDEN))
+def test_golden_corpus(version, name):
+    assert NORMALIZERS[version](name) == GOLDEN[name]
+
+
+def test_golden_corpus_matches_reference():
+    assert {name: six_pass_normalizer(name) for name in GOLDEN} == GOLDEN
+
+
+@pytest.mark.parametrize('version', sorted(NORMALIZERS))
+def test_random_names_match_reference(version):
+    normalize = NORMALIZERS[version]
+    alphabet = 'aAbBzZ09 _.\t-$éÉ\n'
+    rnd = random.Random(0)
+    for _ in range(20000):
+        name = ''.join(rnd.choice(alphabet) for _ in range(rnd.randint(0, 12)))
+        assert normalize(name) == six_pass_normalizer(name), repr(name)
+
+
+def test_v2_rejects_non_strings():
+    with pytest.raises(ValueError):
+        v2.convert_value_to_system_standard(None)
@@ -0,0 +1,44 @@
+import os
+
+import pytest
+
+from conftest import ROOT, load_module
+
+generator = load_module(os.path.join(ROOT, 'init_setup_files_v2', 'create_yml_schema.py'), 'create_yml_schema_v2')
+
+COLUMNS = ['id', 'userName', 'address.city', 'a.b.c']
+
+
+@pytest.mark.parametrize('platform, expected', [
+    ('bigquery', ['`id` as `id`', '`userName` as `user_name`', '`address`.`city` as `address_city`',
+                  '`a`.`b`.`c` as `a_b_c`']),
+    ('snowflake', ['id as id', 'userName as user_name', 'address:city as address_city', 'a:b:c as a_b_c']),
+    ('redshift', ['id as id', 'userName as user_name',
+                  "json_extract_path_text(json_serialize(address), 'city') as address_city",
+                  "json_extract_path_text(json_serialize(a), 'b.c') as a_b_c"]),
+    ('fabric', ['[id] as [id]', '[userName] as [user_name]',
+                """JSON_VALUE([address], '$."city"') as [address_city]""",
+                """JSON_VALUE([a], '$."b"."c"') as [a_b_c]"""]),
+    ('postgres', ['"id" as "id"', '"userName" as "user_name"', '"address"->>\'city\' as "address_city"',
+                  '"a"->\'b\'->>\'c\' as "a_b_c"']),
+])
+def test_select_list(platform, expected):
+    dialect = generator.get_dialect(platform)
+    assert dialect.select_list(COLUMNS) == dialect.column_separator.join(expected)
+
+
+def test_fabric_escapes_identifiers_and_json_paths():
+    dialect = generator.FabricDialect()
+    assert dialect.column_alias('a]b') == '[a]]b]'
+    assert dialect.column_expression("o.it's") == """JSON_VALUE([o], '$."it''s"')"""
+    assert dialect.column_expression('o.say "hi"') == r"""JSON_VALUE([o], '$."say \"hi\""')"""
+
+
+def test_postgres_escapes_identifiers_and_keys():
+    dialect = generator.PostgresDialect()
+    assert dialect.column_alias('a"b') == '"a""b"'
+    assert dialect.column_expression("o.it's") == '"o"->>\'it\'\'s\''
+
+
+def test_unknown_platform_uses_backticks():
+    assert generator.get_dialect('duckdb').column_alias('x') == '`x`'
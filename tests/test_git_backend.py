@@ -0,0 +1,235 @@
+import os
+import subprocess
+from datetime import datetime
+
+import git
+import pytest
+
+import git_backend
+from git_backend import create_git_backend
+
+BACKENDS = ['cli', 'pygit2']
+
+
+def run_git(cwd, *args, date=None):
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME='t', GIT_AUTHOR_EMAIL='t@t', GIT_COMMITTER_NAME='t', GIT_COMMITTER_EMAIL='t@t',
+        GIT_CONFIG_NOSYSTEM='1', HOME=str(cwd),
+    )
+    if date:
+        env.update(GIT_AUTHOR_DATE=date, GIT_COMMITTER_DATE=date)
+    return subprocess.run(['git', *args], cwd=cwd, env=env, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def write(root, path, content, mode=0o644):
+    full_path = os.path.join(root, path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+    with open(full_path, 'w') as f:
+        f.write(content)
+    os.chmod(full_path, mode)
+
+
+@pytest.fixture(scope='module')
+def history(tmp_path_factory):
+    """
+    main:    c1 - c2 - c3 - merge
+                   \\         /
+    feature:        c3f -----
+    """
+    root = str(tmp_path_factory.mktemp('repo'))
+    run_git(root, 'init', '-q', '-b', 'main')
+    run_git(root, 'config', 'uploadpack.allowfilter', 'true')
+    run_git(root, 'remote', 'add', 'origin', 'https://example.com/data-models.git')
+
+    write(root, 'proj/dbt_project.yml', 'name: proj\n')
+    write(root, 'proj/models/a.sql', 'select 1\n')
+    write(root, 'run.sh', '#!/bin/sh\n', 0o755)
+    write(root, 'ü x/ä b.sql', 'u\n')
+    os.symlink('proj', os.path.join(root, 'link'))
+    run_git(root, 'add', '-A')
+    run_git(root, 'commit', '-q', '-m', 'c1', date='2024-01-01T10:00:00+02:00')
+
+    write(root, 'proj/models/a.sql', 'select 2\n')
+    write(root, 'proj/models/b.sql', 'select b\n')
+    os.remove(os.path.join(root, 'run.sh'))
+    run_git(root, 'add', '-A')
+    run_git(root, 'commit', '-q', '-m', 'c2', date='2024-01-02T09:00:00-05:00')
+
+    run_git(root, 'checkout', '-q', '-b', 'feature')
+    write(root, 'proj/models/b.sql', 'select b2\n')
+    run_git(root, 'commit', '-q', '-am', 'c3f', date='2024-01-03T08:00:00+00:00')
+
+    run_git(root, 'checkout', '-q', 'main')
+    run_git(root, 'mv', 'ü x/ä b.sql', 'ü x/c.sql')
+    run_git(root, 'commit', '-q', '-m', 'c3', date='2024-01-04T08:00:00+00:00')
+    run_git(root, 'merge', '-q', '--no-ff', '-m', 'merge', 'feature', date='2024-01-05T08:00:00+00:00')
+
+    run_git(root, 'update-ref', 'refs/remotes/origin/main', 'HEAD')
+    run_git(root, 'symbolic-ref', 'refs/remotes/origin/HEAD', 'refs/remotes/origin/main')
+    commits = {
+        subject: sha for sha, subject in
+        (line.split(' ', 1) for line in run_git(root, 'log', '--all', '--format=%H %s').splitlines())
+    }
+    return root, commits
+
+
+@pytest.fixture(params=BACKENDS)
+def backend_name(request):
+    if request.param == 'pygit2':
+        pytest.importorskip('pygit2')
+    return request.param
+
+
+@pytest.fixture
+def backend(history, backend_name):
+    return create_git_backend(git.Repo(history[0]), backend_name)
+
+
+def test_head(backend, history):
+    assert backend.head() == history[1]['merge']
+
+
+def test_head_of_empty_repository(tmp_path, backend_name):
+    run_git(tmp_path, 'init', '-q')
+    assert create_git_backend(git.Repo(tmp_path), backend_name).head() is None
+
+
+@pytest.mark.parametrize('ref', ['HEAD', 'main', 'refs/heads/feature', 'HEAD~1', 'HEAD:proj', 'HEAD^{tree}'])
+def test_resolve(backend, history, ref):
+    assert backend.resolve(ref) == run_git(history[0], 'rev-parse', ref)
+
+
+@pytest.mark.parametrize('ref', ['nope', 'HEAD:nope', 'refs/heads/nope'])
+def test_resolve_missing(backend, ref):
+    assert backend.resolve(ref) is None
+
+
+@pytest.mark.parametrize('ref, expected', [
+    ('HEAD', 'refs/heads/main'),
+    ('refs/remotes/origin/HEAD', 'refs/remotes/origin/main'),
+    ('refs/heads/main', None),
+    ('nope', None),
+])
+def test_symbolic_ref(backend, ref, expected):
+    assert backend.symbolic_ref(ref) == expected
+
+
+@pytest.mark.parametrize('ancestor, descendant, expected', [
+    ('c1', 'merge', True),
+    ('c3f', 'merge', True),
+    ('merge', 'c1', False),
+    ('c3f', 'c3', False),
+    ('c2', 'c2', True),
+])
+def test_is_ancestor(backend, history, ancestor, descendant, expected):
+    commits = history[1]
+    assert backend.is_ancestor(commits[ancestor], commits[descendant]) is expected
+
+
+@pytest.mark.parametrize('revision, path, expected', [
+    ('c1', 'proj/models/a.sql', b'select 1\n'),
+    ('merge', 'proj/models/a.sql', b'select 2\n'),
+    ('merge', 'proj/models/b.sql', b'select b2\n'),
+    ('c1', 'ü x/ä b.sql', b'u\n'),
+    ('c1', 'link', b'proj'),
+    ('c1', 'proj', None),
+    ('c1', 'nope', None),
+    ('merge', 'run.sh', None),
+])
+def test_read_blob(backend, history, revision, path, expected):
+    assert backend.read_blob(history[1][revision], path) == expected
+
+
+def test_list_tree(backend, history):
+    root, commits = history
+
+    def sha(path):
+        return run_git(root, 'rev-parse', f"{commits['c1']}:{path}")
+
+    assert backend.list_tree(commits['c1']) == [
+        ('120000', 'blob', sha('link'), 'link'),
+        ('040000', 'tree', sha('proj'), 'proj'),
+        ('100755', 'blob', sha('run.sh'), 'run.sh'),
+        ('040000', 'tree', sha('ü x'), 'ü x'),
+    ]
+    assert backend.list_tree(commits['c1'], 'proj/models') == [('100644', 'blob', sha('proj/models/a.sql'), 'a.sql')]
+    # A tree sha works as the revision too
+    assert backend.list_tree(sha('proj')) == backend.list_tree(commits['c1'], 'proj')
+
+
+@pytest.mark.parametrize('path', ['nope', 'proj/dbt_project.yml'])
+def test_list_tree_missing(backend, history, path):
+    assert backend.list_tree(history[1]['c1'], path) is None
+
+
+def test_walk_changes(backend, history):
+    commits = history[1]
+    assert list(backend.walk_changes(commits['merge'])) == [
+        (datetime(2024, 1, 5, 8, 0), []),
+        (datetime(2024, 1, 4, 8, 0), [('A', 'ü x/c.sql'), ('D', 'ü x/ä b.sql')]),
+        (datetime(2024, 1, 3, 8, 0), [('M', 'proj/models/b.sql')]),
+        (datetime(2024, 1, 2, 9, 0), [('M', 'proj/models/a.sql'), ('A', 'proj/models/b.sql'), ('D', 'run.sh')]),
+        (datetime(2024, 1, 1, 10, 0), [
+            ('A', 'link'), ('A', 'proj/dbt_project.yml'), ('A', 'proj/models/a.sql'), ('A', 'run.sh'),
+            ('A', 'ü x/ä b.sql'),
+        ]),
+    ]
+
+
+def test_walk_changes_excluding(backend, history):
+    commits = history[1]
+    assert [changes for _, changes in backend.walk_changes(commits['merge'], commits['c3f'])] == [
+        [], [('A', 'ü x/c.sql'), ('D', 'ü x/ä b.sql')],
+    ]
+
+
+def test_remote_url(backend):
+    assert backend.remote_url() == 'https://example.com/data-models.git'
+    assert backend.remote_url('upstream') is None
+
+
+@pytest.fixture
+def partial_clone(history, tmp_path):
+    root, _ = history
+    clone = tmp_path / 'clone'
+    run_git(tmp_path, 'clone', '-q', '--filter=blob:none', f'file://{root}', str(clone))
+    return git.Repo(clone)
+
+
+def test_partial_clone_reads_missing_blobs(partial_clone, history, backend_name, monkeypatch):
+    commits = history[1]
+    backend = create_git_backend(partial_clone, backend_name)
+    # Only the checked out revision's blobs were downloaded
+    missing = run_git(partial_clone.working_dir, 'rev-list', '--objects', '--missing=print', commits['c1'])
+    assert f"?{run_git(history[0], 'rev-parse', commits['c1'] + ':proj/models/a.sql')}" in missing.split()
+
+    fallback_reads = []
+    if backend_name == 'pygit2':
+        read_blob = backend.fallback.read_blob
+
+        def spy(revision, path):
+            fallback_reads.append(path)
+            return read_blob(revision, path)
+        monkeypatch.setattr(backend.fallback, 'read_blob', spy)
+
+    assert backend.read_blob(commits['c1'], 'proj/models/a.sql') == b'select 1\n'
+    assert backend.read_blob(commits['merge'], 'proj/models/a.sql') == b'select 2\n'
+    if backend_name == 'pygit2':
+        # libgit2 can't fetch from the promisor remote; the missing blob came through the CLI
+        assert fallback_reads == ['proj/models/a.sql']
+    assert backend.list_tree(commits['c1'], 'proj/models') == create_git_backend(
+        git.Repo(history[0]), backend_name
+    ).list_tree(commits['c1'], 'proj/models')
+
+
+def test_unknown_backend(history):
+    with pytest.raises(ValueError):
+        create_git_backend(git.Repo(history[0]), 'libgit3')
+
+
+def test_shared_backend_follows_reclone(history):
+    repo = git.Repo(history[0])
+    assert git_backend.get_git_backend(repo) is git_backend.get_git_backend(repo)
+    recloned = git.Repo(history[0])
+    assert git_backend.get_git_backend(recloned).repo is recloned
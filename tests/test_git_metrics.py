@@ -0,0 +1,89 @@
+import json
+import os
+import subprocess
+
+import git
+
+from git_metrics import GitMetrics, InstrumentedGit, InstrumentedRepo
+
+
+def write_snapshot(state_dir, name, log_count, counters):
+    snapshot = {
+        'commands': {'log': {'buckets': [log_count] + [0] * 14, 'sum': 0.001 * log_count, 'count': log_count}},
+        'request_commands': {},
+        'request_seconds': {},
+        'counters': counters,
+    }
+    with open(os.path.join(state_dir, f'git-{name}.json'), 'w') as f:
+        json.dump(snapshot, f)
+
+
+def metric_lines(metrics):
+    return {
+        line for line in metrics.render().splitlines()
+        if line.startswith(('cache_', 'git_command_duration_seconds_count'))
+    }
+
+
+def test_retire_keeps_totals_and_drops_gauges(tmp_path):
+    metrics = GitMetrics(str(tmp_path))
+    write_snapshot(tmp_path, 101, 2, {'cache_hits_total': 5, 'cache_entries': 7})
+    write_snapshot(tmp_path, 102, 1, {'cache_hits_total': 1, 'cache_entries': 3})
+
+    metrics.retire(101)
+    metrics.retire(102)
+    metrics.retire(103)  # exited before writing a snapshot
+
+    assert os.listdir(tmp_path) == ['git-retired.json']
+    assert metric_lines(metrics) == {
+        'cache_hits_total 6',
+        'git_command_duration_seconds_count{command="log"} 3',
+    }
+
+
+def test_clear(tmp_path):
+    metrics = GitMetrics(str(tmp_path))
+    write_snapshot(tmp_path, 101, 1, {})
+    metrics.retire(101)
+    write_snapshot(tmp_path, 102, 1, {})
+    metrics.clear()
+    assert os.listdir(tmp_path) == []
+
+
+def test_only_instrumented_repos_record_commands(tmp_path):
+    subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+    assert type(InstrumentedRepo(tmp_path).git) is InstrumentedGit
+    assert type(git.Repo(tmp_path).git) is git.Git
+
+
+def test_requests_write_snapshots_only_when_due(tmp_path, monkeypatch):
+    from flask import Flask, request
+
+    import git_metrics
+
+    subprocess.run(['git', 'init', '-q', str(tmp_path / 'repo')], check=True)
+    metrics = GitMetrics(str(tmp_path / 'metrics'))
+    monkeypatch.setattr(git_metrics, 'git_command_metrics', metrics)
+    app = Flask(__name__)
+    git_metrics.init_app(app)
+
+    @app.get('/status')
+    def status():
+        InstrumentedRepo(tmp_path / 'repo').git.status()
+        return ''
+
+    # after_request functions run in reverse order; this one sees the environ report_git_stats left
+    environ = {}
+    app.after_request_funcs[None].insert(0, lambda response: environ.update(request.environ) or response)
+    client = app.test_client()
+
+    metrics.flush()
+    snapshot = os.path.join(metrics.state_dir, f'git-{os.getpid()}.json')
+    os.remove(snapshot)
+    client.get('/status')
+    assert environ['git_commands'].startswith('1 status=1/')
+    assert not os.path.exists(snapshot)
+
+    monkeypatch.setattr(git_metrics, 'GIT_METRICS_FLUSH_INTERVAL', 0)
+    client.get('/status')
+    assert os.path.exists(snapshot)
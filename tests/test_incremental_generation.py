@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from conftest import generate
+
+MANIFEST = '.airbyte_schema_fingerprints.json'
+
+
+def staging_models(project):
+    return sorted(path.name for path in (project / 'models' / 'staging').rglob('stg_*.sql'))
+
+
+@pytest.mark.parametrize('manifest', ['kept', 'missing', 'outdated'])
+def test_streams_dropped_from_the_catalog_are_removed(project, catalog, manifest):
+    fixture, airbyte_url = catalog
+    generate(project, airbyte_url)
+    streams = fixture['connections'][0]['syncCatalog']['streams']
+    assert len(staging_models(project)) == len(streams)
+
+    dropped = streams.pop(0)
+    if manifest == 'missing':
+        (project / MANIFEST).unlink()
+    elif manifest == 'outdated':
+        data = json.loads((project / MANIFEST).read_text())
+        (project / MANIFEST).write_text(json.dumps(dict(data, template='previous template')))
+    output = generate(project, airbyte_url)
+
+    assert f"stg_{dropped['stream']['name']}.sql" not in staging_models(project)
+    assert len(staging_models(project)) == len(streams)
+    assert 'removed 1;' in output
+
+
+def test_reused_streams_are_still_reported_as_truncated(project, catalog):
+    _, airbyte_url = catalog
+    first = generate(project, airbyte_url, AIRBYTE_SCHEMA_MAX_COLUMNS='2')
+    second = generate(project, airbyte_url, AIRBYTE_SCHEMA_MAX_COLUMNS='2')
+
+    assert 'Generated 0 of 3 streams, reused 3' in second
+    report = first[first.index('Truncated'):]
+    assert second[second.index('Truncated'):] == report
@@ -0,0 +1,95 @@
+import io
+import os
+import subprocess
+import tarfile
+
+import pytest
+
+from conftest import ROOT, load_module
+
+generator = load_module(os.path.join(ROOT, 'init_setup_files_v2', 'create_yml_schema.py'), 'create_yml_schema_v2')
+
+
+@pytest.fixture
+def project(tmp_path):
+    """A project from a previous run: one stream to keep, one to remove, one to regenerate"""
+    for path, content in {
+        'models/source.yml': 'version: 2\n',
+        'models/staging/ds/stg_kept.yml': 'kept yml\n',
+        'models/staging/ds/stg_kept.sql': 'kept sql\n',
+        'models/staging/old/stg_gone.yml': 'gone yml\n',
+        'models/staging/old/stg_gone.sql': 'gone sql\n',
+        'models/staging/ds/stg_changed.sql': 'old sql\n',
+    }.items():
+        (tmp_path / path).parent.mkdir(parents=True, exist_ok=True)
+        (tmp_path / path).write_text(content)
+
+    sink = generator.OutputSink()
+    for path in generator.stream_files('ds/stg_kept'):
+        sink.keep(path)
+    sink.keep('models/source.yml')
+    for path in generator.stream_files('old/stg_gone'):
+        sink.remove(path)
+    sink.add('models/staging/ds/stg_changed.sql', 'new sql\n')
+    sink.add('models/staging/ds/stg_changed.yml', 'new yml\n')
+    return tmp_path, sink
+
+
+EXPECTED_OUTPUT = {
+    'models/source.yml': b'version: 2\n',
+    'models/staging/ds/stg_kept.yml': b'kept yml\n',
+    'models/staging/ds/stg_kept.sql': b'kept sql\n',
+    'models/staging/ds/stg_changed.sql': b'new sql\n',
+    'models/staging/ds/stg_changed.yml': b'new yml\n',
+}
+
+
+def test_write_files(project):
+    root, sink = project
+    kept_mtime = os.stat(root / 'models/staging/ds/stg_kept.sql').st_mtime_ns
+
+    assert sink.write_files(str(root)) == (2, 0, 16)
+
+    assert not (root / 'models/staging/old').exists()
+    assert (root / 'models/staging/ds/stg_changed.sql').read_text() == 'new sql\n'
+    assert os.stat(root / 'models/staging/ds/stg_kept.sql').st_mtime_ns == kept_mtime
+    files = {str(p.relative_to(root)) for p in root.rglob('*') if p.is_file()}
+    assert files == set(EXPECTED_OUTPUT)
+
+
+def test_write_files_skips_unchanged(project):
+    root, sink = project
+    sink.write_files(str(root))
+    assert sink.write_files(str(root)) == (0, 2, 0)
+
+
+def test_write_tar(project):
+    root, sink = project
+    buffer = io.BytesIO()
+
+    assert sink.write_tar(buffer, root=str(root)) == len(EXPECTED_OUTPUT)
+
+    buffer.seek(0)
+    with tarfile.open(fileobj=buffer) as tar:
+        archived = {member.name: tar.extractfile(member).read() for member in tar.getmembers()}
+    assert archived == EXPECTED_OUTPUT
+    # The project directory is left alone
+    assert (root / 'models/staging/old/stg_gone.sql').exists()
+
+
+def test_write_git_tree(project, tmp_path_factory):
+    root, sink = project
+    git_dir = tmp_path_factory.mktemp('repo') / '.git'
+    subprocess.run(['git', 'init', '-q', '--bare', str(git_dir)], check=True)
+
+    tree_id = sink.write_git_tree(str(git_dir), root=str(root))
+
+    def git(*args):
+        return subprocess.run(
+            ['git', f'--git-dir={git_dir}', *args], check=True, capture_output=True
+        ).stdout
+    listed = git('ls-tree', '-r', '--name-only', tree_id).decode().split()
+    assert sorted(listed) == sorted(EXPECTED_OUTPUT)
+    for path, data in EXPECTED_OUTPUT.items():
+        assert git('cat-file', 'blob', f'{tree_id}:{path}') == data
+    git('fsck', '--strict', '--no-dangling')
@@ -0,0 +1,252 @@
+import hashlib
+import hmac
+import json
+import os
+import subprocess
+import tempfile
+from pathlib import Path
+
+import pytest
+import yaml
+from apiflask import APIBlueprint, APIFlask
+
+import dbt_pr_mgmt_api
+from config import Config
+
+HEADERS = {'X-API-KEY': 'test-key'}
+
+PROJECTS = {
+    'sales_a': {'DAG_OWNER': 'alice', 'OPERATOR': 'k8s'},
+    'sales_b': {'DAG_OWNER': 'bob', 'OPERATOR': 'bash'},
+    'hr': {'DAG_OWNER': 'alice', 'OPERATOR': 'bash'},
+}
+
+
+def run_git(cwd, *args):
+    env = dict(
+        os.environ,
+        GIT_AUTHOR_NAME='t', GIT_AUTHOR_EMAIL='t@t', GIT_COMMITTER_NAME='t', GIT_COMMITTER_EMAIL='t@t',
+        GIT_CONFIG_NOSYSTEM='1', HOME=str(cwd),
+    )
+    return subprocess.run(['git', *args], cwd=cwd, env=env, check=True, capture_output=True, text=True).stdout.strip()
+
+
+@pytest.fixture(scope='module')
+def origin(tmp_path_factory):
+    """Bare data model repository with three projects on main"""
+    work = tmp_path_factory.mktemp('work')
+    run_git(work, 'init', '-q', '-b', 'main')
+    for project, config in PROJECTS.items():
+        (work / project).mkdir()
+        (work / project / 'dbt_project.yml').write_text(f'name: {project}\n')
+        (work / project / 'dbt_airflow_variables.yml').write_text(yaml.safe_dump({project.upper(): config}))
+    run_git(work, 'add', '-A')
+    run_git(work, 'commit', '-q', '-m', 'projects')
+
+    bare = tmp_path_factory.mktemp('origin') / 'data-models.git'
+    run_git(work, 'clone', '-q', '--bare', str(work), str(bare))
+    return bare
+
+
+@pytest.fixture(scope='module')
+def app(origin, tmp_path_factory):
+    patches = pytest.MonkeyPatch()
+    patches.setattr(dbt_pr_mgmt_api, 'MANAGEMENT_BASE_PATH', str(tmp_path_factory.mktemp('management')))
+    patches.setattr(dbt_pr_mgmt_api, 'REPOSITORY_SYNC_INTERVAL', 0)
+    patches.setattr(dbt_pr_mgmt_api, 'DATA_MODEL_CLONE_FILTER', '')
+    patches.setattr(Config, 'DATA_MODEL_REPO_URL', str(origin))
+    patches.setattr(Config, 'API_KEY', 'test-key')
+
+    app = APIFlask(__name__)
+    blueprint = APIBlueprint('api v3 blueprint', __name__, url_prefix='/api/v3')
+    dbt_pr_mgmt_api.setup_routes(blueprint)
+    app.register_blueprint(blueprint)
+    yield app
+    patches.undo()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+def branches(origin):
+    return set(run_git(origin, 'for-each-ref', '--format=%(refname:short)', 'refs/heads').split())
+
+
+def changed_projects(origin, branch):
+    changed = run_git(origin, 'diff', '--name-only', f'{branch}^', branch).split()
+    return sorted(path.split('/')[0] for path in changed)
+
+
+def push_upstream_change(origin, tmp_path, path, content):
+    """Commit to origin's main behind the API's back, as another user merging a PR would"""
+    work = Path(tempfile.mkdtemp(dir=tmp_path)) / 'upstream'
+    run_git(tmp_path, 'clone', '-q', str(origin), str(work))
+    (work / path).write_text(content)
+    run_git(work, 'commit', '-q', '-am', f'Update {path}')
+    run_git(work, 'push', '-q', 'origin', 'main')
+    return run_git(work, 'rev-parse', 'HEAD')
+
+
+def bulk_update(client, selector, branch_name):
+    return client.post('/api/v3/projects/variables:bulk', headers=HEADERS, json={
+        'selector': selector, 'variables': {'SCHEDULE': '@daily'}, 'branch_name': branch_name,
+    })
+
+
+@pytest.mark.parametrize('selector, expected', [
+    ({'project_names': ['sales_b']}, ['sales_b']),
+    ({'owner': 'alice'}, ['hr', 'sales_a']),
+    ({'owner': 'alice', 'project_glob': 'sales_*'}, ['sales_a']),
+    ({'operator': 'BASH'}, ['hr', 'sales_b']),
+])
+def test_bulk_update_selects_matching_projects(client, origin, selector, expected):
+    branch_name = f"bulk_{'_'.join(expected)}"
+    response = bulk_update(client, selector, branch_name)
+
+    assert response.status_code == 200
+    assert response.json['updated_projects'] == expected
+    assert changed_projects(origin, branch_name) == expected
+    variables = yaml.safe_load(run_git(origin, 'show', f'{branch_name}:{expected[0]}/dbt_airflow_variables.yml'))
+    assert variables[expected[0].upper()]['SCHEDULE'] == '@daily'
+
+
+@pytest.mark.parametrize('selector', [{}, {'project_names': []}])
+def test_bulk_update_rejects_empty_selectors(client, origin, selector):
+    before = branches(origin)
+    assert bulk_update(client, selector, 'bulk_everything').status_code == 422
+    assert branches(origin) == before
+
+
+def test_bulk_update_with_missing_project(client, origin):
+    response = bulk_update(client, {'project_names': ['sales_a', 'nope']}, 'bulk_missing')
+    assert response.status_code == 404
+    assert 'bulk_missing' not in branches(origin)
+
+
+def test_edits_are_based_on_the_remote_default_branch(client, origin, tmp_path):
+    upstream = push_upstream_change(origin, tmp_path, 'hr/dbt_project.yml', 'name: hr\nversion: 2\n')
+
+    response = client.post('/api/v3/projects/sales_a/variables', headers=HEADERS, json={
+        'project_name': 'sales_a', 'variables': {'SALES_A': {'DAG_OWNER': 'carol'}}, 'branch_name': 'owner_carol',
+    })
+
+    assert response.status_code == 200
+    assert run_git(origin, 'rev-parse', 'owner_carol^') == upstream
+    assert changed_projects(origin, 'owner_carol') == ['sales_a']
+
+
+class RecordingBackend:
+    def __init__(self, backend, calls):
+        self._backend = backend
+        self._calls = calls
+
+    def __getattr__(self, name):
+        self._calls.append(name)
+        return getattr(self._backend, name)
+
+
+def test_parsed_file_cache_hits_run_no_git_commands(client, monkeypatch):
+    cache = dbt_pr_mgmt_api.parsed_file_cache
+    client.get('/api/v3/projects/sales_b/variables', headers=HEADERS)
+    hits = cache.hits
+
+    calls = []
+    get_git_backend = dbt_pr_mgmt_api.get_git_backend
+    monkeypatch.setattr(dbt_pr_mgmt_api, 'get_git_backend', lambda repo: RecordingBackend(get_git_backend(repo), calls))
+    response = client.get('/api/v3/projects/sales_b/variables', headers=HEADERS)
+
+    assert response.json['variables'] == {'SALES_B': PROJECTS['sales_b']}
+    assert cache.hits == hits + 1
+    # Only the ETag's tree lookup, which the cache reuses
+    assert calls == ['resolve']
+
+
+def conditional_get(client, path, if_none_match):
+    return client.get(path, headers=dict(HEADERS, **{'If-None-Match': if_none_match}))
+
+
+def test_conditional_get(client, origin, tmp_path):
+    response = client.get('/api/v3/projects/sales_a/variables', headers=HEADERS)
+    etag = response.headers['ETag']
+    assert response.status_code == 200
+
+    for if_none_match in (etag, f'W/{etag}', f'"other", {etag}'):
+        response = conditional_get(client, '/api/v3/projects/sales_a/variables', if_none_match)
+        assert response.status_code == 304
+        assert response.headers['ETag'] == etag
+        assert response.data == b''
+
+    # Another project's change leaves the ETag alone; a change of this project replaces it
+    push_upstream_change(origin, tmp_path, 'hr/dbt_project.yml', 'name: hr\nversion: 3\n')
+    assert client.post('/api/v3/repository/refresh', headers=HEADERS).status_code == 200
+    response = conditional_get(client, '/api/v3/projects/sales_a/variables', etag)
+    assert response.status_code == 304
+
+    push_upstream_change(origin, tmp_path, 'sales_a/dbt_airflow_variables.yml', 'SALES_A:\n  DAG_OWNER: dave\n')
+    assert client.post('/api/v3/repository/refresh', headers=HEADERS).status_code == 200
+    response = conditional_get(client, '/api/v3/projects/sales_a/variables', etag)
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert response.json['variables'] == {'SALES_A': {'DAG_OWNER': 'dave'}}
+
+
+def test_conditional_get_of_a_missing_project(client):
+    response = conditional_get(client, '/api/v3/projects/nope/variables', '*')
+    assert response.status_code == 404
+    assert 'ETag' not in response.headers
+
+
+@pytest.fixture
+def webhook(client, monkeypatch):
+    triggered = []
+    monkeypatch.setattr(Config, 'REPOSITORY_WEBHOOK_SECRET', 'hook-secret')
+    monkeypatch.setattr(dbt_pr_mgmt_api.RepositorySyncWorker, 'trigger', lambda worker: triggered.append(worker))
+
+    def post(headers, payload=None):
+        """Post a push event (default: to main); an X-Hub-Signature-256 of 'sign' is replaced by the valid one"""
+        body = json.dumps(payload or {'ref': 'refs/heads/main'}).encode()
+        if headers.get('X-Hub-Signature-256') == 'sign':
+            headers['X-Hub-Signature-256'] = 'sha256=' + hmac.new(b'hook-secret', body, hashlib.sha256).hexdigest()
+        return client.post('/api/v3/repository/webhook', data=body, headers=headers).status_code
+    return post, triggered
+
+
+@pytest.mark.parametrize('headers', [
+    {},
+    {'X-GitHub-Event': 'push'},
+    {'X-GitHub-Event': 'push', 'X-Hub-Signature-256': 'sha256=' + '0' * 64},
+    {'X-Gitlab-Event': 'Push Hook', 'X-Gitlab-Token': 'wrong'},
+    # The API key doesn't stand in for the webhook secret
+    dict(HEADERS, **{'X-GitHub-Event': 'push'}),
+])
+def test_webhook_rejects_bad_signatures(webhook, headers):
+    post, triggered = webhook
+    assert post(headers) == 401
+    assert triggered == []
+
+
+@pytest.mark.parametrize('headers', [
+    {'X-GitHub-Event': 'push', 'X-Hub-Signature-256': 'sign'},
+    {'X-Gitlab-Event': 'Push Hook', 'X-Gitlab-Token': 'hook-secret'},
+])
+def test_webhook_schedules_a_sync(webhook, headers):
+    post, triggered = webhook
+    assert post(headers) == 202
+    assert len(triggered) == 1
+
+
+@pytest.mark.parametrize('headers, payload', [
+    ({'X-GitHub-Event': 'push', 'X-Hub-Signature-256': 'sign'}, {'ref': 'refs/heads/feature'}),
+    ({'X-GitHub-Event': 'issues', 'X-Hub-Signature-256': 'sign'}, None),
+])
+def test_webhook_ignores_other_events(webhook, headers, payload):
+    post, triggered = webhook
+    assert post(headers, payload) == 202
+    assert triggered == []
+
+
+def test_webhook_without_secret(client, monkeypatch):
+    monkeypatch.setattr(Config, 'REPOSITORY_WEBHOOK_SECRET', None)
+    assert client.post('/api/v3/repository/webhook', json={}).status_code == 503
@@ -0,0 +1,94 @@
+import subprocess
+import threading
+import time
+
+import git
+
+import dbt_pr_mgmt_api
+
+RepositoryRefreshCoordinator = dbt_pr_mgmt_api.RepositoryRefreshCoordinator
+RepositorySyncWorker = dbt_pr_mgmt_api.RepositorySyncWorker
+
+
+class CountingRefresh:
+    def __init__(self, success=True):
+        self.calls = 0
+        self.success = success
+        self.release = threading.Event()
+        self.release.set()
+
+    def __call__(self):
+        self.calls += 1
+        self.release.wait(5)
+        return {'success': self.success, 'message': f'refresh {self.calls}'}
+
+
+def test_concurrent_refreshes_share_one(tmp_path):
+    refresh = CountingRefresh()
+    refresh.release.clear()
+    coordinator = RepositoryRefreshCoordinator(str(tmp_path), refresh)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(coordinator.refresh())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)
+    refresh.release.set()
+    for thread in threads:
+        thread.join()
+
+    assert refresh.calls == 1
+    assert results == [{'success': True, 'message': 'refresh 1'}] * 5
+
+
+def test_recent_refreshes_are_reused_across_coordinators(tmp_path):
+    refresh = CountingRefresh()
+    # Coordinators of two workers sharing the checkout (and its state file)
+    first = RepositoryRefreshCoordinator(str(tmp_path), refresh)
+    second = RepositoryRefreshCoordinator(str(tmp_path), refresh)
+
+    first.refresh()
+    assert second.refresh(max_staleness=60) == {'success': True, 'message': 'refresh 1'}
+    assert refresh.calls == 1
+    second.refresh(max_staleness=0)
+    assert refresh.calls == 2
+
+
+def test_failed_refreshes_are_not_reused(tmp_path):
+    refresh = CountingRefresh(success=False)
+    coordinator = RepositoryRefreshCoordinator(str(tmp_path), refresh)
+    coordinator.refresh()
+    coordinator.refresh(max_staleness=60)
+    assert refresh.calls == 2
+
+
+class FakeProjectManager:
+    def __init__(self, repo):
+        self.repo = repo
+        self.refreshes = []
+
+    def refresh_repository(self, max_staleness=0):
+        self.refreshes.append(max_staleness)
+        return {'success': True, 'message': 'ok'}
+
+
+def test_triggered_sync_refreshes_and_updates_the_history_index(tmp_path):
+    subprocess.run(['git', 'init', '-q', str(tmp_path)], check=True)
+    (tmp_path / 'proj').mkdir()
+    (tmp_path / 'proj' / 'dbt_project.yml').write_text('name: proj\n')
+    subprocess.run(['git', 'add', '-A'], cwd=tmp_path, check=True)
+    subprocess.run(
+        ['git', '-c', 'user.name=t', '-c', 'user.email=t@t', 'commit', '-q', '-m', 'c1'], cwd=tmp_path, check=True
+    )
+    manager = FakeProjectManager(git.Repo(tmp_path))
+    worker = RepositorySyncWorker(manager, interval=0)
+
+    worker.trigger()
+    index = dbt_pr_mgmt_api.get_project_history_index(manager.repo, worker.logger)
+    deadline = time.monotonic() + 5
+    while index.head is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    # A push forces a fresh refresh instead of reusing a recent one
+    assert manager.refreshes == [0]
+    assert index.head == manager.repo.head.commit.hexsha
+    assert set(index.modified) == {'proj'}
@@ -0,0 +1,77 @@
+import os
+
+import pytest
+
+from conftest import ROOT, load_module
+
+generator = load_module(os.path.join(ROOT, 'init_setup_files_v2', 'create_yml_schema.py'), 'create_yml_schema_v2')
+
+
+def object_schema(n, prefix='p'):
+    return {'type': 'object', 'properties': {f'{prefix}{i}': {'type': 'string'} for i in range(n)}}
+
+
+def stream(properties):
+    return {'stream': {'jsonSchema': {'properties': properties}}, 'config': {'primaryKey': []}}
+
+
+def column_names(properties):
+    source_dict, _, collapsed_paths = generator.create_source_yml_dict(stream(properties), 'stg_t', 't')
+    return [c['name'] for c in source_dict['columns']], collapsed_paths
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    def set_limits(max_depth=None, max_columns=None):
+        monkeypatch.setattr(generator, 'SCHEMA_MAX_DEPTH', max_depth)
+        monkeypatch.setattr(generator, 'SCHEMA_MAX_COLUMNS', max_columns)
+    return set_limits
+
+
+def test_no_limits_by_default(limits):
+    limits()
+    nested = {'type': 'object', 'properties': {'a': {'type': 'object', 'properties': {'b': object_schema(600)}}}}
+    columns, collapsed_paths = column_names({'deep': nested})
+    assert len(columns) == 600
+    assert collapsed_paths == []
+
+
+def test_any_of_branches_share_the_column_limit(limits):
+    limits(max_columns=10)
+    columns, collapsed_paths = column_names({'u': {'anyOf': [object_schema(10, 'a'), object_schema(500, 'b')]}})
+    assert columns == ['u']
+    assert collapsed_paths == ['u']
+
+
+def test_scalars_count_towards_the_column_limit(limits):
+    limits(max_columns=10)
+    properties = {f's{i}': {'type': 'string'} for i in range(5)}
+    properties['obj'] = object_schema(6)
+    properties['last'] = {'type': 'string'}
+    columns, collapsed_paths = column_names(properties)
+    # 5 scalars + 6 object columns + 1 scalar would be 12
+    assert columns == [f's{i}' for i in range(5)] + ['obj', 'last']
+    assert collapsed_paths == ['obj']
+
+
+def test_objects_fill_the_remaining_columns_in_order(limits):
+    limits(max_columns=8)
+    columns, collapsed_paths = column_names({'a': object_schema(4), 'b': object_schema(4), 'c': object_schema(2)})
+    assert columns == ['a.p0', 'a.p1', 'a.p2', 'a.p3', 'b', 'c.p0', 'c.p1']
+    assert collapsed_paths == ['b']
+    assert len(columns) <= 8
+
+
+def test_zero_column_limit_collapses_every_object(limits):
+    limits(max_columns=0)
+    columns, collapsed_paths = column_names({'a': object_schema(1), 'b': {'type': 'string'}})
+    assert columns == ['a', 'b']
+    assert collapsed_paths == ['a']
+
+
+def test_depth_limit(limits):
+    limits(max_depth=2)
+    schema = {'type': 'object', 'properties': {'x': {'type': 'string'}, 'inner': object_schema(3)}}
+    columns, collapsed_paths = column_names({'o': schema})
+    assert columns == ['o.x', 'o.inner']
+    assert collapsed_paths == ['o.inner']